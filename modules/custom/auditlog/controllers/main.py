@@ -0,0 +1,29 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import json
+
+from odoo import http
+from odoo.http import request
+
+from ..models.archive import iter_archived_logs
+
+
+class AuditlogArchiveController(http.Controller):
+    @http.route(
+        "/auditlog/archive/<string:model>/<int:res_id>",
+        type="http",
+        auth="user",
+        methods=["GET"],
+    )
+    def archived_logs(self, model, res_id, **kwargs):
+        """Stream the archived logs of a record as JSON lines, newest first."""
+        sources = request.env["auditlog.archive"]._get_lookup_sources(model, res_id)
+
+        # Only reads the archive files: safe once the request cursor is closed
+        def generate():
+            for entry in iter_archived_logs(sources, model, res_id):
+                yield json.dumps(entry) + "\n"
+
+        return request.make_response(
+            generate(),
+            headers=[("Content-Type", "application/x-ndjson; charset=utf-8")],
+        )
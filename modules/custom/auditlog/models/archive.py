@@ -0,0 +1,262 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import gzip
+import json
+import logging
+import os
+import zlib
+from collections import defaultdict
+from datetime import date
+
+from odoo import _, api, fields, models
+from odoo.exceptions import AccessError
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Sub-directory of the database filestore holding the segments
+ARCHIVE_DIR = "auditlog_archive"
+# A month is split in several segments past this size (in bytes)
+MAX_SEGMENT_SIZE = 1 << 30
+READ_SIZE = 1 << 16
+ARCHIVED_LINE_FIELDS = (
+    "field_name",
+    "field_description",
+    "old_value",
+    "new_value",
+    "old_value_text",
+    "new_value_text",
+)
+
+
+def iter_archived_logs(sources, model, res_id):
+    """Yield the archived logs of the record ``(model, res_id)`` stored in
+    ``sources``, a list of ``(segment path, index path, segment size, index
+    size)``. Only the gzip members listed in the sidecar index for the record
+    are decompressed. Works on files only, so that it can be consumed after
+    the database cursor is closed (e.g. by a streamed HTTP response).
+    """
+    for segment_path, index_path, size, index_size in sources:
+        offsets = set()
+        with open(index_path, "rb") as index:
+            for row in index.read(index_size).splitlines():
+                row_model, row_res_id, offset = json.loads(row)
+                if row_model == model and row_res_id == res_id:
+                    offsets.add(offset)
+        if not offsets:
+            continue
+        with open(segment_path, "rb") as segment:
+            for offset in sorted(offsets, reverse=True):
+                for entry in _read_member(segment, offset, size):
+                    if entry["model"] == model and entry["res_id"] == res_id:
+                        yield entry
+
+
+def _read_member(segment, offset, size):
+    """Decompress the gzip member starting at ``offset`` of ``segment``."""
+    segment.seek(offset)
+    decompressor = zlib.decompressobj(wbits=31)
+    data = []
+    remaining = size - offset
+    while remaining > 0 and not decompressor.eof:
+        chunk = segment.read(min(READ_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        data.append(decompressor.decompress(chunk))
+    # Newest first, as in the log views
+    for row in reversed(b"".join(data).splitlines()):
+        yield json.loads(row)
+
+
+class AuditlogArchive(models.Model):
+    _name = "auditlog.archive"
+    _description = "Auditlog - Archived logs segment"
+    _order = "month desc, part desc"
+
+    name = fields.Char(required=True, readonly=True)
+    month = fields.Date(required=True, readonly=True)
+    part = fields.Integer(required=True, readonly=True, default=1)
+    # Bytes committed in the files: anything written after them by a
+    # transaction that did not commit is truncated by the next append
+    size = fields.Integer("Segment Size", readonly=True)
+    index_size = fields.Integer(readonly=True)
+    log_count = fields.Integer("Logs", readonly=True)
+
+    _sql_constraints = [
+        (
+            "month_part_uniq",
+            "unique(month, part)",
+            "Segments are unique per month and part.",
+        )
+    ]
+
+    def _get_paths(self):
+        """Return the paths of the segment and of its sidecar index."""
+        self.ensure_one()
+        filestore = self.env["ir.attachment"]._filestore()
+        directory = os.path.join(filestore, ARCHIVE_DIR)
+        segment_path = os.path.join(directory, f"{self.name}.jsonl.gz")
+        return segment_path, f"{segment_path}.idx"
+
+    @api.model
+    def _get_segment(self, month):
+        """Return the segment where the logs of ``month`` are appended."""
+        segment = self.search([("month", "=", month)], order="part desc", limit=1)
+        if segment and segment.size < MAX_SEGMENT_SIZE:
+            return segment
+        part = segment.part + 1 if segment else 1
+        return self.create(
+            {
+                "name": f"auditlog_{month:%Y%m}_{part:03d}",
+                "month": month,
+                "part": part,
+            }
+        )
+
+    @api.model
+    def _archive_logs(self, log_ids):
+        """Append the logs ``log_ids`` and their lines to the segments of
+        their month. The rows themselves are left to the caller to delete.
+        """
+        cr = self.env.cr
+        cr.execute(
+            SQL(
+                """
+                SELECT log.id, log.create_date, log.name, log.model_model,
+                       log.res_id, log.res_ids, log.method, log.log_type,
+                       log.user_id, users.login, log.http_session_id,
+                       request.name, request.root_url
+                FROM auditlog_log log
+                LEFT JOIN res_users users ON users.id = log.user_id
+                LEFT JOIN auditlog_http_request request
+                    ON request.id = log.http_request_id
+                WHERE log.id = ANY(%s)
+                ORDER BY log.create_date, log.id
+                """,
+                list(log_ids),
+            )
+        )
+        entries = {}
+        by_month = defaultdict(list)
+        for row in cr.fetchall():
+            entry = entries[row[0]] = {
+                "id": row[0],
+                "create_date": fields.Datetime.to_string(row[1]),
+                "name": row[2],
+                "model": row[3],
+                "res_id": row[4],
+                "res_ids": row[5],
+                "method": row[6],
+                "log_type": row[7],
+                "user_id": row[8],
+                "user_login": row[9],
+                "http_session_id": row[10],
+                "http_request": row[11],
+                "root_url": row[12],
+                "lines": [],
+            }
+            by_month[date(row[1].year, row[1].month, 1)].append(entry)
+        cr.execute(
+            SQL(
+                """
+                SELECT log_id, %s
+                FROM auditlog_log_line
+                WHERE log_id = ANY(%s)
+                ORDER BY id
+                """,
+                SQL(", ").join(map(SQL.identifier, ARCHIVED_LINE_FIELDS)),
+                list(log_ids),
+            )
+        )
+        for row in cr.fetchall():
+            entries[row[0]]["lines"].append(
+                dict(zip(ARCHIVED_LINE_FIELDS, row[1:], strict=True))
+            )
+        for month, month_entries in sorted(by_month.items()):
+            self._get_segment(month)._append(month_entries)
+        return len(entries)
+
+    def _append(self, entries):
+        """Append ``entries`` to this segment as one gzip member, and the
+        ``(model, res_id)`` pairs they contain to its sidecar index.
+        """
+        self.ensure_one()
+        segment_path, index_path = self._get_paths()
+        os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+        payload = "".join(
+            json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries
+        )
+        with open(segment_path, "ab") as segment:
+            segment.truncate(self.size)
+            offset = segment.seek(0, os.SEEK_END)
+            segment.write(gzip.compress(payload.encode()))
+            segment.flush()
+            os.fsync(segment.fileno())
+            size = segment.tell()
+        # Logs of exports have no `res_id`: they are only found by a full scan
+        keys = sorted(
+            {(entry["model"], entry["res_id"]) for entry in entries if entry["res_id"]}
+        )
+        index_rows = "".join(
+            json.dumps([model, res_id, offset]) + "\n" for model, res_id in keys
+        )
+        with open(index_path, "ab") as index:
+            index.truncate(self.index_size)
+            index.seek(0, os.SEEK_END)
+            index.write(index_rows.encode())
+            index.flush()
+            os.fsync(index.fileno())
+            index_size = index.tell()
+        self.write(
+            {
+                "size": size,
+                "index_size": index_size,
+                "log_count": self.log_count + len(entries),
+            }
+        )
+
+    @api.model
+    def _get_lookup_sources(self, model, res_id):
+        """Check that the current user may read the archived logs of the
+        record ``(model, res_id)`` and return the files to look them up in.
+        """
+        if not self.env.user.has_group("auditlog.group_auditlog_user"):
+            raise AccessError(_("You are not allowed to read archived logs."))
+        if model not in self.env:
+            return []
+        self.env[model].browse(res_id).check_access("read")
+        sources = []
+        for segment in self.sudo().search([("size", ">", 0)]):
+            segment_path, index_path = segment._get_paths()
+            if os.path.exists(segment_path) and os.path.exists(index_path):
+                sources.append(
+                    (segment_path, index_path, segment.size, segment.index_size)
+                )
+            else:
+                _logger.warning("Archived logs segment %s is missing", segment.name)
+        return sources
+
+    @api.model
+    def lookup(self, model, res_id, limit=None):
+        """Return the archived logs of the record ``(model, res_id)``, newest
+        first, with their lines.
+        """
+        sources = self._get_lookup_sources(model, res_id)
+        entries = []
+        for entry in iter_archived_logs(sources, model, res_id):
+            entries.append(entry)
+            if limit and len(entries) >= limit:
+                break
+        return entries
+
+    @api.model
+    def action_view_archived_logs(self, records):
+        """Open the archived logs of the first of ``records`` (streamed)."""
+        record = records[:1]
+        if not record:
+            return False
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/auditlog/archive/{record._name}/{record.id}",
+            "target": "new",
+        }
@@ -1,4 +1,20 @@
-from odoo import fields, models
+import logging
+import threading
+
+from odoo import api, fields, models, tools
+from odoo.tools import SQL, str2bool
+from odoo.tools.sql import create_index, table_kind
+
+_logger = logging.getLogger(__name__)
+
+MATERIALIZED_TABLE = "auditlog_log_line_view_materialized"
+MATERIALIZED_MARK_TABLE = "auditlog_log_line_view_materialized_mark"
+MATERIALIZED_PARAM = "auditlog.log_line_view_materialized"
+MATERIALIZED_INDEXES = {
+    "model_res_date": ["model_id", "res_id", "create_date"],
+    "user_date": ["user_id", "create_date"],
+}
+DEFAULT_REFRESH_BATCH = 50000
 
 
 class AuditlogLogLineView(models.Model):
@@ -61,4 +77,239 @@ class AuditlogLogLineView(models.Model):
 
     @property
     def _table_query(self):
-        return f"SELECT {self._select_query()} FROM {self._from_query()}"
+        live_query = f"SELECT {self._select_query()} FROM {self._from_query()}"
+        if not self._is_materialized():
+            return live_query
+        # Lines created before the mark of the last refresh come from the
+        # indexed table, the other ones from the live join
+        mark = f"""
+            COALESCE(
+                (SELECT mark FROM {MATERIALIZED_MARK_TABLE}), '-infinity'
+            )
+        """
+        return f"""
+            SELECT * FROM {MATERIALIZED_TABLE} WHERE create_date < {mark}
+            UNION ALL
+            {live_query}
+            WHERE alogl.create_date >= {mark}
+        """
+
+    @api.model
+    @tools.ormcache()
+    def _is_materialized(self):
+        """Whether the materialized table is enabled and has been built."""
+        enabled = str2bool(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param(MATERIALIZED_PARAM, "False")
+        )
+        return enabled and bool(table_kind(self.env.cr, MATERIALIZED_TABLE))
+
+    @api.model
+    def refresh_materialized(self, batch_size=None, lag_minutes=10):
+        """Copy to the materialized table the log lines created between the
+        marks of the last refresh and of this one, by batches of
+        ``batch_size`` lines in creation order. The mark is the start of the
+        oldest running transaction, as the lines a transaction commits are
+        dated from its start, and lags ``lag_minutes`` behind at least.
+
+        The table is built on the first run after the
+        ``auditlog.log_line_view_materialized`` parameter is enabled and
+        dropped once it is disabled. Called from a cron.
+        """
+        cr = self.env.cr
+        enabled = str2bool(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param(MATERIALIZED_PARAM, "False")
+        )
+        if not enabled:
+            if table_kind(cr, MATERIALIZED_TABLE):
+                cr.execute(
+                    SQL(
+                        "DROP TABLE %s, %s",
+                        SQL.identifier(MATERIALIZED_TABLE),
+                        SQL.identifier(MATERIALIZED_MARK_TABLE),
+                    )
+                )
+                self.env.registry.clear_cache()
+            return 0
+        self._create_materialized_table()
+        self.env["auditlog.log"].flush_model()
+        self.env["auditlog.log.line"].flush_model()
+        self._prune_materialized()
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        batch_size = batch_size or DEFAULT_REFRESH_BATCH
+        cr.execute(SQL("SELECT mark FROM %s", SQL.identifier(MATERIALIZED_MARK_TABLE)))
+        last_mark = cr.fetchone()[0]
+        mark = self._materialized_mark(lag_minutes)
+        if last_mark and mark <= last_mark:
+            return 0
+        if auto_commit:
+            # Start a new snapshot, in which every transaction started before
+            # the mark is over
+            cr.commit()
+        after_date, after_id = last_mark, 0
+        nb_lines = 0
+        while True:
+            # Lines left by an interrupted refresh are already there
+            cr.execute(
+                SQL(
+                    """
+                    WITH copied AS (
+                        INSERT INTO %(table)s
+                        SELECT %(select)s FROM %(from_)s
+                        WHERE (alogl.create_date, alogl.id) > (
+                            COALESCE(%(after_date)s, '-infinity'::timestamp),
+                            %(after_id)s
+                        ) AND alogl.create_date < %(mark)s
+                        AND NOT EXISTS (
+                            SELECT 1 FROM %(table)s copied_line
+                            WHERE copied_line.id = alogl.id
+                        )
+                        ORDER BY alogl.create_date, alogl.id
+                        LIMIT %(limit)s
+                        RETURNING create_date, id
+                    )
+                    SELECT create_date, id, COUNT(*) OVER () FROM copied
+                    ORDER BY create_date DESC, id DESC
+                    LIMIT 1
+                    """,
+                    table=SQL.identifier(MATERIALIZED_TABLE),
+                    select=SQL(self._select_query()),
+                    from_=SQL(self._from_query()),
+                    after_date=after_date,
+                    after_id=after_id,
+                    mark=mark,
+                    limit=batch_size,
+                )
+            )
+            after_date, after_id, nb_batch_lines = cr.fetchone() or (None, 0, 0)
+            nb_lines += nb_batch_lines
+            if auto_commit:
+                cr.commit()
+            if nb_batch_lines < batch_size:
+                break
+        cr.execute(
+            SQL(
+                "UPDATE %s SET mark = %s",
+                SQL.identifier(MATERIALIZED_MARK_TABLE),
+                mark,
+            )
+        )
+        if auto_commit:
+            cr.commit()
+        _logger.info("%s log lines copied to %s", nb_lines, MATERIALIZED_TABLE)
+        return nb_lines
+
+    @api.model
+    def _materialized_mark(self, lag_minutes):
+        """Return the date before which every log line is committed: the start
+        of the oldest transaction running on the database, ``lag_minutes``
+        ago at the latest."""
+        self.env.cr.execute(
+            """
+            SELECT LEAST(
+                (clock_timestamp() AT TIME ZONE 'UTC')
+                    - make_interval(mins => %s),
+                (
+                    SELECT MIN(xact_start) FROM pg_stat_activity
+                    WHERE datname = current_database()
+                        AND backend_type = 'client backend'
+                ) AT TIME ZONE 'UTC'
+            )
+            """,
+            [lag_minutes],
+        )
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _create_materialized_table(self):
+        """Create the materialized table and its indexes, rebuilding it if its
+        columns no longer match the ones of the view."""
+        cr = self.env.cr
+        cr.execute(
+            f"SELECT {self._select_query()} FROM {self._from_query()} LIMIT 0"
+        )
+        columns = [column.name for column in cr.description]
+        if table_kind(cr, MATERIALIZED_TABLE):
+            cr.execute(
+                """
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name = %s ORDER BY ordinal_position
+                """,
+                [MATERIALIZED_TABLE],
+            )
+            if [row[0] for row in cr.fetchall()] == columns and table_kind(
+                cr, MATERIALIZED_MARK_TABLE
+            ):
+                return False
+            _logger.info("Columns of %s changed, rebuilding it", MATERIALIZED_TABLE)
+            cr.execute(
+                SQL(
+                    "DROP TABLE IF EXISTS %s, %s",
+                    SQL.identifier(MATERIALIZED_TABLE),
+                    SQL.identifier(MATERIALIZED_MARK_TABLE),
+                )
+            )
+        cr.execute(
+            SQL(
+                "CREATE TABLE %s AS SELECT %s FROM %s WITH NO DATA",
+                SQL.identifier(MATERIALIZED_TABLE),
+                SQL(self._select_query()),
+                SQL(self._from_query()),
+            )
+        )
+        cr.execute(
+            SQL(
+                "ALTER TABLE %s ADD PRIMARY KEY (id)",
+                SQL.identifier(MATERIALIZED_TABLE),
+            )
+        )
+        for suffix, index_columns in MATERIALIZED_INDEXES.items():
+            create_index(
+                cr,
+                f"{MATERIALIZED_TABLE}_{suffix}_index",
+                MATERIALIZED_TABLE,
+                index_columns,
+            )
+        # The lines created before the mark are all copied
+        cr.execute(
+            SQL(
+                "CREATE TABLE %s (mark timestamp); INSERT INTO %s VALUES (NULL)",
+                SQL.identifier(MATERIALIZED_MARK_TABLE),
+                SQL.identifier(MATERIALIZED_MARK_TABLE),
+            )
+        )
+        self.env.registry.clear_cache()
+        return True
+
+    @api.model
+    def _prune_materialized(self):
+        """Forget the materialized lines older than the oldest remaining log
+        line, i.e. the ones removed by the autovacuum."""
+        if not table_kind(self.env.cr, MATERIALIZED_TABLE):
+            return
+        self.env.cr.execute(
+            SQL(
+                """
+                DELETE FROM %s
+                WHERE id < (SELECT COALESCE(MIN(id), 0) FROM auditlog_log_line)
+                    OR NOT EXISTS (SELECT 1 FROM auditlog_log_line)
+                """,
+                SQL.identifier(MATERIALIZED_TABLE),
+            )
+        )
+
+    @api.model
+    def _forget_materialized(self, line_ids):
+        """Remove the lines ``line_ids`` from the materialized table."""
+        if not line_ids or not table_kind(self.env.cr, MATERIALIZED_TABLE):
+            return
+        self.env.cr.execute(
+            SQL(
+                "DELETE FROM %s WHERE id = ANY(%s)",
+                SQL.identifier(MATERIALIZED_TABLE),
+                list(line_ids),
+            )
+        )
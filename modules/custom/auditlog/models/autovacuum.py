@@ -1,36 +1,142 @@
 # Copyright 2016 ABF OSIELL <https://osiell.com>
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
 
-from odoo import api, fields, models
+from odoo import api, models
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
+# Vacuumed in this order: logs reference HTTP requests, which reference
+# HTTP user sessions
+VACUUM_MODELS = (
+    "auditlog.read.counter",
+    "auditlog.log",
+    "auditlog.http.request",
+    "auditlog.http.session",
+)
+DEFAULT_CHUNK_SIZE = 10000
+
 
 class AuditlogAutovacuum(models.TransientModel):
     _name = "auditlog.autovacuum"
     _description = "Auditlog - Delete old logs"
 
     @api.model
-    def autovacuum(self, days, chunk_size=None):
+    def autovacuum(self, days, chunk_size=None, time_budget=None, archive=False):
         """Delete all logs older than ``days``. This includes:
             - CRUD logs (create, read, write, unlink)
+            - aggregated read counters
             - HTTP requests
             - HTTP user sessions
 
+        Records are deleted in SQL, oldest first, by batches of ``chunk_size``
+        records, committing after each batch. If ``time_budget`` (in seconds)
+        is given, the run stops once it is exhausted and the remaining records
+        are left to the next run.
+
+        With ``archive``, the logs and their lines are appended to compressed
+        segment files of the filestore (see `auditlog.archive`) before being
+        deleted.
+
         Called from a cron.
         """
         days = (days > 0) and int(days) or 0
         deadline = datetime.now() - timedelta(days=days)
-        data_models = ("auditlog.log", "auditlog.http.request", "auditlog.http.session")
-        for data_model in data_models:
-            records = self.env[data_model].search(
-                [("create_date", "<=", fields.Datetime.to_string(deadline))],
-                limit=chunk_size,
-                order="create_date asc",
-            )
-            nb_records = len(records)
-            records.unlink()
-            _logger.info("AUTOVACUUM - %s '%s' records deleted", nb_records, data_model)
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        stop_at = time_budget and time.monotonic() + time_budget
+        partitions = self.env["auditlog.partition"]
+        if partitions.is_partitioned() and not archive:
+            # Whole expired months go at once, the rest row by row below
+            partitions._drop_expired_partitions(deadline)
+        for data_model in VACUUM_MODELS:
+            self._vacuum_model(data_model, deadline, chunk_size, stop_at, archive)
+            if stop_at and time.monotonic() >= stop_at:
+                _logger.info("AUTOVACUUM - time budget exhausted, stopping")
+                break
+        self.env["auditlog.log.line.view"]._prune_materialized()
         return True
+
+    @api.model
+    def _vacuum_model(
+        self, data_model, deadline, chunk_size, stop_at=None, archive=False
+    ):
+        """Delete the records of ``data_model`` created before ``deadline`` by
+        batches, walking the ``(create_date, id)`` index with a keyset so that
+        each batch starts where the previous one stopped.
+        """
+        model = self.env[data_model]
+        model.flush_model()
+        cr = self.env.cr
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        started = time.monotonic()
+        nb_records = 0
+        last_key = None
+        while True:
+            keyset = SQL()
+            if last_key:
+                keyset = SQL("AND (create_date, id) > (%s, %s)", *last_key)
+            cr.execute(
+                SQL(
+                    """
+                    SELECT id, create_date FROM %s
+                    WHERE create_date <= %s %s
+                    ORDER BY create_date, id
+                    LIMIT %s
+                    """,
+                    SQL.identifier(model._table),
+                    deadline,
+                    keyset,
+                    chunk_size,
+                )
+            )
+            rows = cr.fetchall()
+            if not rows:
+                break
+            ids = [row[0] for row in rows]
+            last_key = (rows[-1][1], rows[-1][0])
+            if archive and data_model == "auditlog.log":
+                self.env["auditlog.archive"].sudo()._archive_logs(ids)
+            self._delete_records(model, ids)
+            nb_records += len(ids)
+            if auto_commit:
+                cr.commit()
+            if len(rows) < chunk_size or (stop_at and time.monotonic() >= stop_at):
+                break
+        self.env.invalidate_all()
+        elapsed = time.monotonic() - started
+        _logger.info(
+            "AUTOVACUUM - %s '%s' records deleted in %.2fs (%.0f records/s)",
+            nb_records,
+            data_model,
+            elapsed,
+            nb_records / elapsed if elapsed else 0,
+        )
+        return nb_records
+
+    @api.model
+    def _delete_records(self, model, ids):
+        """Delete the records ``ids`` of ``model`` in SQL. The lines of logs are
+        deleted first, instead of relying on the cascade of the foreign key.
+        """
+        if model._name == "auditlog.log":
+            self.env.cr.execute(
+                SQL(
+                    """
+                    DELETE FROM auditlog_log_line line
+                    USING unnest(%s::int[]) AS batch(id)
+                    WHERE line.log_id = batch.id
+                    """,
+                    ids,
+                )
+            )
+        self.env.cr.execute(
+            SQL(
+                "DELETE FROM %s WHERE id = ANY(%s)",
+                SQL.identifier(model._table),
+                ids,
+            )
+        )
@@ -1,10 +1,11 @@
 # Copyright 2015 ABF OSIELL <https://osiell.com>
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from psycopg2.extensions import AsIs
-
 from odoo import api, fields, models
 from odoo.http import request
+from odoo.tools.sql import create_index
+
+from .http_session import forget_on_rollback
 
 
 class AuditlogHTTPRequest(models.Model):
@@ -22,6 +23,15 @@ class AuditlogHTTPRequest(models.Model):
     user_context = fields.Char("Context")
     log_ids = fields.One2many("auditlog.log", "http_request_id", string="Logs")
 
+    def init(self):
+        # Keyset walked by `auditlog.autovacuum`
+        create_index(
+            self.env.cr,
+            f"{self._table}_create_date_id_index",
+            self._table,
+            ["create_date", "id"],
+        )
+
     @api.depends("create_date", "name")
     def _compute_display_name(self):
         for httprequest in self:
@@ -46,23 +56,18 @@ class AuditlogHTTPRequest(models.Model):
             return False
         http_session_model = self.env["auditlog.http.session"]
         httprequest = request.httprequest
-        if httprequest:
-            if hasattr(httprequest, "auditlog_http_request_id"):
-                # Verify existence. Could have been rolled back after a
-                # concurrency error
-                self.env.cr.execute(
-                    "SELECT id FROM %s WHERE id = %s",
-                    (AsIs(self._table), httprequest.auditlog_http_request_id),
-                )
-                if self.env.cr.fetchone():
-                    return httprequest.auditlog_http_request_id
-            vals = {
-                "name": httprequest.path,
-                "root_url": httprequest.url_root,
-                "user_id": request.uid,
-                "http_session_id": http_session_model.current_http_session(),
-                "user_context": request.context,
-            }
-            httprequest.auditlog_http_request_id = self.create(vals).id
+        if not httprequest:
+            return False
+        # Forgotten if the transaction which created it is rolled back
+        if hasattr(httprequest, "auditlog_http_request_id"):
             return httprequest.auditlog_http_request_id
-        return False
+        vals = {
+            "name": httprequest.path,
+            "root_url": httprequest.url_root,
+            "user_id": request.uid,
+            "http_session_id": http_session_model.current_http_session(),
+            "user_context": request.context,
+        }
+        httprequest.auditlog_http_request_id = self.create(vals).id
+        forget_on_rollback(self.env.cr, httprequest)
+        return httprequest.auditlog_http_request_id
@@ -3,6 +3,25 @@
 
 from odoo import api, fields, models
 from odoo.http import request
+from odoo.tools.sql import create_index
+
+# User session key holding, for each user, the session ID and the matching
+# `auditlog.http.session` ID
+SESSION_IDS_KEY = "auditlog_http_session_ids"
+# HTTP request attributes caching the IDs of the current session and request
+REQUEST_CACHE_ATTRIBUTES = ("auditlog_http_session", "auditlog_http_request_id")
+
+
+def forget_on_rollback(cr, httprequest):
+    """Drop the IDs cached on ``httprequest`` if the transaction that created
+    their records is rolled back (e.g. before a retry on concurrency error).
+    """
+    cr.postrollback.add(lambda: forget_cached_ids(httprequest))
+
+
+def forget_cached_ids(httprequest):
+    for attribute in REQUEST_CACHE_ATTRIBUTES:
+        vars(httprequest).pop(attribute, None)
 
 
 class AuditlogtHTTPSession(models.Model):
@@ -17,6 +36,15 @@ class AuditlogtHTTPSession(models.Model):
         "auditlog.http.request", "http_session_id", string="HTTP Requests"
     )
 
+    def init(self):
+        # Keyset walked by `auditlog.autovacuum`
+        create_index(
+            self.env.cr,
+            f"{self._table}_create_date_id_index",
+            self._table,
+            ["create_date", "id"],
+        )
+
     @api.depends("create_date", "user_id")
     def _compute_display_name(self):
         for httpsession in self:
@@ -35,19 +63,41 @@ class AuditlogtHTTPSession(models.Model):
         """Create a log corresponding to the current HTTP user session, and
         returns its ID. This method can be called several times during the
         HTTP query/response cycle, it will only log the user session on the
-        first call.
+        first call: the ID is kept on the request, and in the user session
+        for the next requests.
         If no HTTP user session is available, returns `False`.
         """
         if not request:
             return False
         httpsession = request.session
-        if httpsession:
+        if not httpsession:
+            return False
+        httprequest = request.httprequest
+        uid = request.uid
+        cached = getattr(httprequest, "auditlog_http_session", None)
+        if cached and cached[0] == uid:
+            return cached[1]
+        session_ids = httpsession.get(SESSION_IDS_KEY) or {}
+        sid, session_id = session_ids.get(str(uid)) or (None, None)
+        # Verified once per request: the log may have been vacuumed since, or
+        # the session ID rotated
+        if not (
+            sid == httpsession.sid
+            and session_id
+            and self.browse(session_id).exists()
+        ):
             existing_session = self.search(
-                [("name", "=", httpsession.sid), ("user_id", "=", request.uid)], limit=1
+                [("name", "=", httpsession.sid), ("user_id", "=", uid)], limit=1
             )
             if existing_session:
-                return existing_session.id
-            vals = {"name": httpsession.sid, "user_id": request.uid}
-            httpsession.auditlog_http_session_id = self.create(vals).id
-            return httpsession.auditlog_http_session_id
-        return False
+                session_id = existing_session.id
+            else:
+                vals = {"name": httpsession.sid, "user_id": uid}
+                session_id = self.create(vals).id
+                forget_on_rollback(self.env.cr, httprequest)
+            httpsession[SESSION_IDS_KEY] = {
+                **session_ids,
+                str(uid): [httpsession.sid, session_id],
+            }
+        httprequest.auditlog_http_session = (uid, session_id)
+        return session_id
@@ -0,0 +1,25 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, models
+
+
+class IrModelFields(models.Model):
+    _inherit = "ir.model.fields"
+
+    # The field metadata of audited models is cached in the registry by
+    # `auditlog.rule._load_field_cache`
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env["auditlog.rule"]._invalidate_field_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env["auditlog.rule"]._invalidate_field_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env["auditlog.rule"]._invalidate_field_cache()
+        return res
@@ -3,6 +3,7 @@
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
 from odoo.tools.safe_eval import safe_eval
+from odoo.tools.sql import create_index
 
 
 class AuditlogLog(models.Model):
@@ -31,13 +32,30 @@ class AuditlogLog(models.Model):
         [("full", "Full log"), ("fast", "Fast log")], string="Type"
     )
 
+    def init(self):
+        # Used by the autovacuum to walk old records in creation order
+        create_index(
+            self.env.cr,
+            f"{self._table}_create_date_id_index",
+            self._table,
+            ["create_date", "id"],
+        )
+
     @api.model_create_multi
     def create(self, vals_list):
         """Insert model_name and model_model field values upon creation."""
         for vals in vals_list:
             if not vals.get("model_id"):
                 raise UserError(_("No model defined to create log."))
-            model = self.env["ir.model"].sudo().browse(vals["model_id"])
+        # Browse all models at once so their names are fetched in one query
+        models_by_id = {
+            model.id: model
+            for model in self.env["ir.model"]
+            .sudo()
+            .browse({vals["model_id"] for vals in vals_list})
+        }
+        for vals in vals_list:
+            model = models_by_id[vals["model_id"]]
             vals.update({"model_name": model.name, "model_model": model.model})
         return super().create(vals_list)
 
@@ -51,6 +69,17 @@ class AuditlogLog(models.Model):
             vals.update({"model_name": model.name, "model_model": model.model})
         return super().write(vals)
 
+    def unlink(self):
+        # Partitioned storage has no foreign key from the lines to the logs,
+        # hence no cascade
+        if self.env["auditlog.partition"].is_partitioned():
+            self.line_ids.unlink()
+        else:
+            self.env["auditlog.log.line.view"]._forget_materialized(
+                self.line_ids.ids
+            )
+        return super().unlink()
+
     def show_res_ids(self):
         self.ensure_one()
         return {
@@ -79,6 +108,29 @@ class AuditlogLogLine(models.Model):
     field_name = fields.Char("Technical name", readonly=True)
     field_description = fields.Char("Description", readonly=True)
 
+    def init(self):
+        # Used to walk the lines in creation order; the log line view
+        # inheriting this model has no table of its own
+        if self._auto:
+            create_index(
+                self.env.cr,
+                f"{self._table}_create_date_id_index",
+                self._table,
+                ["create_date", "id"],
+            )
+
+    def _auto_init(self):
+        res = super()._auto_init()
+        # A foreign key to a partitioned table must include its partition
+        # key: `log_id` is left unconstrained once logs are partitioned.
+        if self.env["auditlog.partition"].is_partitioned():
+            self.pool._foreign_keys.pop((self._table, "log_id"), None)
+        return res
+
+    def unlink(self):
+        self.env["auditlog.log.line.view"]._forget_materialized(self.ids)
+        return super().unlink()
+
     @api.model_create_multi
     def create(self, vals_list):
         """Ensure field_id is not empty on creation and store field_name and
@@ -86,7 +138,15 @@ class AuditlogLogLine(models.Model):
         for vals in vals_list:
             if not vals.get("field_id"):
                 raise UserError(_("No field defined to create line."))
-            field = self.env["ir.model.fields"].sudo().browse(vals["field_id"])
+        # Browse all fields at once so their names are fetched in one query
+        fields_by_id = {
+            field.id: field
+            for field in self.env["ir.model.fields"]
+            .sudo()
+            .browse({vals["field_id"] for vals in vals_list})
+        }
+        for vals in vals_list:
+            field = fields_by_id[vals["field_id"]]
             vals.update(
                 {"field_name": field.name, "field_description": field.field_description}
             )
@@ -0,0 +1,337 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+import logging
+import re
+from datetime import date, datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, models
+from odoo.tools import SQL, str2bool
+from odoo.tools.sql import table_kind
+
+_logger = logging.getLogger(__name__)
+
+# Tables stored as monthly partitions on `create_date`, with the foreign keys
+# that cannot be kept once they are (a foreign key must reference the whole
+# primary key of a partitioned table, which includes `create_date`).
+PARTITIONED_TABLES = {
+    "auditlog_log": (),
+    "auditlog_log_line": ("log_id",),
+}
+PARTITION_NAME_RE = re.compile(
+    r"^(?P<table>.+)_p(?P<year>\d{4})(?P<month>\d{2})$"
+)
+PARTITIONED_STORAGE_PARAM = "auditlog.partitioned_storage"
+# Suffix of the partition receiving the rows of the months without partition
+DEFAULT_PARTITION_SUFFIX = "_pdefault"
+
+
+class AuditlogPartition(models.TransientModel):
+    _name = "auditlog.partition"
+    _description = "Auditlog - Partitioned log storage"
+
+    @api.model
+    def is_partitioned(self):
+        """Return whether the log tables are stored as partitions."""
+        self.env.cr.execute(
+            "SELECT relkind FROM pg_class WHERE relname = 'auditlog_log'"
+        )
+        row = self.env.cr.fetchone()
+        return bool(row and row[0] == "p")
+
+    @api.model
+    def maintain_partitions(self, days=None, months_ahead=3):
+        """Convert the log tables to monthly partitions if the storage mode
+        is enabled, create the partitions of the next ``months_ahead`` months
+        and drop the partitions entirely older than ``days``.
+
+        Called from a cron.
+        """
+        enabled = str2bool(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param(PARTITIONED_STORAGE_PARAM, "False")
+        )
+        if not self.is_partitioned():
+            if not enabled:
+                return False
+            self._convert_to_partitions(months_ahead)
+        # Months the cron missed have their rows in the default partitions
+        oldest = self._oldest_default_month()
+        self._create_partitions(min(oldest or date.today(), date.today()), months_ahead)
+        if days is not None:
+            deadline = datetime.now() - timedelta(days=max(int(days), 0))
+            self._drop_expired_partitions(deadline)
+        return True
+
+    @api.model
+    def _month_start(self, day):
+        return date(day.year, day.month, 1)
+
+    @api.model
+    def _partition_name(self, table, month):
+        return f"{table}_p{month.year:04d}{month.month:02d}"
+
+    @api.model
+    def _oldest_default_month(self):
+        """Return the first day of the oldest month found in the default
+        partitions, or ``None`` when they hold no rows.
+        """
+        months = []
+        for table in PARTITIONED_TABLES:
+            default = f"{table}{DEFAULT_PARTITION_SUFFIX}"
+            if not table_kind(self.env.cr, default):
+                continue
+            self.env.cr.execute(
+                SQL("SELECT MIN(create_date) FROM %s", SQL.identifier(default))
+            )
+            oldest = self.env.cr.fetchone()[0]
+            if oldest:
+                months.append(self._month_start(oldest))
+        return min(months, default=None)
+
+    @api.model
+    def _create_partitions(self, date_from, months_ahead):
+        """Create the missing monthly partitions from ``date_from`` up to
+        ``months_ahead`` months after the current one.
+        """
+        cr = self.env.cr
+        month = self._month_start(date_from)
+        last_month = self._month_start(date.today()) + relativedelta(
+            months=months_ahead
+        )
+        while month <= last_month:
+            next_month = month + relativedelta(months=1)
+            for table in PARTITIONED_TABLES:
+                name = self._partition_name(table, month)
+                if not table_kind(cr, name):
+                    self._create_partition(table, name, month, next_month)
+            month = next_month
+
+    @api.model
+    def _create_partition(self, table, name, month, next_month):
+        """Create the partition ``name`` of ``table`` for ``[month,
+        next_month)``. Rows of that range already stored in the default
+        partition (the cron did not run in time) would make the creation
+        fail: the default partition is then detached, its rows moved to the
+        new partition, and attached again.
+        """
+        cr = self.env.cr
+        default = f"{table}{DEFAULT_PARTITION_SUFFIX}"
+        create = SQL(
+            "CREATE TABLE %s PARTITION OF %s FOR VALUES FROM (%s) TO (%s)",
+            SQL.identifier(name),
+            SQL.identifier(table),
+            month,
+            next_month,
+        )
+        in_range = SQL("create_date >= %s AND create_date < %s", month, next_month)
+        has_default_rows = False
+        if table_kind(cr, default):
+            cr.execute(
+                SQL(
+                    "SELECT 1 FROM %s WHERE %s LIMIT 1",
+                    SQL.identifier(default),
+                    in_range,
+                )
+            )
+            has_default_rows = bool(cr.rowcount)
+        if not has_default_rows:
+            cr.execute(create)
+            return
+        cr.execute(
+            SQL(
+                "ALTER TABLE %s DETACH PARTITION %s",
+                SQL.identifier(table),
+                SQL.identifier(default),
+            )
+        )
+        cr.execute(create)
+        cr.execute(
+            SQL(
+                """
+                WITH moved AS (DELETE FROM %s WHERE %s RETURNING *)
+                INSERT INTO %s SELECT * FROM moved
+                """,
+                SQL.identifier(default),
+                in_range,
+                SQL.identifier(name),
+            )
+        )
+        _logger.info(
+            "%s rows moved from %s to partition %s", cr.rowcount, default, name
+        )
+        cr.execute(
+            SQL(
+                "ALTER TABLE %s ATTACH PARTITION %s DEFAULT",
+                SQL.identifier(table),
+                SQL.identifier(default),
+            )
+        )
+
+    @api.model
+    def _get_partitions(self, table):
+        """Return ``{partition name: first day of its month}`` for ``table``."""
+        self.env.cr.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [table],
+        )
+        partitions = {}
+        for (name,) in self.env.cr.fetchall():
+            match = PARTITION_NAME_RE.match(name)
+            if match and match["table"] == table:
+                year, month = int(match["year"]), int(match["month"])
+                partitions[name] = date(year, month, 1)
+        return partitions
+
+    @api.model
+    def _drop_expired_partitions(self, deadline):
+        """Drop the partitions whose whole month is older than ``deadline``.
+        Return the number of partitions dropped.
+        """
+        nb_dropped = 0
+        for table in PARTITIONED_TABLES:
+            for name, month in self._get_partitions(table).items():
+                if month + relativedelta(months=1) > deadline.date():
+                    continue
+                self.env.cr.execute(SQL("DROP TABLE %s", SQL.identifier(name)))
+                nb_dropped += 1
+                _logger.info("AUTOVACUUM - partition '%s' dropped", name)
+        if nb_dropped:
+            self.env["auditlog.log.line.view"]._prune_materialized()
+            self.env.invalidate_all()
+        return nb_dropped
+
+    @api.model
+    def _convert_to_partitions(self, months_ahead):
+        """Move the log tables to partitioned tables, once.
+
+        Existing rows are copied in the same transaction, which can be long on
+        big tables: enable the storage mode during a maintenance window.
+        """
+        cr = self.env.cr
+        self.env["auditlog.log"].flush_model()
+        self.env["auditlog.log.line"].flush_model()
+        cr.execute("SELECT MIN(create_date) FROM auditlog_log")
+        oldest = cr.fetchone()[0] or datetime.now()
+        for table, dropped_foreign_keys in PARTITIONED_TABLES.items():
+            old_table = f"{table}_unpartitioned"
+            cr.execute(
+                """
+                SELECT indexdef, indexname FROM pg_indexes
+                JOIN pg_class ON pg_class.relname = pg_indexes.indexname
+                JOIN pg_index ON pg_index.indexrelid = pg_class.oid
+                WHERE pg_indexes.tablename = %s AND NOT pg_index.indisunique
+                """,
+                [table],
+            )
+            indexes = cr.fetchall()
+            cr.execute(
+                """
+                SELECT conname, pg_get_constraintdef(oid),
+                       (SELECT attname FROM pg_attribute
+                        WHERE attrelid = conrelid AND attnum = conkey[1])
+                FROM pg_constraint
+                WHERE conrelid = %s::regclass AND contype = 'f'
+                """,
+                [table],
+            )
+            foreign_keys = [
+                (name, definition)
+                for name, definition, column in cr.fetchall()
+                if column not in dropped_foreign_keys
+            ]
+            cr.execute(
+                SQL(
+                    "ALTER TABLE %s RENAME TO %s",
+                    SQL.identifier(table),
+                    SQL.identifier(old_table),
+                )
+            )
+            cr.execute(
+                SQL(
+                    "ALTER TABLE %s RENAME CONSTRAINT %s TO %s",
+                    SQL.identifier(old_table),
+                    SQL.identifier(f"{table}_pkey"),
+                    SQL.identifier(f"{old_table}_pkey"),
+                )
+            )
+            for __, index_name in indexes:
+                cr.execute(SQL("DROP INDEX %s", SQL.identifier(index_name)))
+            cr.execute(
+                SQL(
+                    "ALTER SEQUENCE %s OWNED BY NONE",
+                    SQL.identifier(f"{table}_id_seq"),
+                )
+            )
+            cr.execute(
+                SQL(
+                    """
+                    CREATE TABLE %s (
+                        LIKE %s INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+                    ) PARTITION BY RANGE (create_date)
+                    """,
+                    SQL.identifier(table),
+                    SQL.identifier(old_table),
+                )
+            )
+            cr.execute(
+                SQL(
+                    "ALTER TABLE %s ADD CONSTRAINT %s"
+                    " PRIMARY KEY (id, create_date)",
+                    SQL.identifier(table),
+                    SQL.identifier(f"{table}_pkey"),
+                )
+            )
+            cr.execute(
+                SQL(
+                    "ALTER SEQUENCE %s OWNED BY %s.id",
+                    SQL.identifier(f"{table}_id_seq"),
+                    SQL.identifier(table),
+                )
+            )
+            # Rows of the months without partition yet, moved to their
+            # partition once created (see `_create_partition`)
+            cr.execute(
+                SQL(
+                    "CREATE TABLE %s PARTITION OF %s DEFAULT",
+                    SQL.identifier(f"{table}{DEFAULT_PARTITION_SUFFIX}"),
+                    SQL.identifier(table),
+                )
+            )
+            for index_def, __ in indexes:
+                cr.execute(index_def)
+            for constraint_name, definition in foreign_keys:
+                cr.execute(
+                    SQL(
+                        "ALTER TABLE %s ADD CONSTRAINT %s %s",
+                        SQL.identifier(table),
+                        SQL.identifier(constraint_name),
+                        SQL(definition),
+                    )
+                )
+        self._create_partitions(oldest, months_ahead)
+        for table in PARTITIONED_TABLES:
+            old_table = f"{table}_unpartitioned"
+            cr.execute(
+                SQL(
+                    "INSERT INTO %s SELECT * FROM %s",
+                    SQL.identifier(table),
+                    SQL.identifier(old_table),
+                )
+            )
+            _logger.info(
+                "%s rows moved to partitioned table %s", cr.rowcount, table
+            )
+        # Lines first: they referenced the logs through `log_id`
+        for table in reversed(PARTITIONED_TABLES):
+            old_table = f"{table}_unpartitioned"
+            cr.execute(SQL("DROP TABLE %s", SQL.identifier(old_table)))
+        self.env.registry.clear_cache()
+        return True
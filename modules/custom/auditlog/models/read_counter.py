@@ -0,0 +1,121 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# Record IDs kept per counter: a bounded sample, so that the counters of hot
+# models stay small rows however many records they read in the hour
+READ_COUNTER_MAX_IDS = 1000
+
+
+class AuditlogReadCounter(models.Model):
+    _name = "auditlog.read.counter"
+    _description = "Auditlog - Aggregated reads"
+    _order = "hour desc, id desc"
+
+    hour = fields.Datetime(required=True, readonly=True, index=True)
+    user_id = fields.Many2one("res.users", string="User", readonly=True)
+    model_id = fields.Many2one(
+        "ir.model", string="Model", readonly=True, ondelete="cascade"
+    )
+    model_model = fields.Char(string="Technical Model Name", readonly=True)
+    read_count = fields.Integer("Reads", readonly=True)
+    res_ids = fields.Text(
+        "Resource IDs",
+        readonly=True,
+        help=f"The first {READ_COUNTER_MAX_IDS} distinct records read (lowest IDs)",
+    )
+    res_count = fields.Integer(
+        "Records Read",
+        compute="_compute_res_count",
+        help=f"Distinct records read, counted up to {READ_COUNTER_MAX_IDS}",
+    )
+
+    _sql_constraints = [
+        (
+            "model_user_hour_uniq",
+            "unique(model_id, user_id, hour)",
+            "Reads are counted once per model, user and hour.",
+        )
+    ]
+
+    def init(self):
+        # Same keyset as the other audit tables for `auditlog.autovacuum`
+        create_index(
+            self.env.cr,
+            f"{self._table}_create_date_id_index",
+            self._table,
+            ["create_date", "id"],
+        )
+
+    @api.depends("res_ids")
+    def _compute_res_count(self):
+        for counter in self:
+            counter.res_count = (
+                len(counter.res_ids.split(",")) if counter.res_ids else 0
+            )
+
+    @api.model
+    def _add_reads(self, counters):
+        """Add the reads of ``counters``, a dict
+        ``{(hour, uid, model_id, model): [read count, set of record IDs]}``,
+        to the stored counters in one upsert. At most READ_COUNTER_MAX_IDS
+        record IDs are kept per counter; once full, only its read count grows.
+        """
+        if not counters:
+            return
+        now = fields.Datetime.now()
+        uid = self.env.uid
+        values = [
+            SQL(
+                "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                hour,
+                user_id,
+                model_id,
+                model,
+                read_count,
+                ",".join(map(str, sorted(res_ids)[:READ_COUNTER_MAX_IDS])),
+                uid,
+                now,
+                uid,
+                now,
+            )
+            for (hour, user_id, model_id, model), (read_count, res_ids) in sorted(
+                counters.items()
+            )
+        ]
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO auditlog_read_counter AS counter (
+                    hour, user_id, model_id, model_model, read_count, res_ids,
+                    create_uid, create_date, write_uid, write_date
+                )
+                VALUES %(values)s
+                ON CONFLICT (model_id, user_id, hour) DO UPDATE SET
+                    read_count = counter.read_count + EXCLUDED.read_count,
+                    res_ids = CASE
+                        WHEN cardinality(string_to_array(counter.res_ids, ','))
+                            >= %(max_ids)s
+                        THEN counter.res_ids
+                        ELSE (
+                            SELECT string_agg(res_id::text, ',' ORDER BY res_id)
+                            FROM (
+                                SELECT DISTINCT unnest(
+                                    string_to_array(counter.res_ids, ',')::int[]
+                                    || string_to_array(EXCLUDED.res_ids, ',')::int[]
+                                ) AS res_id
+                                ORDER BY res_id
+                                LIMIT %(max_ids)s
+                            ) AS merged
+                        )
+                    END,
+                    write_uid = EXCLUDED.write_uid,
+                    write_date = EXCLUDED.write_date
+                """,
+                values=SQL(", ").join(values),
+                max_ids=READ_COUNTER_MAX_IDS,
+            )
+        )
+        self.env.invalidate_all()
@@ -2,12 +2,22 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
 import copy
+import logging
+import random
 from collections import defaultdict
 
-from odoo import Command, _, api, fields, models
+from psycopg2.errors import ForeignKeyViolation
+
+from odoo import SUPERUSER_ID, Command, _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.http import request
+from odoo.tools import SQL
 from odoo.tools.misc import OrderedSet
 
+from .http_session import forget_cached_ids
+
+_logger = logging.getLogger(__name__)
+
 FIELDS_BLACKLIST = [
     "id",
     "create_uid",
@@ -17,6 +27,22 @@ FIELDS_BLACKLIST = [
     "display_name",
     "__last_update",
 ]
+# Rule fields cached per model by `AuditlogRule._get_rule_settings`
+RULE_CACHE_FIELDS = {
+    "fields_to_exclude_ids",
+    "capture_record",
+    "log_deferred",
+    "log_failed_transactions",
+    "read_log_type",
+    "read_sample_rate",
+}
+# Keys of the per-transaction buffers of deferred logs (see `_defer_logs`)
+# and of aggregated reads (see `_aggregate_read`)
+DEFERRED_LOGS_KEY = "auditlog.deferred_logs"
+READ_COUNTERS_KEY = "auditlog.read_counters"
+# One row per batch of deferred logs, inserted in the audited transaction: the
+# row of a batch made in a savepoint that is rolled back goes away with it
+DEFERRED_MARKERS_TABLE = "auditlog_deferred_marker"
 # Used for performance, to avoid a dictionary instanciation when we need an
 # empty dict to simplify algorithms
 EMPTY_DICT = {}
@@ -120,6 +146,22 @@ class AuditlogRule(models.Model):
             "record of the model of this rule"
         ),
     )
+    read_log_type = fields.Selection(
+        [("detailed", "Detailed"), ("aggregated", "Aggregated")],
+        string="Read Logging",
+        required=True,
+        default="detailed",
+        help=(
+            "Detailed: one log per read, with a line per field read\n"
+            "Aggregated: only count the reads per user, model and hour, with "
+            "the IDs of the records read (no field values, far fewer writes)"
+        ),
+    )
+    read_sample_rate = fields.Float(
+        "Read Sampling (%)",
+        default=100.0,
+        help="Percentage of the reads which are logged, picked at random",
+    )
     log_write = fields.Boolean(
         "Log Writes",
         default=True,
@@ -175,9 +217,27 @@ class AuditlogRule(models.Model):
         "ir.actions.act_window",
         string="Action",
     )
+    archive_action_id = fields.Many2one(
+        "ir.actions.server",
+        string="Archived Logs Action",
+    )
     capture_record = fields.Boolean(
         help="Select this if you want to keep track of Unlink Record",
     )
+    log_deferred = fields.Boolean(
+        "Deferred Logging",
+        help=(
+            "Buffer the logs of a transaction and write them in bulk on a "
+            "separate cursor once the transaction is committed, instead of "
+            "inside the transaction itself (shorter locks on audited tables)"
+        ),
+    )
+    log_failed_transactions = fields.Boolean(
+        help=(
+            "With deferred logging, also write the logs of operations whose "
+            "transaction was rolled back"
+        ),
+    )
     users_to_exclude_ids = fields.Many2many(
         "res.users",
         string="Users to Exclude",
@@ -198,9 +258,23 @@ class AuditlogRule(models.Model):
                 "There is already a rule defined on this model\n"
                 "You cannot define another: please edit the existing one."
             ),
-        )
+        ),
+        (
+            "read_sample_rate_range",
+            "CHECK(read_sample_rate > 0 AND read_sample_rate <= 100)",
+            "The read sampling rate must be between 0 (excluded) and 100%.",
+        ),
     ]
 
+    def init(self):
+        # Only lives between a commit and its deferred logs flush
+        self.env.cr.execute(
+            SQL(
+                "CREATE UNLOGGED TABLE IF NOT EXISTS %s (id bigserial PRIMARY KEY)",
+                SQL.identifier(DEFERRED_MARKERS_TABLE),
+            )
+        )
+
     def _register_hook(self):
         """Get all rules and apply them to log method calls."""
         super()._register_hook()
@@ -208,6 +282,8 @@ class AuditlogRule(models.Model):
             self.pool._auditlog_field_cache = {}
         if not hasattr(self.pool, "_auditlog_model_cache"):
             self.pool._auditlog_model_cache = {}
+        if not hasattr(self.pool, "_auditlog_rule_cache"):
+            self.pool._auditlog_rule_cache = {}
         if not self:
             self = self.search([("state", "=", "subscribed")])
         return self._patch_methods()
@@ -265,6 +341,9 @@ class AuditlogRule(models.Model):
             if rule.log_export_data and not hasattr(model_model, check_attr):
                 updated = rule._patch_method(model_model, "export_data", check_attr)
 
+        self._load_field_cache(
+            [rule.model_id.model for rule in self if rule.state == "subscribed"]
+        )
         return updated
 
     def _revert_methods(self):
@@ -293,6 +372,7 @@ class AuditlogRule(models.Model):
             model = self.env["ir.model"].sudo().browse(vals["model_id"])
             vals.update({"model_name": model.name, "model_model": model.model})
         new_records = super().create(vals_list)
+        self._invalidate_rule_cache()
         updated = [record._register_hook() for record in new_records]
         if any(updated):
             self._update_registry()
@@ -306,15 +386,49 @@ class AuditlogRule(models.Model):
             model = self.env["ir.model"].sudo().browse(vals["model_id"])
             vals.update({"model_name": model.name, "model_model": model.model})
         res = super().write(vals)
-        if self._register_hook():
+        self._invalidate_rule_cache()
+        if self._register_hook() or RULE_CACHE_FIELDS.intersection(vals):
             self._update_registry()
         return res
 
     def unlink(self):
         """Unsubscribe rules before removing them."""
         self.unsubscribe()
+        self._invalidate_rule_cache()
         return super().unlink()
 
+    def _invalidate_rule_cache(self):
+        """Drop the per-model rule settings cached by `_get_rule_settings`,
+        and the field metadata of the audited models."""
+        getattr(self.pool, "_auditlog_rule_cache", {}).clear()
+        self._invalidate_field_cache()
+
+    @api.model
+    def _invalidate_field_cache(self):
+        """Drop the field metadata cached by `_load_field_cache`."""
+        getattr(self.pool, "_auditlog_field_cache", {}).clear()
+
+    @api.model
+    def _get_rule_settings(self, res_model):
+        """Return the settings of the rule of ``res_model`` needed to build its
+        logs, cached in the registry to avoid a rule search on every log call.
+        """
+        cache = self.pool._auditlog_rule_cache
+        if res_model not in cache:
+            model_id = self.pool._auditlog_model_cache[res_model]
+            rule = self.sudo().search([("model_id", "=", model_id)], limit=1)
+            cache[res_model] = {
+                "fields_to_exclude": rule.fields_to_exclude_ids.mapped("name"),
+                "capture_record": rule.capture_record,
+                "log_deferred": rule.log_deferred,
+                "log_failed_transactions": (
+                    rule.log_deferred and rule.log_failed_transactions
+                ),
+                "read_log_type": rule.read_log_type,
+                "read_sample_rate": rule.read_sample_rate,
+            }
+        return cache[res_model]
+
     @api.model
     def get_auditlog_fields(self, model):
         """
@@ -328,6 +442,34 @@ class AuditlogRule(models.Model):
             if (not f.compute and not f.related) or f.store
         )
 
+    @api.model
+    def _get_write_fields_to_log(self, model, vals, fields_list):
+        """Return the fields of ``fields_list`` whose value may be changed by
+        writing ``vals`` on ``model``: the written fields, the fields updated
+        by their inverse methods, and the stored fields depending on any of
+        them according to the registry's field triggers.
+        """
+        registry = self.env.registry
+        written = []
+        for fname in vals:
+            field = model._fields.get(fname)
+            if not field:
+                continue
+            written.append(field)
+            if field.inverse:
+                for path in registry.field_depends[field]:
+                    dependency = model._fields.get(path.split(".")[0])
+                    if dependency:
+                        written.append(dependency)
+        candidates = {field.name for field in written}
+        for field in written:
+            candidates.update(
+                dependent.name
+                for dependent in registry.get_dependent_fields(field)
+                if dependent.model_name == model._name and dependent.store
+            )
+        return [fname for fname in fields_list if fname in candidates]
+
     def _make_create(self):
         """Instanciate a create method that log its calls."""
         self.ensure_one()
@@ -419,10 +561,17 @@ class AuditlogRule(models.Model):
             if self.env.context.get("auditlog_disabled"):
                 return result
             self = self.with_context(auditlog_disabled=True)
-            rule_model = self.env["auditlog.rule"]
+            rule_model = self.env["auditlog.rule"].sudo()
             if self.env.user in users_to_exclude:
                 return result
-            rule_model.sudo().create_logs(
+            rule_settings = rule_model._get_rule_settings(self._name)
+            sample_rate = rule_settings["read_sample_rate"]
+            if sample_rate < 100 and random.random() * 100 >= sample_rate:
+                return result
+            if rule_settings["read_log_type"] == "aggregated":
+                rule_model._aggregate_read(self.env.uid, self._name, self.ids)
+                return result
+            rule_model.create_logs(
                 self.env.uid,
                 self._name,
                 self.ids,
@@ -453,11 +602,16 @@ class AuditlogRule(models.Model):
             if not records_write:
                 return write_full.origin(self, vals, **kwargs)
 
+            if self._name == "res.users":
+                vals = self._remove_reified_groups(vals)
+            # Only diff the written fields and the stored fields depending on them
+            fields_list = rule_model._get_write_fields_to_log(self, vals, fields_list)
+            if not fields_list:
+                return write_full.origin(self, vals, **kwargs)
+
             with ThrowAwayCache(self.env):
                 old_values = {d["id"]: d for d in records_write.read(fields_list)}
 
-            if self._name == "res.users":
-                vals = self._remove_reified_groups(vals)
             result = write_full.origin(self, vals, **kwargs)
             self.flush_recordset()
             if self.env.user in users_to_exclude:
@@ -512,15 +666,18 @@ class AuditlogRule(models.Model):
         def unlink_full(self, **kwargs):
             self = self.with_context(auditlog_disabled=True)
             rule_model = self.env["auditlog.rule"]
-            fields_list = rule_model.get_auditlog_fields(self)
-            old_values = {
-                d["id"]: d
-                for d in self.sudo()
-                .with_context(prefetch_fields=False)
-                .read(fields_list)
-            }
             if self.env.user in users_to_exclude:
                 return unlink_full.origin(self, **kwargs)
+            old_values = None
+            # Deleted values are only logged when the rule captures the record
+            if rule_model._get_rule_settings(self._name)["capture_record"]:
+                fields_list = rule_model.get_auditlog_fields(self)
+                old_values = {
+                    d["id"]: d
+                    for d in self.sudo()
+                    .with_context(prefetch_fields=False)
+                    .read(fields_list)
+                }
             rule_model.sudo().create_logs(
                 self.env.uid,
                 self._name,
@@ -593,79 +750,291 @@ class AuditlogRule(models.Model):
         if new_values is None:
             new_values = EMPTY_DICT
         log_model = self.env["auditlog.log"]
-        http_request_model = self.env["auditlog.http.request"]
-        http_session_model = self.env["auditlog.http.session"]
         model_model = self.env[res_model]
         model_id = self.pool._auditlog_model_cache[res_model]
-        auditlog_rule = self.env["auditlog.rule"].search([("model_id", "=", model_id)])
-        fields_to_exclude = auditlog_rule.fields_to_exclude_ids.mapped("name")
+        rule_settings = self._get_rule_settings(res_model)
+        fields_to_exclude = rule_settings["fields_to_exclude"]
 
         vals = {
             "model_id": model_id,
             "method": method,
             "user_id": uid,
-            "http_request_id": http_request_model.current_http_request(),
-            "http_session_id": http_session_model.current_http_session(),
         }
         vals.update(additional_log_values or {})
         if method == "export_data":
             vals.update({"name": res_model, "res_ids": str(res_ids)})
-            return log_model.create(vals)
+            return self._write_logs(rule_settings, [vals], [[]])
 
+        # Compute all display names in one go through the prefetch mechanism
+        records = model_model.browse(res_ids)
+        names = dict(zip(records.ids, records.mapped("display_name"), strict=True))
+        log_vals_list = []
+        lines_vals_list = []
         for res_id in res_ids:
-            res = model_model.browse(res_id)
-            log_vals = {**vals, "name": res.display_name, "res_id": res_id}
+            log_vals = {**vals, "name": names[res_id], "res_id": res_id}
 
             diff = DictDiffer(
                 new_values.get(res_id, EMPTY_DICT), old_values.get(res_id, EMPTY_DICT)
             )
+            line_commands = []
             if method == "create":
-                log_vals["line_ids"] = self._create_log_line_on_create(
+                line_commands = self._create_log_line_on_create(
                     log_vals, diff.added(), new_values, fields_to_exclude
                 )
             elif method == "read":
-                log_vals["line_ids"] = self._create_log_line_on_read(
+                line_commands = self._create_log_line_on_read(
                     log_vals,
                     list(old_values.get(res_id, EMPTY_DICT).keys()),
                     old_values,
                     fields_to_exclude,
                 )
             elif method == "write":
-                log_vals["line_ids"] = self._create_log_line_on_write(
+                line_commands = self._create_log_line_on_write(
                     log_vals, diff.changed(), old_values, new_values, fields_to_exclude
                 )
-            elif method == "unlink" and auditlog_rule.capture_record:
-                log_vals["line_ids"] = self._create_log_line_on_read(
+            elif method == "unlink" and rule_settings["capture_record"]:
+                line_commands = self._create_log_line_on_read(
                     log_vals,
                     list(old_values.get(res_id, EMPTY_DICT).keys()),
                     old_values,
                     fields_to_exclude,
                 )
-            if method == "unlink" or log_vals.get("line_ids", {}):
-                log_model.create(log_vals)
+            if method == "unlink" or line_commands:
+                log_vals_list.append(log_vals)
+                lines_vals_list.append([command[2] for command in line_commands])
+        if not log_vals_list:
+            return log_model
+        return self._write_logs(rule_settings, log_vals_list, lines_vals_list)
+
+    def _write_logs(self, rule_settings, log_vals_list, lines_vals_list):
+        """Write the logs now, or buffer them until the end of the transaction
+        if the rule asks for deferred logging.
+        """
+        if rule_settings["log_deferred"]:
+            self._defer_logs(
+                log_vals_list,
+                lines_vals_list,
+                rule_settings["log_failed_transactions"],
+            )
+            return self.env["auditlog.log"]
+        return self._insert_logs_with_http(log_vals_list, lines_vals_list)
+
+    @api.model
+    def _get_http_log_vals(self):
+        """HTTP session and request of the logs being written, only logged
+        once a log is actually emitted."""
+        return {
+            "http_request_id": self.env["auditlog.http.request"]
+            .current_http_request(),
+            "http_session_id": self.env["auditlog.http.session"]
+            .current_http_session(),
+        }
+
+    @api.model
+    def _insert_logs_with_http(self, log_vals_list, lines_vals_list):
+        """Insert the logs with the HTTP session and request of the current
+        request. Their IDs are cached for the whole request without being
+        checked again; if their rows were rolled back with a savepoint since,
+        the insert fails on the foreign key, and is done again once the
+        cached IDs are forgotten (and the rows created anew).
+        """
+        for attempt in range(2):
+            http_vals = self._get_http_log_vals()
+            try:
+                with self.env.cr.savepoint():
+                    return self._insert_logs(
+                        [{**http_vals, **log_vals} for log_vals in log_vals_list],
+                        lines_vals_list,
+                    )
+            except ForeignKeyViolation:
+                if attempt or not request:
+                    raise
+                forget_cached_ids(request.httprequest)
+
+    @api.model
+    def _insert_logs(self, log_vals_list, lines_vals_list):
+        """Create the logs in one INSERT, then all their lines in a second one."""
+        logs = self.env["auditlog.log"].create(log_vals_list)
+        self.env["auditlog.log.line"].create(
+            [
+                {**line_vals, "log_id": log.id}
+                for log, lines_vals in zip(logs, lines_vals_list, strict=True)
+                for line_vals in lines_vals
+            ]
+        )
+        return logs
+
+    @api.model
+    def _defer_logs(self, log_vals_list, lines_vals_list, on_rollback=False):
+        """Buffer logs on the current cursor, to be flushed by a `postcommit`
+        hook (and a `postrollback` one if ``on_rollback`` is set).
+
+        Rolling back a savepoint runs no hook, so each batch is tagged with a
+        marker row inserted in the current transaction: the commit flush drops
+        the batches whose marker was rolled back with their operation.
+        """
+        cr = self.env.cr
+        cr.execute(
+            SQL(
+                "INSERT INTO %s DEFAULT VALUES RETURNING id",
+                SQL.identifier(DEFERRED_MARKERS_TABLE),
+            )
+        )
+        marker = cr.fetchone()[0]
+        hooks = [cr.postcommit]
+        if on_rollback:
+            hooks.append(cr.postrollback)
+        for hook in hooks:
+            buffer = hook.data.get(DEFERRED_LOGS_KEY)
+            if buffer is None:
+                buffer = hook.data[DEFERRED_LOGS_KEY] = []
+                hook.add(
+                    self._make_deferred_logs_flusher(
+                        buffer, after_rollback=hook is cr.postrollback
+                    )
+                )
+            buffer.extend(
+                (marker, log_vals, lines_vals)
+                for log_vals, lines_vals in zip(
+                    log_vals_list, lines_vals_list, strict=True
+                )
+            )
+
+    @api.model
+    def _make_deferred_logs_flusher(self, buffer, after_rollback=False):
+        registry = self.env.registry
+
+        def flush_deferred_logs():
+            if not buffer:
+                return
+            if after_rollback and request:
+                # The HTTP logs cached on the request may have been created by
+                # the transaction just rolled back
+                forget_cached_ids(request.httprequest)
+            try:
+                with registry.cursor() as cr:
+                    env = api.Environment(
+                        cr, SUPERUSER_ID, {"auditlog_disabled": True}
+                    )
+                    env["auditlog.rule"]._flush_deferred_logs(
+                        buffer, after_rollback=after_rollback
+                    )
+            except Exception:
+                _logger.exception(
+                    "Failed to write %s deferred audit logs", len(buffer)
+                )
+            finally:
+                buffer.clear()
+
+        return flush_deferred_logs
+
+    @api.model
+    def _aggregate_read(self, uid, res_model, res_ids):
+        """Count a read of ``res_ids`` in the per-hour counters of the current
+        transaction, written in one upsert once it ends. Reads are counted
+        whether the transaction is committed or rolled back.
+        """
+        cr = self.env.cr
+        counters = cr.postcommit.data.get(READ_COUNTERS_KEY)
+        if counters is None:
+            counters = cr.postcommit.data[READ_COUNTERS_KEY] = {}
+            flusher = self._make_read_counters_flusher(counters)
+            cr.postcommit.add(flusher)
+            cr.postrollback.add(flusher)
+        hour = fields.Datetime.now().replace(minute=0, second=0)
+        model_id = self.pool._auditlog_model_cache[res_model]
+        counter = counters.setdefault((hour, uid, model_id, res_model), [0, set()])
+        counter[0] += 1
+        counter[1].update(res_ids)
+
+    @api.model
+    def _make_read_counters_flusher(self, counters):
+        registry = self.env.registry
+
+        def flush_read_counters():
+            if not counters:
+                return
+            try:
+                with registry.cursor() as cr:
+                    env = api.Environment(
+                        cr, SUPERUSER_ID, {"auditlog_disabled": True}
+                    )
+                    env["auditlog.read.counter"]._add_reads(counters)
+            except Exception:
+                _logger.exception("Failed to write %s read counters", len(counters))
+            finally:
+                counters.clear()
+
+        return flush_read_counters
+
+    @api.model
+    def _flush_deferred_logs(self, buffer, after_rollback=False):
+        """Write buffered ``(marker, log_vals, lines_vals)`` entries in bulk.
+
+        After a commit, only the entries whose marker row was committed are
+        written; the markers are deleted (and committed) first, so they do not
+        outlive a failed flush. After a rollback, all the markers are gone and
+        every entry is written.
+        """
+        if not after_rollback:
+            cr = self.env.cr
+            cr.execute(
+                SQL(
+                    "DELETE FROM %s WHERE id = ANY(%s) RETURNING id",
+                    SQL.identifier(DEFERRED_MARKERS_TABLE),
+                    list({marker for marker, __, __ in buffer}),
+                )
+            )
+            committed = {row[0] for row in cr.fetchall()}
+            cr.commit()
+            buffer = [entry for entry in buffer if entry[0] in committed]
+            if not buffer:
+                return self.env["auditlog.log"]
+        return self._insert_logs_with_http(
+            [log_vals for __, log_vals, __ in buffer],
+            [lines_vals for __, __, lines_vals in buffer],
+        )
+
+    @api.model
+    def _load_field_cache(self, model_names):
+        """Load the metadata of all the fields of ``model_names``, and of the
+        models they inherit, in the field cache at once instead of one field
+        at a time while logging.
+        """
+        cache = self.pool._auditlog_field_cache
+        model_names = [
+            name for name in model_names if name not in cache and name in self.env
+        ]
+        if not model_names:
+            return
+        parents = {name: list(self.env[name]._inherits) for name in model_names}
+        all_model_names = set(model_names).union(*parents.values())
+        # - we use 'search()' then 'read()' instead of the 'search_read()'
+        #   to take advantage of the 'classic_write' loading
+        fields_data = (
+            self.env["ir.model.fields"]
+            .sudo()
+            .search([("model", "in", list(all_model_names))])
+            .read(load="_classic_write")
+        )
+        fields_by_model = defaultdict(dict)
+        for field_data in fields_data:
+            fields_by_model[field_data["model"]][field_data["name"]] = field_data
+        for name in model_names:
+            # Fields of the model itself take precedence over inherited ones
+            model_fields = cache[name] = {}
+            for parent in parents[name]:
+                model_fields.update(fields_by_model[parent])
+            model_fields.update(fields_by_model[name])
 
     def _get_field(self, model_id, field_name):
         model = self.env["ir.model"].sudo().browse(model_id)
         cache = self.pool._auditlog_field_cache
-        if field_name not in cache.get(model.model, {}):
-            cache.setdefault(model.model, {})
-            # - we use 'search()' then 'read()' instead of the 'search_read()'
-            #   to take advantage of the 'classic_write' loading
-            # - search the field in the current model and those it inherits
-            field_model = self.env["ir.model.fields"].sudo()
-            all_model_ids = [model.id]
-            all_model_ids.extend(model.inherited_model_ids.ids)
-            field = field_model.search(
-                [("model_id", "in", all_model_ids), ("name", "=", field_name)]
-            )
-            # The field can be a dummy one, like 'in_group_X' on 'res.users'
-            # As such we can't log it (field_id is required to create a log)
-            if not field:
-                cache[model.model][field_name] = False
-            else:
-                field_data = field.read(load="_classic_write")[0]
-                cache[model.model][field_name] = field_data
-        return cache[model.model][field_name]
+        if model.model not in cache:
+            self._load_field_cache([model.model])
+        # The field can be a dummy one, like 'in_group_X' on 'res.users'
+        # As such we can't log it (field_id is required to create a log)
+        return cache.get(model.model, EMPTY_DICT).get(field_name, False)
 
     def _create_log_line_on_read(
         self, log_vals, fields_list, read_values, fields_to_exclude
@@ -825,7 +1194,35 @@ class AuditlogRule(models.Model):
                 "domain": domain,
             }
             act_window = act_window_model.sudo().create(vals)
-            rule.write({"state": "subscribed", "action_id": act_window.id})
+            # And one to stream its logs moved to the archive segments
+            archive_action = (
+                self.env["ir.actions.server"]
+                .sudo()
+                .create(
+                    {
+                        "name": _("View archived logs"),
+                        "model_id": rule.model_id.id,
+                        "binding_model_id": rule.model_id.id,
+                        "groups_id": [
+                            Command.link(
+                                self.env.ref("auditlog.group_auditlog_user").id
+                            )
+                        ],
+                        "state": "code",
+                        "code": (
+                            "action = env['auditlog.archive']"
+                            ".action_view_archived_logs(records)"
+                        ),
+                    }
+                )
+            )
+            rule.write(
+                {
+                    "state": "subscribed",
+                    "action_id": act_window.id,
+                    "archive_action_id": archive_action.id,
+                }
+            )
         return True
 
     def unsubscribe(self):
@@ -837,6 +1234,8 @@ class AuditlogRule(models.Model):
             act_window = rule.action_id
             if act_window:
                 act_window.unlink()
+            if rule.archive_action_id:
+                rule.archive_action_id.unlink()
         return self.write({"state": "draft"})
 
     @api.model
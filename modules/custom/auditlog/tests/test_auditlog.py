@@ -3,9 +3,13 @@
 # © 2021 Stefan Rijnhart <stefan@opener.amsterdam>
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+from unittest.mock import patch
+
 from odoo.addons.base.models.ir_model import MODULE_UNINSTALL_FLAG
 from odoo.addons.base.models.res_users import name_boolean_group
 
+from ..models import read_counter as read_counter_module
+from ..models import rule as rule_module
 from .common import AuditLogRuleCommon
 
 
@@ -117,6 +121,29 @@ class AuditlogCommon:
         )
         self.assertEqual(len(logs), len(groups))
 
+    def test_LogCreation_batch(self):
+        """Create several records at once and check that each one gets its
+        own log, named after the record, with its field lines.
+        """
+
+        self.groups_rule.subscribe()
+
+        groups = self.env["res.groups"].create(
+            [{"name": f"testgroup_batch{i}"} for i in range(5)]
+        )
+        logs = self.env["auditlog.log"].search(
+            [
+                ("model_id", "=", self.groups_model_id),
+                ("method", "=", "create"),
+                ("res_id", "in", groups.ids),
+            ]
+        )
+        self.assertEqual(len(logs), len(groups))
+        for group in groups:
+            log = logs.filtered(lambda log, group=group: log.res_id == group.id)
+            self.assertEqual(log.name, group.display_name)
+            self.assertIn("name", log.line_ids.mapped("field_name"))
+
     def test_LogCreation5(self):
         """Fifth test, create a record and check that the same number of logs
         has been generated. And then delete it, check that it has created log
@@ -627,6 +654,66 @@ class AuditLogRuleTestForUserFields(AuditLogRuleCommon):
         # Checking log lines are created
         self.assertTrue(delete_log_record)
 
+    def test_07_AuditlogFull_field_exclude_updated(self):
+        # Excluding another field must be taken into account right away,
+        # even though the rule settings are cached in the registry
+        email_field = self.env["ir.model.fields"].search(
+            [("model", "=", "res.partner"), ("name", "=", "email")]
+        )
+        self.auditlog_rule.fields_to_exclude_ids = [(4, email_field.id)]
+        self.testpartner1.with_context(tracking_disable=True).write(
+            {"email": "vendor@mail.com", "name": "abc"}
+        )
+        write_log_record = self.auditlog_log.search(
+            [
+                ("model_id", "=", self.auditlog_rule.model_id.id),
+                ("method", "=", "write"),
+                ("res_id", "=", self.testpartner1.id),
+            ]
+        ).ensure_one()
+        field_names = write_log_record.line_ids.mapped("field_name")
+        self.assertNotIn("email", field_names)
+        self.assertIn("name", field_names)
+
+    def test_08_AuditlogFull_write_fields_to_log(self):
+        # Only the written fields and the stored fields depending on them
+        # are read before and after a write
+        partner_model = self.env["res.partner"]
+        rule_model = self.env["auditlog.rule"]
+        fields_to_log = rule_model._get_write_fields_to_log(
+            partner_model,
+            {"name": "abc"},
+            rule_model.get_auditlog_fields(partner_model),
+        )
+        self.assertIn("name", fields_to_log)
+        self.assertIn("complete_name", fields_to_log)
+        self.assertNotIn("email", fields_to_log)
+
+        self.testpartner1.with_context(tracking_disable=True).write({"name": "abc"})
+        write_log_record = self.auditlog_log.search(
+            [
+                ("model_id", "=", self.auditlog_rule.model_id.id),
+                ("method", "=", "write"),
+                ("res_id", "=", self.testpartner1.id),
+            ]
+        ).ensure_one()
+        self.assertIn("complete_name", write_log_record.line_ids.mapped("field_name"))
+
+    def test_09_field_cache_preloaded(self):
+        rule_model = self.env["auditlog.rule"]
+        field_cache = self.env.registry._auditlog_field_cache
+        rule_model._invalidate_field_cache()
+        rule_model._load_field_cache(["res.partner"])
+        # All the fields of the audited model are loaded at once
+        self.assertEqual(
+            field_cache["res.partner"]["phone"]["id"], self.fields_to_exclude_ids
+        )
+        self.env["ir.model"].sudo().browse(self.contact_model_id).mapped("model")
+        with self.assertQueryCount(0):
+            self.assertFalse(rule_model._get_field(self.contact_model_id, "x_dummy"))
+        self.env["ir.model.fields"].browse(self.fields_to_exclude_ids).write({})
+        self.assertNotIn("res.partner", field_cache)
+
 
 class AuditLogRuleTestForUserModel(AuditLogRuleCommon):
     @classmethod
@@ -767,3 +854,261 @@ class AuditlogFast_excluded_fields(AuditLogRuleCommon):
                 ]
             )
         )
+
+
+class TestAuditlogDeferred(AuditLogRuleCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.groups_model_id = cls.env.ref("base.model_res_groups").id
+        cls.groups_rule = cls.create_rule(
+            {
+                "name": "testrule for groups",
+                "model_id": cls.groups_model_id,
+                "log_create": True,
+                "log_write": True,
+                "log_type": "full",
+                "log_deferred": True,
+            }
+        )
+        cls.groups_rule.subscribe()
+
+    def setUp(self):
+        super().setUp()
+        # Make the cursor opened by the flush hook reuse the test cursor
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+
+    def _search_logs(self, group, method):
+        return self.env["auditlog.log"].search(
+            [
+                ("model_id", "=", self.groups_model_id),
+                ("method", "=", method),
+                ("res_id", "=", group.id),
+            ]
+        )
+
+    def test_01_logs_written_after_commit(self):
+        group = self.env["res.groups"].create({"name": "testgroup_deferred"})
+        group.write({"name": "testgroup_deferred2"})
+        self.assertFalse(self._search_logs(group, "create"))
+        self.env.cr.postcommit.run()
+        self.assertEqual(len(self._search_logs(group, "create")), 1)
+        write_log = self._search_logs(group, "write").ensure_one()
+        self.assertIn("name", write_log.line_ids.mapped("field_name"))
+
+    def test_02_failed_transactions(self):
+        group = self.env["res.groups"].create({"name": "testgroup_failed"})
+        # Rolled back operations are only logged when asked for
+        self.env.cr.postrollback.run()
+        self.assertFalse(self._search_logs(group, "create"))
+        self.groups_rule.log_failed_transactions = True
+        group.write({"name": "testgroup_failed2"})
+        self.env.cr.postrollback.run()
+        self.assertEqual(len(self._search_logs(group, "write")), 1)
+
+    def test_03_rolled_back_savepoint(self):
+        group = self.env["res.groups"].create({"name": "testgroup_kept"})
+        with self.assertRaises(ValueError), self.env.cr.savepoint():
+            group.write({"name": "testgroup_rolled_back"})
+            rolled_back = self.env["res.groups"].create(
+                {"name": "testgroup_rolled_back"}
+            )
+            raise ValueError
+        self.env.cr.postcommit.run()
+        # Only the operations that survived the savepoint are logged
+        self.assertEqual(len(self._search_logs(group, "create")), 1)
+        self.assertFalse(self._search_logs(group, "write"))
+        self.assertFalse(self._search_logs(rolled_back, "create"))
+
+
+class TestAuditlogLineViewMaterialized(AuditLogRuleCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.groups_model_id = cls.env.ref("base.model_res_groups").id
+        cls.groups_rule = cls.create_rule(
+            {
+                "name": "testrule for groups",
+                "model_id": cls.groups_model_id,
+                "log_create": True,
+                "log_write": True,
+                "log_type": "full",
+            }
+        )
+        cls.groups_rule.subscribe()
+
+    def _search_lines(self, group):
+        return self.env["auditlog.log.line.view"].search(
+            [("model_id", "=", self.groups_model_id), ("res_id", "=", group.id)]
+        )
+
+    def _backdate_lines(self, group):
+        """Date the lines of ``group`` as if committed by an older transaction,
+        the test one being the oldest running."""
+        self.env.flush_all()
+        self.env.cr.execute(
+            """
+            UPDATE auditlog_log_line
+            SET create_date = create_date - interval '1 hour'
+            WHERE log_id IN (
+                SELECT id FROM auditlog_log WHERE model_id = %s AND res_id = %s
+            )
+            """,
+            [self.groups_model_id, group.id],
+        )
+        self.env.invalidate_all()
+
+    def test_01_materialized_refresh(self):
+        line_view = self.env["auditlog.log.line.view"]
+        self.env["ir.config_parameter"].set_param(
+            "auditlog.log_line_view_materialized", "True"
+        )
+        group = self.env["res.groups"].create({"name": "testgroup_view"})
+        self._backdate_lines(group)
+        self.assertFalse(line_view._is_materialized())
+        self.assertTrue(line_view.refresh_materialized(lag_minutes=0))
+        self.assertTrue(line_view._is_materialized())
+        copied_lines = self._search_lines(group)
+        self.assertTrue(copied_lines)
+        # Lines newer than the last refresh come from the live view
+        group.write({"name": "testgroup_view2"})
+        line_view.env.flush_all()
+        self.assertGreater(len(self._search_lines(group)), len(copied_lines))
+        self.assertFalse(line_view.refresh_materialized(lag_minutes=60))
+        # Unlinked logs disappear from the materialized table as well
+        self.env["auditlog.log"].search(
+            [("model_id", "=", self.groups_model_id), ("res_id", "=", group.id)]
+        ).unlink()
+        self.assertFalse(self._search_lines(group))
+        self.env["ir.config_parameter"].set_param(
+            "auditlog.log_line_view_materialized", "False"
+        )
+        line_view.refresh_materialized()
+        self.assertFalse(line_view._is_materialized())
+
+    def test_02_materialized_late_commit(self):
+        line_view = self.env["auditlog.log.line.view"]
+        self.env["ir.config_parameter"].set_param(
+            "auditlog.log_line_view_materialized", "True"
+        )
+        group = self.env["res.groups"].create({"name": "testgroup_view"})
+        self._backdate_lines(group)
+        line_view.refresh_materialized(lag_minutes=0)
+        lines = self._search_lines(group)
+        self.assertGreater(len(lines), 1)
+        # A transaction started at the mark commits a line with a lower id
+        # than the copied ones after the refresh
+        late_line_id = min(lines.ids)
+        self.env.cr.execute(
+            "DELETE FROM auditlog_log_line_view_materialized WHERE id = %s",
+            [late_line_id],
+        )
+        self.env.cr.execute(
+            """
+            UPDATE auditlog_log_line SET create_date = (
+                SELECT mark FROM auditlog_log_line_view_materialized_mark
+            ) WHERE id = %s
+            """,
+            [late_line_id],
+        )
+        self.env.invalidate_all()
+        self.assertEqual(self._search_lines(group), lines)
+        self.assertEqual(
+            line_view.search_count(
+                [("model_id", "=", self.groups_model_id), ("res_id", "=", group.id)]
+            ),
+            len(lines),
+        )
+        # Once the mark passes its date, the next refresh copies it
+        self.env.cr.execute(
+            "UPDATE auditlog_log_line SET create_date = create_date - interval '1 "
+            "minute' WHERE id = %s",
+            [late_line_id],
+        )
+        self.env.cr.execute(
+            """
+            UPDATE auditlog_log_line_view_materialized_mark
+            SET mark = mark - interval '1 minute'
+            """
+        )
+        self.assertEqual(line_view.refresh_materialized(lag_minutes=0), 1)
+        self.assertEqual(self._search_lines(group), lines)
+
+
+class TestAuditlogAggregatedReads(AuditLogRuleCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.groups_model_id = cls.env.ref("base.model_res_groups").id
+        cls.groups_rule = cls.create_rule(
+            {
+                "name": "testrule for groups",
+                "model_id": cls.groups_model_id,
+                "log_read": True,
+                "read_log_type": "aggregated",
+                "log_type": "full",
+            }
+        )
+        cls.groups_rule.subscribe()
+
+    def setUp(self):
+        super().setUp()
+        # Make the cursor opened by the flush hook reuse the test cursor
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+
+    def _get_counter(self):
+        return self.env["auditlog.read.counter"].search(
+            [("model_id", "=", self.groups_model_id), ("user_id", "=", self.env.uid)]
+        )
+
+    def test_01_reads_aggregated(self):
+        groups = self.env["res.groups"].create(
+            [{"name": "testgroup_read1"}, {"name": "testgroup_read2"}]
+        )
+        groups[0].read(["name"])
+        groups.read(["name"])
+        self.env.cr.postcommit.run()
+        counter = self._get_counter().ensure_one()
+        self.assertEqual(counter.read_count, 2)
+        self.assertEqual(counter.res_ids, ",".join(map(str, sorted(groups.ids))))
+        # No detailed log is written
+        self.assertFalse(
+            self.env["auditlog.log"].search(
+                [("model_id", "=", self.groups_model_id), ("method", "=", "read")]
+            )
+        )
+        # Later transactions add to the same hourly counter
+        groups[1].read(["name"])
+        self.env.cr.postrollback.run()
+        counter.invalidate_recordset()
+        self.assertEqual(counter.read_count, 3)
+
+    def test_02_reads_sampled(self):
+        self.groups_rule.read_sample_rate = 50
+        group = self.env["res.groups"].create({"name": "testgroup_sampled"})
+        with patch.object(rule_module.random, "random", return_value=0.6):
+            group.read(["name"])
+        self.env.cr.postcommit.run()
+        self.assertFalse(self._get_counter())
+        with patch.object(rule_module.random, "random", return_value=0.4):
+            group.read(["name"])
+        self.env.cr.postcommit.run()
+        self.assertEqual(self._get_counter().read_count, 1)
+
+    def test_03_read_ids_bounded(self):
+        groups = self.env["res.groups"].create(
+            [{"name": f"testgroup_bounded{i}"} for i in range(3)]
+        )
+        with patch.object(read_counter_module, "READ_COUNTER_MAX_IDS", 2):
+            groups.read(["name"])
+            self.env.cr.postcommit.run()
+            counter = self._get_counter().ensure_one()
+            self.assertEqual(counter.res_ids, ",".join(map(str, groups.ids[:2])))
+            # A full counter keeps its IDs, and still counts the reads
+            groups[2].read(["name"])
+            self.env.cr.postcommit.run()
+            counter.invalidate_recordset()
+            self.assertEqual(counter.read_count, 2)
+            self.assertEqual(counter.res_count, 2)
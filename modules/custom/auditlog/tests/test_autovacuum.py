@@ -1,7 +1,11 @@
 # Copyright 2016 ABF OSIELL <https://osiell.com>
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 import time
+from datetime import date
 
+from dateutil.relativedelta import relativedelta
+
+from ..models.partition import PARTITIONED_STORAGE_PARAM, PARTITIONED_TABLES
 from .common import AuditLogRuleCommon
 
 
@@ -42,3 +46,103 @@ class TestAuditlogAutovacuum(AuditLogRuleCommon):
             [("model_id", "=", self.groups_model_id), ("res_id", "=", group.id)]
         )
         self.assertEqual(nb_logs, 0)
+
+    def test_autovacuum_chunks(self):
+        log_model = self.env["auditlog.log"]
+        autovacuum_model = self.env["auditlog.autovacuum"]
+        groups = self.env["res.groups"].create(
+            [{"name": f"testgroup_vacuum{i}"} for i in range(3)]
+        )
+        logs = log_model.search(
+            [("model_id", "=", self.groups_model_id), ("res_id", "in", groups.ids)]
+        )
+        self.assertGreater(len(logs), 2)
+        line_ids = logs.line_ids.ids
+        self.assertTrue(line_ids)
+        time.sleep(1)
+        # Several batches are needed to delete all the logs
+        autovacuum_model.autovacuum(days=0, chunk_size=1, time_budget=60)
+        self.assertFalse(logs.exists())
+        self.assertFalse(self.env["auditlog.log.line"].browse(line_ids).exists())
+
+    def test_partitions_disabled(self):
+        partition_model = self.env["auditlog.partition"]
+        # Partitioned storage is opt-in: the cron leaves the tables untouched
+        self.assertFalse(partition_model.maintain_partitions(180))
+        self.assertFalse(partition_model.is_partitioned())
+        self.assertEqual(
+            partition_model._partition_name(
+                "auditlog_log", partition_model._month_start(date(2024, 3, 17))
+            ),
+            "auditlog_log_p202403",
+        )
+
+    def test_partitions_conversion(self):
+        partition_model = self.env["auditlog.partition"]
+        group = self.env["res.groups"].create({"name": "testgroup_partitions"})
+        logs = self.env["auditlog.log"].search(
+            [("model_id", "=", self.groups_model_id), ("res_id", "=", group.id)]
+        )
+        line_ids = logs.line_ids.ids
+        self.assertTrue(logs and line_ids)
+        self.env["ir.config_parameter"].sudo().set_param(
+            PARTITIONED_STORAGE_PARAM, "True"
+        )
+        self.assertTrue(partition_model.maintain_partitions(months_ahead=1))
+        self.assertTrue(partition_model.is_partitioned())
+        this_month = partition_model._month_start(date.today())
+        for table in PARTITIONED_TABLES:
+            self.assertIn(
+                partition_model._partition_name(table, this_month),
+                partition_model._get_partitions(table),
+            )
+        cr = self.env.cr
+        cr.execute("SELECT COUNT(*) FROM auditlog_log WHERE id = ANY(%s)", [logs.ids])
+        self.assertEqual(cr.fetchone()[0], len(logs))
+        cr.execute(
+            "SELECT COUNT(*) FROM auditlog_log_line WHERE id = ANY(%s)", [line_ids]
+        )
+        self.assertEqual(cr.fetchone()[0], len(line_ids))
+
+        # Rows of a month without partition (the cron did not run) land in
+        # the default partition, and are moved to their month's partition by
+        # the next run
+        old_month = this_month - relativedelta(years=2)
+        cr.execute(
+            "UPDATE auditlog_log SET create_date = %s WHERE id = ANY(%s)",
+            [old_month, logs.ids],
+        )
+        cr.execute("SELECT COUNT(*) FROM auditlog_log_pdefault")
+        self.assertEqual(cr.fetchone()[0], len(logs))
+        self.assertTrue(partition_model.maintain_partitions(months_ahead=1))
+        cr.execute(
+            "SELECT DISTINCT tableoid::regclass::text FROM auditlog_log"
+            " WHERE id = ANY(%s)",
+            [logs.ids],
+        )
+        self.assertEqual(
+            cr.fetchall(),
+            [(partition_model._partition_name("auditlog_log", old_month),)],
+        )
+        cr.execute("SELECT COUNT(*) FROM auditlog_log_pdefault")
+        self.assertEqual(cr.fetchone()[0], 0)
+
+    def test_autovacuum_archive(self):
+        log_model = self.env["auditlog.log"]
+        group = self.env["res.groups"].create({"name": "testgroup_archive"})
+        group.name = "testgroup_archive2"
+        logs = log_model.search(
+            [("model_id", "=", self.groups_model_id), ("res_id", "=", group.id)]
+        )
+        self.assertEqual(len(logs), 2)
+        time.sleep(1)
+        self.env["auditlog.autovacuum"].autovacuum(days=0, chunk_size=1, archive=True)
+        self.assertFalse(logs.exists())
+        # The logs are still found in the archive, newest first
+        archived = self.env["auditlog.archive"].lookup("res.groups", group.id)
+        self.assertEqual([log["method"] for log in archived], ["write", "create"])
+        name_line = next(
+            line for line in archived[0]["lines"] if line["field_name"] == "name"
+        )
+        self.assertEqual(name_line["new_value_text"], "testgroup_archive2")
+        self.assertFalse(self.env["auditlog.archive"].lookup("res.groups", 0))
@@ -1,6 +1,10 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+from unittest.mock import patch
+
 from odoo.tests.common import HttpCase, tagged
 
+from ..models import rule as rule_module
+
 
 @tagged("post_install", "-at_install")
 class TestAuditlogHttp(HttpCase):
@@ -42,3 +46,63 @@ class TestAuditlogHttp(HttpCase):
             http_session_id.display_name,
             r"Mitchell Admin \(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\)",
         )
+
+    def test_http_session_reused(self):
+        self.authenticate("admin", "admin")
+        rule = self.env["auditlog.rule"].create(
+            {
+                "name": "res.partner",
+                "model_id": self.env.ref("base.model_res_partner").id,
+                "log_type": "full",
+                "state": "subscribed",
+            }
+        )
+        self.addCleanup(rule.unsubscribe)
+        partner = self.env.ref("base.partner_demo")
+        for name in ("test1", "test2"):
+            self.make_jsonrpc_request(
+                "/web/dataset/call_kw",
+                params={
+                    "model": "res.partner",
+                    "method": "write",
+                    "args": [partner.id, {"name": name}],
+                    "kwargs": {},
+                },
+                headers={
+                    "Cookie": f"session_id={self.session.sid};",
+                },
+            )
+        logs = self.env["auditlog.log"].search(
+            [("model_id", "=", rule.model_id.id), ("res_id", "=", partner.id)]
+        )
+        self.assertEqual(len(logs), 2)
+        # One HTTP request log per request, one user session log for both
+        self.assertEqual(len(logs.http_request_id), 2)
+        self.assertEqual(len(logs.http_session_id), 1)
+
+    def test_http_request_log_rolled_back(self):
+        # A cached HTTP request log ID whose row was rolled back with a
+        # savepoint makes the log insert fail on the foreign key: the logs are
+        # inserted again once the cached IDs are forgotten
+        rule_model = self.env["auditlog.rule"]
+        with self.assertRaises(ValueError), self.env.cr.savepoint():
+            http_request = self.env["auditlog.http.request"].create(
+                {"name": "/rolled-back"}
+            )
+            raise ValueError
+        log_vals = {
+            "name": "test",
+            "model_id": self.env.ref("base.model_res_partner").id,
+            "res_id": self.env.ref("base.partner_demo").id,
+            "method": "write",
+        }
+        http_vals = [{"http_request_id": http_request.id}, {"http_request_id": False}]
+        with (
+            patch.object(rule_module, "request"),
+            patch.object(
+                type(rule_model), "_get_http_log_vals", side_effect=http_vals
+            ),
+        ):
+            log = rule_model._insert_logs_with_http([log_vals], [[]])
+        self.assertEqual(len(log), 1)
+        self.assertFalse(log.http_request_id)
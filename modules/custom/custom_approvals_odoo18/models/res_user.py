@@ -84,12 +84,13 @@ class ResUsers(models.Model):
     is_temp_password = fields.Boolean(default=True)
     temp_password = fields.Char(string="Temporary Password")
 
-    @api.model
-    def create(self, vals):
-        if vals.get('temp_password'):
-            vals['password'] = vals['temp_password']  # Odoo hashes it automatically
-            vals['is_temp_password'] = True
-        return super().create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get('temp_password'):
+                vals['password'] = vals['temp_password']  # Odoo hashes it automatically
+                vals['is_temp_password'] = True
+        return super().create(vals_list)
 
 
     def write(self, vals):
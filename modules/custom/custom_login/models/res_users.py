@@ -24,43 +24,46 @@ class ResUsers(models.Model):
         ('rejected', 'Rejected'),
     ], default='incomplete', tracking=True)
 
-    @api.model
-    def create(self, vals):
-        if vals.get('temp_password'):
-            vals['password'] = vals['temp_password']
-            vals['is_temp_password'] = True
-
-        role = vals.pop('hrmis_role', False)
-
+    @api.model_create_multi
+    def create(self, vals_list):
         # FORCE internal user
         internal_group = self.env.ref('base.group_user')
-        vals.setdefault('groups_id', [])
-        vals['groups_id'].append((4, internal_group.id))
+        roles = []
+        for vals in vals_list:
+            if vals.get('temp_password'):
+                vals['password'] = vals['temp_password']
+                vals['is_temp_password'] = True
+            roles.append(vals.pop('hrmis_role', False))
+            vals.setdefault('groups_id', [])
+            vals['groups_id'].append((4, internal_group.id))
 
-        user = super().create(vals)
+        users = super().create(vals_list)
 
-        if role:
-            group_map = {
-                'employee': 'custom_login.group_hrmis_employee_self',
-                'section_officer': 'custom_login.group_section_officer',
-                'ms_dho': 'custom_login.group_ms_dho',
-            }
+        # One write per role rather than per user
+        group_map = {
+            'employee': 'custom_login.group_hrmis_employee_self',
+            'section_officer': 'custom_login.group_section_officer',
+            'ms_dho': 'custom_login.group_ms_dho',
+        }
+        for role in set(filter(None, roles)):
+            role_users = users.browse([user.id for user, user_role in zip(users, roles) if user_role == role])
             role_group = self.env.ref(group_map[role])
-            user.write({'groups_id': [(4, role_group.id)]})
+            role_users.write({'groups_id': [(4, role_group.id)]})
 
-        # Auto-create employee
-        if not user.employee_id:
-            employee = self.env['hr.employee'].create({
+        # Auto-create employees
+        without_employee = [(user, vals) for user, vals in zip(users, vals_list) if not user.employee_id]
+        if without_employee:
+            employees = self.env['hr.employee'].create([{
                 'name': vals.get('name', user.name),
                 'user_id': user.id,
                 'work_email': vals.get('login', user.login),
                 'cnic': vals.get('hrmis_cnic'),
                 'cadre_id': vals.get('hrmis_cadre') or False,
                 'parent_id': vals.get('manager_id') or False,
-            })
- 
-            user.employee_id = employee.id
-        return user
+            } for user, vals in without_employee])
+            for (user, vals), employee in zip(without_employee, employees):
+                user.employee_id = employee.id
+        return users
 
 
     def write(self, vals):
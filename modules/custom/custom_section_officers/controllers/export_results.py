@@ -1,83 +1,58 @@
 from odoo import http
 from odoo.http import request
-import io
-import xlsxwriter
+import tempfile
 from datetime import datetime
 
+# Bytes sent per chunk of the streamed workbook
+STREAM_CHUNK_SIZE = 64 * 1024
+# Larger exports are produced by a background job (hrmis.export.job)
+SYNC_EXPORT_MAX_ROWS = 5000
+
+
 class HrmisStaffExport(http.Controller):
 
     @http.route('/hrmis/staff/export', type='http', auth='user', website=True)
     def hrmis_staff_export(self, name=None, cnic=None, designation=None, district=None, facility=None, **kw):
 
-        domain = []
-
         Employee = request.env['hr.employee.public'].sudo()
-        employees = Employee.search([], limit=1000)  
-
-        filtered_employees = []
-
-        for emp in employees:
-            if name and name.lower() not in (emp.name or '').lower():
-                continue
-
-            if cnic and cnic not in (emp.hrmis_cnic or ''):
-                continue
-
-            if designation and designation.lower() not in (emp.hrmis_designation.name.lower() if emp.hrmis_designation else ''):
-                continue
-
-            if district and district.lower() not in (emp.district_id.name.lower() if emp.district_id else ''):
-                continue
-
-            if facility and facility.lower() not in (emp.facility_id.name.lower() if emp.facility_id else ''):
-                continue
-
-            filtered_employees.append(emp)
-
-
-
-        # Create in-memory Excel file
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        sheet = workbook.add_worksheet('Staff')
-
-        # Columns headers
-        headers = [
-            'Name', 'Gender', 'Facility', 'Date of Birth', 'Commission Date', 'Joining Date',
-            'CNIC', 'Father Name', 'BPS', 'Designation', 'Cadre', 'District', 'Mobile', 'Taken Leaves'
-        ]
-
-        for col, header in enumerate(headers):
-            sheet.write(0, col, header)
-
-        # Fill rows
-        for row, emp in enumerate(filtered_employees, start=1):
-
-            sheet.write(row, 0, emp.name or '')
-            sheet.write(row, 1, emp.gender or '')
-            sheet.write(row, 2, emp.facility_id.name if emp.facility_id else '')
-            sheet.write(row, 3, emp.date_of_birth.strftime('%d-%m-%Y') if emp.date_of_birth else '')
-            sheet.write(row, 4, emp.commission_date.strftime('%d-%m-%Y') if emp.commission_date else '')
-            sheet.write(row, 5, emp.joining_date.strftime('%d-%m-%Y') if emp.joining_date else '')
-            sheet.write(row, 6, emp.hrmis_cnic or '')
-            sheet.write(row, 7, emp.father_name or '')
-            sheet.write(row, 8, emp.hrmis_bps or '')
-            sheet.write(row, 9, emp.hrmis_designation.name if emp.hrmis_designation else '')
-            sheet.write(row, 10, emp.cadre_id.name if 'cadre_id' in emp._fields and emp.cadre_id else '')
-            sheet.write(row, 11, emp.district_id.name if emp.district_id else '')
-            sheet.write(row, 12, emp.mobile_phone or '')
-            sheet.write(row, 13, emp.taken_leaves if 'taken_leaves' in emp._fields else '')
-
-        workbook.close()
-        output.seek(0)
+        filters = {
+            'name': name, 'cnic': cnic, 'designation': designation,
+            'district': district, 'facility': facility,
+        }
+        domain = Employee._hrmis_staff_export_domain(**filters)
+
+        if kw.get('background') or Employee.search_count(domain, limit=SYNC_EXPORT_MAX_ROWS + 1) > SYNC_EXPORT_MAX_ROWS:
+            file_format = 'csv' if kw.get('format') == 'csv' else 'xlsx'
+            job = request.env['hrmis.export.job'].enqueue('staff', filters, file_format=file_format)
+            return request.redirect(job._status_url())
+
+        # The workbook is spooled to disk (deleted once closed), not kept in memory
+        output = tempfile.TemporaryFile()
+        try:
+            Employee._hrmis_write_staff_export(domain, output)
+            size = output.tell()
+            output.seek(0)
+        except Exception:
+            output.close()
+            raise
+
+        def stream():
+            try:
+                while True:
+                    chunk = output.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                output.close()
 
         filename = f'Staff_Export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
 
         return request.make_response(
-            output.read(),
+            stream(),
             headers=[
                 ('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
                 ('Content-Disposition', f'attachment; filename={filename}'),
+                ('Content-Length', str(size)),
             ]
         )
-    
\ No newline at end of file
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import defaultdict
+
 from odoo import http, fields
 from odoo.http import request
 import json
@@ -27,39 +29,50 @@ class HrmisSectionOfficerManageRequestsController(http.Controller):
         """
         if not employee:
             return []
-        Emp = request.env["hr.employee"].sudo()
-        emp_ids = [employee.id]
-        try:
-            if getattr(employee, "user_id", False):
-                emp_ids = Emp.search([("user_id", "=", employee.user_id.id)]).ids or emp_ids
-            elif "hrmis_employee_id" in employee._fields and employee.hrmis_employee_id:
-                emp_ids = Emp.search([("hrmis_employee_id", "=", employee.hrmis_employee_id)]).ids or emp_ids
-        except Exception:
-            return emp_ids
-        return emp_ids
+        return self._employee_group_ids_by_person(employee)[employee.id]
 
-    def _leave_days_value(self, leave) -> float:
+    def _employee_group_ids_by_person(self, employees):
         """
-        Best-effort leave days value.
-        Prefer Odoo computed fields if available; fall back to calendar-day count.
+        Batched `_employee_group_ids_for_person`: map each employee id to the
+        ids of all hr.employee rows of the same person (see
+        `hr.employee.person_employee_ids`).
         """
-        if not leave:
-            return 0.0
-        for f in ("number_of_days_display", "number_of_days"):
-            try:
-                if f in leave._fields:
-                    v = getattr(leave, f, 0.0) or 0.0
-                    return float(v)
-            except Exception:
+        return employees.sudo().person_employee_ids()
+
+    def _leave_taken_by_person_type(self, groups, type_ids=None):
+        """
+        Approved leave days per `(root employee id, leave type id)`.
+
+        `groups` maps each root employee id to the employee ids of the same
+        person (see `_employee_group_ids_by_person`). Days are summed by the
+        database, grouped by employee and leave type, so the cost does not
+        depend on how many leaves these employees have taken.
+        """
+        roots_by_emp = defaultdict(set)
+        for root_id, emp_ids in groups.items():
+            for emp_id in emp_ids:
+                roots_by_emp[emp_id].add(root_id)
+        taken = defaultdict(float)
+        if not roots_by_emp:
+            return taken
+        domain = [
+            ("employee_id", "in", list(roots_by_emp)),
+            ("state", "in", ("validate", "validate2")),
+        ]
+        if type_ids is not None:
+            domain.append(("holiday_status_id", "in", list(type_ids)))
+        groups_days = request.env["hr.leave"].sudo()._read_group(
+            domain,
+            groupby=["employee_id", "holiday_status_id"],
+            aggregates=["number_of_days:sum"],
+        )
+        for employee, leave_type, days in groups_days:
+            if not leave_type:
                 continue
-        try:
-            d_from = getattr(leave, "request_date_from", None)
-            d_to = getattr(leave, "request_date_to", None)
-            if d_from and d_to:
-                return float((d_to - d_from).days + 1)
-        except Exception:
-            pass
-        return 0.0
+            for root_id in roots_by_emp[employee.id]:
+                taken[(root_id, leave_type.id)] += float(days or 0.0)
+        return taken
+
     def _section_officer_employee_ids(self):
         """Return hr.employee ids linked to current user.
 
@@ -73,21 +86,14 @@ class HrmisSectionOfficerManageRequestsController(http.Controller):
     def _managed_employee_ids(self):
         """Return employee ids managed by the current section officer.
 
-        Your Odoo DB uses `hr.employee.employee_parent_id` as the manager field.
-        We scan all employees and select those where:
-          employee.employee_parent_id in (current user's employee ids)
+        Employees below any of the current user's employee rows through
+        `parent_id` / `employee_parent_id`, at any depth, resolved with one
+        join of the manager hierarchy closure table.
 
         This is the single source of truth for "which employees belong to this SO".
         """
-        so_emp_ids = self._section_officer_employee_ids()
-        if not so_emp_ids:
-            return []
-
         Emp = request.env["hr.employee"].sudo()
-        if "employee_parent_id" in Emp._fields:
-            return Emp.search([("employee_parent_id", "in", so_emp_ids)]).ids
-        # Fallback for older schemas
-        return Emp.search([("parent_id", "in", so_emp_ids)]).ids
+        return Emp.search([("hrmis_manager_user_ids", "in", [request.env.user.id])]).ids
 
     def _canonical_employee(self, employee):
         """Try to resolve duplicate employee rows to a single 'canonical' record.
@@ -103,14 +109,10 @@ class HrmisSectionOfficerManageRequestsController(http.Controller):
             return None
 
         Emp = request.env["hr.employee"].sudo()
-        candidates = Emp.browse([])
-
-        if getattr(employee, "user_id", False):
-            candidates = Emp.search([("user_id", "=", employee.user_id.id)], order="id desc")
-        elif "hrmis_employee_id" in employee._fields and employee.hrmis_employee_id:
-            candidates = Emp.search([("hrmis_employee_id", "=", employee.hrmis_employee_id)], order="id desc")
-        else:
+        domain = employee.sudo()._person_domain()
+        if not domain:
             return employee
+        candidates = Emp.search(domain, order="id desc")
 
         if not candidates:
             return employee
@@ -153,6 +155,12 @@ class HrmisSectionOfficerManageRequestsController(http.Controller):
         return None
 
     def _is_managed_by_current_user(self, employee) -> bool:
+        canonical = self._canonical_employee(employee)
+        if canonical and request.env["hr.employee"].sudo().search_count(
+            [("id", "=", canonical.id), ("hrmis_manager_user_ids", "in", [request.env.user.id])],
+            limit=1,
+        ):
+            return True
         mgr = self._responsible_manager_emp(employee)
         if not mgr:
             return False
@@ -500,51 +508,12 @@ class HrmisSectionOfficerManageRequestsController(http.Controller):
             # --------------------------------------------------------------
             try:
                 if leaves:
-                    leave_ids = leaves.ids
                     type_ids = leaves.mapped("holiday_status_id").ids
-
-                    Emp = request.env["hr.employee"].sudo()
-                    root_emp_ids = leaves.mapped("employee_id").ids
-
-                    emp_id_to_root = {}
-                    all_person_emp_ids = set()
-
-                    for emp in Emp.browse(root_emp_ids):
-                        grp = self._employee_group_ids_for_person(emp)
-                        for e_id in grp:
-                            emp_id_to_root[e_id] = emp.id
-                            all_person_emp_ids.add(e_id)
-
-                    taken_by_root_type = {}
-
-                    if all_person_emp_ids and type_ids:
-                        approved = request.env["hr.leave"].sudo().search(
-                            [
-                                ("employee_id", "in", list(all_person_emp_ids)),
-                                ("holiday_status_id", "in", type_ids),
-                                ("state", "in", ("validate", "validate2")),
-                            ]
-                        )
-
-                        for alv in approved:
-                            root_id = emp_id_to_root.get(
-                                alv.employee_id.id, alv.employee_id.id
-                            )
-                            lt_id = alv.holiday_status_id.id if alv.holiday_status_id else None
-                            if not lt_id:
-                                continue
-
-                            taken_by_root_type[(root_id, lt_id)] = (
-                                taken_by_root_type.get((root_id, lt_id), 0.0)
-                                + self._leave_days_value(alv)
-                            )
+                    groups = self._employee_group_ids_by_person(leaves.mapped("employee_id"))
+                    taken_by_root_type = self._leave_taken_by_person_type(groups, type_ids)
 
                     for lv in leaves:
-                        root_id = (
-                            emp_id_to_root.get(lv.employee_id.id, lv.employee_id.id)
-                            if lv.employee_id
-                            else None
-                        )
+                        root_id = lv.employee_id.id if lv.employee_id else None
                         lt_id = lv.holiday_status_id.id if lv.holiday_status_id else None
                         leave_taken_by_leave_id[lv.id] = float(
                             taken_by_root_type.get((root_id, lt_id), 0.0)
@@ -622,18 +591,8 @@ class HrmisSectionOfficerManageRequestsController(http.Controller):
                 order="request_date_from desc, id desc",
                 limit=200,
             )
-            approved = Leave.search(
-                [
-                    ("employee_id", "in", group_emp_ids),
-                    ("state", "in", ("validate", "validate2")),
-                ],
-                order="id desc",
-            )
-            for lv in approved:
-                lt_id = lv.holiday_status_id.id if lv.holiday_status_id else None
-                if not lt_id:
-                    continue
-                leave_taken_by_type[lt_id] = float(leave_taken_by_type.get(lt_id, 0.0) + self._leave_days_value(lv))
+            taken = self._leave_taken_by_person_type({employee.id: group_emp_ids})
+            leave_taken_by_type = {lt_id: days for (__, lt_id), days in taken.items()}
 
         elif tab == "history":
             leave_history = Leave.search(
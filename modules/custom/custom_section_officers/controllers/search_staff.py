@@ -2,6 +2,9 @@
 from odoo import http
 from odoo.http import request
 
+# Results per page of the staff search
+STAFF_PAGE_SIZE = 50
+
 
 class HrmisStaffSearch(http.Controller):
 
@@ -10,15 +13,20 @@ class HrmisStaffSearch(http.Controller):
 
         name = kwargs.get('name', '')
         cnic = kwargs.get('cnic', '')
+        # District, facility and designation are record ids (or names)
         designation = kwargs.get('designation', '')
         district = kwargs.get('district', '')
         facility = kwargs.get('facility', '')
+        after = kwargs.get('after', '')
 
-        # Load dropdown data
-        designations = request.env['hrmis.designation'].sudo().search([('active', '=', True)])
+        def to_id(value):
+            return int(value) if str(value or '').isdigit() else None
 
-        districts = request.env['hrmis.district.master'].sudo().search([])
-        facilities = request.env['hrmis.facility.type'].sudo().search([])
+        # Load dropdown data: facilities and designations are fetched by the
+        # page from /hrmis/api/master/*, only the selected ones are rendered
+        districts = request.env['hrmis.master.data'].get('districts')
+        selected_designation = request.env['hrmis.designation'].sudo().browse(to_id(designation)).exists()
+        selected_facility = request.env['hrmis.facility.type'].sudo().browse(to_id(facility)).exists()
 
         # Save only primitives in session
         request.session['staff_search_filters'] = {
@@ -29,20 +37,17 @@ class HrmisStaffSearch(http.Controller):
             'facility': facility,
         }
 
-        domain = []
-
-        if name:
-            domain.append(('name', 'ilike', name))
-        if cnic:
-            domain.append(('hrmis_cnic', 'ilike', cnic))
-        if designation:
-            domain.append(('hrmis_designation.name', '=', designation))
-        if district:
-            domain.append(('district_id.name', '=', district))
-        if facility:
-            domain.append(('facility_id.name', '=', facility))
-
-        employees = request.env['hr.employee.public'].sudo().search(domain, limit=50)
+        # Without filters, the page lists the first staff
+        Employee = request.env['hr.employee'].sudo()
+        domain = Employee._hrmis_staff_search_domain(
+            name=name,
+            cnic=cnic,
+            designation_id=designation,
+            district_id=district,
+            facility_id=facility,
+        )
+        page, next_after = Employee._hrmis_keyset_page(domain, after_id=to_id(after), limit=STAFF_PAGE_SIZE)
+        employees = request.env['hr.employee.public'].sudo().browse(page.ids)
 
         return request.render(
             'custom_section_officers.hrmis_staff_search',
@@ -53,9 +58,11 @@ class HrmisStaffSearch(http.Controller):
                 'designation': designation,
                 'district': district,
                 'facility': facility,
-                'designations': designations,
+                'after': after,
+                'next_after': next_after,
                 'districts': districts,
-                'facilities': facilities,
+                'selected_designation': selected_designation,
+                'selected_facility': selected_facility,
                 'active_menu': 'staff',
             }
         )
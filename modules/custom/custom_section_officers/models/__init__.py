@@ -1,4 +1,5 @@
 from . import hr_satff
 from . import hr_leave_dismiss
 from . import hr_employee_public
-from . import hr_employee
\ No newline at end of file
+from . import hr_employee
+from . import hrmis_export_job
@@ -1,5 +1,6 @@
 # models/hr_employee.py
-from odoo import models, fields
+from odoo import api, models, fields
+from odoo.osv import expression
 
 class HrEmployee(models.Model):
     _inherit = "hr.employee"
@@ -7,4 +8,61 @@ class HrEmployee(models.Model):
     # so_signature = fields.Binary(string="SO Signature", attachment=True)
     so_signature = fields.Binary('SO Signature', attachment=False)
 
+    # Duplicate hr.employee rows of one real-world person share this key
+    # (the linked user first, else the HRMIS service number) or their service
+    # number, see `person_employee_ids`.
+    person_key = fields.Char(
+        string="Person Key",
+        compute="_compute_person_key",
+        store=True,
+        index=True,
+        readonly=True,
+        copy=False,
+    )
 
+    @api.depends("user_id", "hrmis_employee_id")
+    def _compute_person_key(self):
+        for emp in self:
+            if emp.user_id:
+                emp.person_key = f"user:{emp.user_id.id}"
+            elif emp.hrmis_employee_id:
+                emp.person_key = f"service:{emp.hrmis_employee_id}"
+            else:
+                emp.person_key = False
+
+    def person_employee_ids(self):
+        """
+        Map the id of each employee in `self` to the ids of all active
+        hr.employee rows of the same person (itself when it has no key): rows
+        with the same `person_key` (same user) or the same service number.
+        Resolved in one query on the indexed `person_key` and
+        `hrmis_employee_id`.
+        """
+        if not self:
+            return {}
+        self.flush_model(["person_key", "hrmis_employee_id", "active"])
+        self.env.cr.execute(
+            """
+            SELECT emp.id, array_agg(same.id ORDER BY same.id)
+              FROM hr_employee emp
+              JOIN hr_employee same
+                ON (same.person_key = emp.person_key
+                    OR same.hrmis_employee_id = emp.hrmis_employee_id)
+               AND same.active
+             WHERE emp.id = ANY(%s)
+             GROUP BY emp.id
+            """,
+            [list(self.ids)],
+        )
+        groups = dict(self.env.cr.fetchall())
+        return {emp_id: groups.get(emp_id) or [emp_id] for emp_id in self.ids}
+
+    def _person_domain(self):
+        """Domain of all hr.employee rows of the same person as `self`."""
+        self.ensure_one()
+        domains = []
+        if self.person_key:
+            domains.append([("person_key", "=", self.person_key)])
+        if self.hrmis_employee_id:
+            domains.append([("hrmis_employee_id", "=", self.hrmis_employee_id)])
+        return expression.OR(domains) if domains else []
@@ -1,4 +1,13 @@
-from odoo import models, fields
+import xlsxwriter
+
+from odoo import api, models, fields
+
+# Rows read per search_read() batch when exporting staff
+STAFF_EXPORT_CHUNK_SIZE = 2000
+STAFF_EXPORT_HEADERS = [
+    'Name', 'Gender', 'Facility', 'Date of Birth', 'Commission Date', 'Joining Date',
+    'CNIC', 'Father Name', 'BPS', 'Designation', 'Cadre', 'District', 'Mobile', 'Taken Leaves'
+]
 
 
 class HrEmployeePublic(models.Model):
@@ -19,3 +28,83 @@ class HrEmployeePublic(models.Model):
     mobile_phone = fields.Char(related="employee_id.hrmis_contact_info", readonly=True)
     so_signature = fields.Binary(related="employee_id.so_signature", readonly=True)
 
+    @api.model
+    def _hrmis_staff_export_domain(self, name=None, cnic=None, designation=None, district=None, facility=None):
+        """Domain of the staff export filters, the same as the staff search:
+        designation, district and facility are record ids (or names)."""
+        Employee = self.env['hr.employee']
+        employee_domain = Employee._hrmis_staff_search_domain(
+            name=name,
+            cnic=cnic,
+            designation_id=designation,
+            district_id=district,
+            facility_id=facility,
+        )
+        if not employee_domain:
+            return []
+        return [('id', 'in', Employee._search(employee_domain))]
+
+    @api.model
+    def _hrmis_staff_export_rows(self, domain, chunk_size=STAFF_EXPORT_CHUNK_SIZE):
+        """Yield the export rows (see STAFF_EXPORT_HEADERS) of the staff matching
+        `domain`, read by batches of `chunk_size` with a keyset on id.
+        """
+        field_names = [
+            'name', 'gender', 'facility_id', 'date_of_birth', 'commission_date', 'joining_date',
+            'hrmis_cnic', 'father_name', 'hrmis_bps', 'hrmis_designation', 'cadre_id',
+            'district_id', 'mobile_phone',
+        ]
+        has_taken_leaves = 'taken_leaves' in self._fields
+        if has_taken_leaves:
+            field_names.append('taken_leaves')
+
+        def m2o_name(value):
+            return value[1] if value else ''
+
+        def date_str(value):
+            return value.strftime('%d-%m-%Y') if value else ''
+
+        last_id = 0
+        while True:
+            records = self.search_read(
+                domain + [('id', '>', last_id)], field_names, order='id', limit=chunk_size
+            )
+            if not records:
+                break
+            for rec in records:
+                yield [
+                    rec['name'] or '',
+                    rec['gender'] or '',
+                    m2o_name(rec['facility_id']),
+                    date_str(rec['date_of_birth']),
+                    date_str(rec['commission_date']),
+                    date_str(rec['joining_date']),
+                    rec['hrmis_cnic'] or '',
+                    rec['father_name'] or '',
+                    rec['hrmis_bps'] or '',
+                    m2o_name(rec['hrmis_designation']),
+                    m2o_name(rec['cadre_id']),
+                    m2o_name(rec['district_id']),
+                    rec['mobile_phone'] or '',
+                    rec['taken_leaves'] if has_taken_leaves else '',
+                ]
+            last_id = records[-1]['id']
+            # Drop the batch from the record cache before reading the next one
+            self.env.invalidate_all()
+            if len(records) < chunk_size:
+                break
+
+    @api.model
+    def _hrmis_write_staff_export(self, domain, fileobj, chunk_size=STAFF_EXPORT_CHUNK_SIZE):
+        """Write the staff matching `domain` as an xlsx workbook to `fileobj`,
+        in xlsxwriter's constant_memory mode so that memory use does not grow
+        with the number of employees. Return the number of rows written.
+        """
+        workbook = xlsxwriter.Workbook(fileobj, {'constant_memory': True})
+        sheet = workbook.add_worksheet('Staff')
+        sheet.write_row(0, 0, STAFF_EXPORT_HEADERS)
+        row = 0
+        for row, values in enumerate(self._hrmis_staff_export_rows(domain, chunk_size), start=1):
+            sheet.write_row(row, 0, values)
+        workbook.close()
+        return row
@@ -0,0 +1,15 @@
+from odoo import api, fields, models
+
+from .hr_employee_public import STAFF_EXPORT_HEADERS
+
+
+class HrmisExportJob(models.Model):
+    _inherit = "hrmis.export.job"
+
+    export_type = fields.Selection(selection_add=[("staff", "Staff list")], ondelete={"staff": "cascade"})
+
+    @api.model
+    def _export_staff(self, filters):
+        Employee = self.env["hr.employee.public"].sudo()
+        domain = Employee._hrmis_staff_export_domain(**filters)
+        return STAFF_EXPORT_HEADERS, Employee.search_count(domain), Employee._hrmis_staff_export_rows(domain)
@@ -16,12 +16,15 @@
     'data': [
         'data/hr_leave_types.xml',
         'data/hr_leave_allocation_cron.xml',
+        'data/hrmis_export_job_cron.xml',
         'views/hrmis_frontend_templates.xml',
         'views/hrmis_frontend_menu.xml',
         "views/employee_views/hrmis_profile_request_views.xml",
         "views/hrmis_profile_approvals.xml",
         # "views/hrmis_profile_request_templates.xml",
         'views/hrmis_leave_view_history.xml',
+        'views/hrmis_export_job_templates.xml',
+        'views/hrmis_vacancy_matrix_templates.xml',
         'views/sec_officer_views/hrmis_user_profile_update_requests_view.xml',
         'views/sec_officer_views/hrmis_user_profile_update_requests_detailed_view.xml',
     ],
@@ -30,9 +33,10 @@
             'hr_holidays_updates/static/src/scss/hrmis_leave_frontend.scss',
             'hr_holidays_updates/static/src/js/hrmis_leave_frontend.js',
             'hr_holidays_updates/static/src/js/hrmis_notifications.js',
+            'hr_holidays_updates/static/src/js/hrmis_export_jobs.js',
             'hr_holidays_updates/static/src/js/hrmis_pending_badges.js',
             'hr_holidays_updates/static/src/js/hrmis_leave_filters.js',
-            'hr_holidays_updates/static/src/js/hrmis_profile_request_facility_filter.js',
+            'hr_holidays_updates/static/src/js/hrmis_master_data.js',
         ],
     },
     'installable': True,
@@ -1,5 +1,8 @@
 
 from . import main
 from . import notifications
+from . import export_jobs
+from . import master_data
 from . import pending_counts
-from . import dho_ms_manage
\ No newline at end of file
+from . import dho_ms_manage
+from . import vacancy_matrix
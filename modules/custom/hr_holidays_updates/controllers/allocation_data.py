@@ -31,9 +31,9 @@ def pending_allocation_requests_for_user(user_id: int):
         )
 
     if "employee_id" in Allocation._fields:
-        # Standard Odoo manager approval fallback:
+        # Manager approval fallback (managers at any depth of the hierarchy):
         # "Pending" in our UI corresponds to both confirm + validate1.
-        domains.append([("state", "in", ("confirm", "validate1")), ("employee_id.parent_id.user_id", "=", user_id)])
+        domains.append([("state", "in", ("confirm", "validate1")), ("employee_id.hrmis_manager_user_ids", "in", [user_id])])
 
     if can_manage_allocations():
         domains.append([("state", "in", ("confirm", "validate1"))])
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from odoo import http
+from odoo.http import request
+
+from .utils import base_ctx
+
+
+class HrmisExportJobsController(http.Controller):
+    def _own_job(self, job_id: int):
+        job = request.env["hrmis.export.job"].sudo().browse(int(job_id)).exists()
+        if not job or job.user_id != request.env.user:
+            return None
+        return job
+
+    @http.route(["/hrmis/export/jobs/<int:job_id>"], type="http", auth="user", website=True)
+    def hrmis_export_job_page(self, job_id: int, **kw):
+        job = self._own_job(job_id)
+        if not job:
+            return request.not_found()
+        return request.render(
+            "hr_holidays_updates.hrmis_export_job_page",
+            base_ctx("Export", "notifications", job=job.status_payload()),
+        )
+
+    @http.route(["/hrmis/api/export/jobs/<int:job_id>"], type="http", auth="user", methods=["GET"], csrf=False)
+    def hrmis_api_export_job(self, job_id: int, **kw):
+        job = self._own_job(job_id)
+        if not job:
+            return request.make_json_response({"ok": False, "error": "not_found"}, status=404)
+        return request.make_json_response({"ok": True, "job": job.status_payload()})
+
+    @http.route(["/hrmis/export/jobs/<int:job_id>/download"], type="http", auth="user")
+    def hrmis_export_job_download(self, job_id: int, **kw):
+        job = self._own_job(job_id)
+        if not job or job.state != "done" or not job.attachment_id:
+            return request.not_found()
+        # Served from the filestore without loading the file in memory
+        stream = request.env["ir.binary"]._get_stream_from(job.attachment_id)
+        return stream.get_response(as_attachment=True)
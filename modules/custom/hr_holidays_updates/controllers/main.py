@@ -7,6 +7,7 @@ import logging
 import re
 import json
 import base64
+import hashlib
 from urllib.parse import quote_plus, unquote
 from odoo.http import Response
 
@@ -14,6 +15,10 @@ from odoo.http import Response
 from odoo import http, fields
 from odoo.exceptions import AccessError, UserError, ValidationError
 from odoo.http import request
+from odoo.addons.hr_holidays_updates.models.leave_types_models.hr_leave_eligibility import (
+    UI_BLOCKED_LEAVE_TYPE_KEYS,
+    _norm_leave_type_name,
+)
 
 _logger = logging.getLogger(__name__)
 
@@ -28,6 +33,8 @@ _DATE_DMY_RE = re.compile(r"^\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*$")
 _OVERLAP_ERR_RE = re.compile(r"(overlap|overlapping|already\s+taken|conflict)", re.IGNORECASE)
 _OVERLAP_FRIENDLY_MSG = "this leave request is overlapping with existing leave"
 _EXISTING_DAY_MSG = "You cannot take existing day's leave"
+# Profile update requests listed per page
+PROFILE_REQUESTS_PAGE_SIZE = 50
 
 
 def _safe_date(v, default=None):
@@ -178,7 +185,8 @@ def _pending_leave_requests_for_user(user_id: int):
     # Standard Odoo manager approval fallback (useful if validation_status_ids is absent
     # or leave types aren't configured with validators).
     if "employee_id" in Leave._fields:
-        domains.append([("state", "=", "confirm"), ("employee_id.parent_id.user_id", "=", user_id)])
+        # Managers at any depth of the hierarchy (see hr_employee_hierarchy).
+        domains.append([("state", "=", "confirm"), ("employee_id.hrmis_manager_user_ids", "in", [user_id])])
 
     # Second-stage approvals (Odoo standard "validate1" => "validate") are usually handled
     # by Time Off officers/managers. Without this, those requests won't show up in Manage Requests.
@@ -218,71 +226,30 @@ def _leave_pending_for_current_user(leave) -> bool:
         return False
 
 
-def _allowed_leave_type_domain(employee, request_date_from=None):
+def _leave_types_for_employee(employee, request_date_from=None):
     """
-    Eligibility restrictions for the HRMIS website dropdown.
+    Leave types allowed for `employee`, already deduplicated for the UI.
 
-    Current rules:
+    Eligibility rules live in `hr.employee._hrmis_leave_eligibility_snapshot`:
     - Maternity Leave is visible only for female employees.
     - Maternity Leave is hidden after 3 approved maternity leaves.
     - LPR Leave is hidden after 1 pending/approved LPR leave.
+
+    The ids come from the cached eligibility snapshot; only the browse and the
+    employee/date context are rebuilt per call.
     """
-    domain = []
+    request_date_from = _safe_date(request_date_from)
+    LeaveType = request.env["hr.leave.type"].sudo()
     try:
-        maternity = request.env.ref("hr_holidays_updates.leave_type_maternity", raise_if_not_found=False)
-        lpr = request.env.ref("hr_holidays_updates.leave_type_lpr", raise_if_not_found=False)
-        # Some deployments use `gender`, others use `hrmis_gender`. Keep both.
-        gender = getattr(employee, "gender", False) or getattr(employee, "hrmis_gender", False)
-
-        Leave = request.env["hr.leave"].sudo()
-        approved_states = ("validate", "validate2")
-
-        maternity_taken = 0
-        if maternity:
-            maternity_taken = Leave.search_count(
-                [
-                    ("employee_id", "=", employee.id),
-                    ("holiday_status_id", "=", maternity.id),
-                    ("state", "in", approved_states),
-                ]
-            )
-
-        lpr_taken = 0
-        if lpr:
-            lpr_taken = Leave.search_count(
-                [
-                    ("employee_id", "=", employee.id),
-                    ("holiday_status_id", "=", lpr.id),
-                    # Treat any non-cancelled/non-refused request as "taken" (pending or approved).
-                    ("state", "not in", ("cancel", "refuse")),
-                ]
-            )
-
-        # Maternity visibility rules
-        if maternity:
-            if not gender or gender != "female":
-                domain.append(("id", "!=", maternity.id))
-            elif maternity_taken >= 3:
-                domain.append(("id", "!=", maternity.id))
-
-        # LPR visibility rules
-        if lpr:
-            if lpr_taken >= 1:
-                domain.append(("id", "!=", lpr.id))
+        snapshot = employee.sudo().hrmis_leave_eligibility_snapshot()
+        leave_type_ids = [row[0] for row in snapshot["leave_types"]]
     except Exception:
-        # Never break the form because of an eligibility rule.
-        pass
-    return domain
-
-
-def _leave_types_for_employee(employee, request_date_from=None):
-    domain = _allowed_leave_type_domain(employee, request_date_from=request_date_from)
-    request_date_from = _safe_date(request_date_from)
+        _logger.exception("HRMIS leave eligibility snapshot failed")
+        leave_type_ids = LeaveType.search([], order="name asc").ids
     # Important: keep sudo() for website rendering, but keep employee/date context
     # so the dropdown label matches backend widgets where applicable.
     recs = (
-        request.env["hr.leave.type"]
-        .sudo()
+        LeaveType
         .with_context(
             # Ensure balances are computed in the employee's company when multi-company
             # is enabled; otherwise Odoo may show 0 due to company mismatch.
@@ -297,76 +264,26 @@ def _leave_types_for_employee(employee, request_date_from=None):
             default_date_from=request_date_from,
             default_date_to=request_date_from,
         )
-        .search(domain, order="name asc")
+        .browse(leave_type_ids)
     )
     return recs
 
-def _support_doc_rule_for_leave_type(leave_type):
-    """
-    Business rule for supporting documents.
-
-    Returns: (required: bool, label: str)
-    """
-    try:
-        env = request.env
-        # Resolve configured leave types (ignore if missing).
-        maternity = env.ref("hr_holidays_updates.leave_type_maternity", raise_if_not_found=False)
-        quarantine = env.ref("hr_holidays_updates.leave_type_special_quarantine", raise_if_not_found=False)
-        study_full = env.ref("hr_holidays_updates.leave_type_study_full_pay", raise_if_not_found=False)
-        study_half = env.ref("hr_holidays_updates.leave_type_study_half_pay", raise_if_not_found=False)
-        study_eol = env.ref("hr_holidays_updates.leave_type_study_eol", raise_if_not_found=False)
-        medical = env.ref("hr_holidays_updates.leave_type_medical_long", raise_if_not_found=False)
-
-        rules = {
-            getattr(maternity, "id", None): "Medical certificate",
-            getattr(quarantine, "id", None): "Quarantine order",
-            getattr(study_full, "id", None): "Admission letter / Course Details",
-            getattr(study_half, "id", None): "Admission letter / Course Details",
-            getattr(study_eol, "id", None): "Admission letter / Course Details",
-            getattr(medical, "id", None): "Medical Certificate",
-        }
-        label = rules.get(getattr(leave_type, "id", None))
-        if label:
-            return True, label
-    except Exception:
-        pass
-    # Default: not required
-    return False, ""
-
-
-def _norm_leave_type_name(name: str) -> str:
-    # Collapse to an ASCII-ish comparable key: lower, remove punctuation/spaces differences.
-    import re
-
-    s = (name or "").strip().lower()
-    s = re.sub(r"[\u2010-\u2015]", "-", s)  # normalize unicode hyphens
-    s = re.sub(r"[^a-z0-9]+", "", s)
-    return s
-
-
 def _dedupe_leave_types_for_ui(leave_types):
     """
     UI-only dedupe: keep first record per normalized name to avoid showing duplicates
     even if the DB has multiple leave types with near-identical names.
     """
-    # Also hide specific leave types from the HRMIS dropdown (business requirement).
-    blocked = {
-        "compensatorydays",
-        "paidtimeoff",
-        "sicktimeoff",
-        "unpaid",
-    }
     seen = set()
     # Preserve env/context from the incoming recordset; name_get() uses context
     # (employee/date/request_type) to compute the displayed balance.
-    kept = leave_types.browse([])
+    kept_ids = []
     for lt in leave_types:
         key = _norm_leave_type_name(lt.name)
-        if not key or key in blocked or key in seen:
+        if not key or key in UI_BLOCKED_LEAVE_TYPE_KEYS or key in seen:
             continue
         seen.add(key)
-        kept |= lt
-    return kept
+        kept_ids.append(lt.id)
+    return leave_types.browse(kept_ids)
 
 
 class HrmisLeaveFrontendController(http.Controller):
@@ -388,6 +305,22 @@ class HrmisLeaveFrontendController(http.Controller):
             status=status,
         )
 
+    def _json_etag(self, payload: dict, cache_control: str = "private, no-cache"):
+        """
+        JSON response with a content ETag. Answers `304 Not Modified` when the
+        browser already holds the same payload (`If-None-Match`).
+        """
+        body = json.dumps(payload, sort_keys=True)
+        etag = hashlib.sha1(body.encode()).hexdigest()
+        headers = [("ETag", f'"{etag}"'), ("Cache-Control", cache_control)]
+        if request.httprequest.if_none_match.contains(etag):
+            return request.make_response("", headers=headers, status=304)
+        return request.make_response(
+            body,
+            headers=[("Content-Type", "application/json")] + headers,
+            status=200,
+        )
+
     # -------------------------------------------------------------------------
     # Odoo Time Off default URLs (override to render the custom UI)
     # -------------------------------------------------------------------------
@@ -489,20 +422,28 @@ class HrmisLeaveFrontendController(http.Controller):
         search_by = (kw.get("search_by") or "designation").strip()
         q = (kw.get("q") or "").strip()
 
-        employees = request.env["hr.employee"].sudo().browse([])
+        after = kw.get("after") or ""
+
+        Employee = request.env["hr.employee"].sudo()
+        employees = Employee.browse([])
+        next_after = False
         if q:
+            # Every branch hits an index: trigram on the names, the digits-only
+            # CNIC column, and ids for the many2one name lookups.
             if search_by == "cnic":
-                domain = [("hrmis_cnic", "ilike", q)]
+                domain = Employee._hrmis_cnic_domain(q)
             elif search_by == "designation":
                 domain = [("hrmis_designation", "ilike", q)]
             elif search_by == "district":
-                domain = [("hrmis_district_id.name", "ilike", q)]
+                domain = [("district_id.name", "ilike", q)]
             elif search_by == "facility":
-                domain = [("hrmis_facility_id.name", "ilike", q)]
+                domain = [("facility_id.name", "ilike", q)]
             else:
                 domain = ["|", ("name", "ilike", q), ("hrmis_designation", "ilike", q)]
 
-            employees = request.env["hr.employee"].sudo().search(domain, limit=50)
+            employees, next_after = Employee._hrmis_keyset_page(
+                domain, after_id=int(after) if after.isdigit() else None, limit=50
+            )
 
         return request.render(
             "hr_holidays_updates.hrmis_staff_search",
@@ -512,6 +453,8 @@ class HrmisLeaveFrontendController(http.Controller):
                 search_by=search_by,
                 q=q,
                 employees=employees,
+                after=after,
+                next_after=next_after,
             ),
         )
 
@@ -721,28 +664,24 @@ class HrmisLeaveFrontendController(http.Controller):
                 # Keep the endpoint stable; balances might be 0/0 but the UI must still work.
                 pass
 
-            leave_types = _dedupe_leave_types_for_ui(
-                _leave_types_for_employee(employee, request_date_from=d_from)
-            )
+            # Eligibility + dedupe + supporting-document rules come from the
+            # per-employee snapshot cached in memory (see hr_leave_eligibility.py).
+            snapshot = employee.hrmis_leave_eligibility_snapshot()
             payload = {
                 "ok": True,
                 "leave_types": [
                     {
-                        "id": lt.id,
+                        "id": lt_id,
                         # UI requirement: show only the base leave type name (no balances suffix).
-                        "name": lt.name,
-                        # Keep fields optional for UI compatibility.
+                        "name": name,
                         # Business rule overrides (do not depend on DB fields existing/being configured).
-                        **(
-                            (lambda req, note: {"support_document": bool(req), "support_document_note": note})(
-                                *_support_doc_rule_for_leave_type(lt)
-                            )
-                        ),
+                        "support_document": support_required,
+                        "support_document_note": support_note,
                     }
-                    for lt in leave_types
+                    for lt_id, name, support_required, support_note in snapshot["leave_types"]
                 ],
             }
-            return self._json(payload, status=200)
+            return self._json_etag(payload)
         except Exception:
             _logger.exception("HRMIS leave types API failed")
             return self._json({"ok": False, "error": "leave_types_failed", "leave_types": []}, status=200)
@@ -772,95 +711,10 @@ class HrmisLeaveFrontendController(http.Controller):
             if not lt:
                 return self._json({"ok": False, "error": "invalid_leave_type", "steps": []}, status=200)
 
-            # Prefer explicit custom flows when configured.
-            Flow = request.env["hr.leave.approval.flow"].sudo()
-            flows = Flow.search([("leave_type_id", "=", lt.id)], order="sequence")
-
-            def _user_info(user):
-                info = {
-                    "user_id": user.id,
-                    "name": user.name,
-                    "job_title": "",
-                    "department": "",
-                }
-                # Best-effort: enrich with employee info when available
-                emp = getattr(user, "employee_id", False)
-                if emp:
-                    info["job_title"] = (
-                        getattr(emp, "job_title", False)
-                        or (getattr(emp, "job_id", False) and emp.job_id.name)
-                        or ""
-                    ) or ""
-                    info["department"] = (
-                        (getattr(emp, "department_id", False) and emp.department_id.name) or ""
-                    )
-                return info
-
-            steps = []
-            if flows:
-                for flow in flows:
-                    approvers = []
-                    if getattr(flow, "approver_line_ids", False):
-                        ordered = flow.approver_line_ids.sorted(lambda l: (l.sequence, l.id))
-                        for line in ordered:
-                            u = line.user_id
-                            if not u:
-                                continue
-                            approvers.append(
-                                {
-                                    "sequence": line.sequence,
-                                    "sequence_type": line.sequence_type or (flow.mode or "sequential"),
-                                    "bps_from": getattr(line, "bps_from", 0),
-                                    "bps_to": getattr(line, "bps_to", 999),
-                                    **_user_info(u),
-                                }
-                            )
-                    else:
-                        # Legacy fallback on the flow itself
-                        for idx, u in enumerate(
-                            (flow.approver_ids or request.env["res.users"]).sorted(lambda r: r.id),
-                            start=1,
-                        ):
-                            approvers.append(
-                                {
-                                    "sequence": idx * 10,
-                                    "sequence_type": flow.mode or "sequential",
-                                    **_user_info(u),
-                                }
-                            )
-                    if approvers:
-                        steps.append({"step": flow.sequence, "approvers": approvers})
-
-            # If no flows are configured, use the leave-type validators list (OpenHRMS).
-            if (
-                not steps
-                and getattr(lt, "leave_validation_type", False) == "multi"
-                and getattr(lt, "validator_ids", False)
-            ):
-                validators = lt.validator_ids.sorted(lambda v: (getattr(v, "sequence", 10), v.id))
-                approvers = []
-                for v in validators:
-                    u = getattr(v, "user_id", False)
-                    if not u:
-                        continue
-                    approvers.append(
-                        {
-                            "sequence": getattr(v, "sequence", 10),
-                            "sequence_type": getattr(v, "sequence_type", False) or "sequential",
-                            "bps_from": getattr(v, "bps_from", 6),
-                            "bps_to": getattr(v, "bps_to", 22),
-                            **_user_info(u),
-                        }
-                    )
-                if approvers:
-                    steps.append({"step": 1, "approvers": approvers})
-
-            payload = {
-                "ok": True,
-                "leave_type": {"id": lt.id, "name": lt.name},
-                "steps": steps,
-            }
-            return self._json(payload, status=200)
+            # Flows, lines and validators are resolved once per configuration
+            # change and served from the ormcache afterwards.
+            payload = {"ok": True, **lt.hrmis_approval_chain()}
+            return self._json_etag(payload, cache_control="private, max-age=300")
         except Exception:
             _logger.exception("HRMIS leave approvers API failed")
             return self._json({"ok": False, "error": "approvers_failed", "steps": []}, status=200)
@@ -1243,8 +1097,8 @@ class HrmisProfileRequestController(http.Controller):
                 current_employee=employee,
                 req=req,
                 pre_fill=pre_fill,
-                districts=request.env["hrmis.district.master"].sudo().search([]),
-                facilities=request.env["hrmis.facility.type"].sudo().search([]),
+                districts=request.env["hrmis.master.data"].get("districts"),
+                cadres=request.env["hrmis.master.data"].get("cadres"),
                 info=info,
             ),
         )
@@ -1275,8 +1129,8 @@ class HrmisProfileRequestController(http.Controller):
                     employee=employee,
                     current_employee=employee,
                     req=req,
-                    districts=request.env["hrmis.district.master"].sudo().search([]),
-                    facilities=request.env["hrmis.facility.type"].sudo().search([]),
+                    districts=request.env["hrmis.master.data"].get("districts"),
+                    cadres=request.env["hrmis.master.data"].get("cadres"),
                     error="Invalid request.",
                 ),
             )
@@ -1304,8 +1158,8 @@ class HrmisProfileRequestController(http.Controller):
                     employee=employee,
                     current_employee=employee,
                     req=req,
-                    districts=request.env["hrmis.district.master"].sudo().search([]),
-                    facilities=request.env["hrmis.facility.type"].sudo().search([]),
+                    districts=request.env["hrmis.master.data"].get("districts"),
+                    cadres=request.env["hrmis.master.data"].get("cadres"),
                     error="Please complete the following fields before submitting:\n• " + "\n• ".join(missing),
                 ),
             )
@@ -1357,8 +1211,8 @@ class HrmisProfileRequestController(http.Controller):
                 employee=employee,
                 current_employee=employee,
                 req=req,
-                districts=request.env["hrmis.district.master"].sudo().search([]),
-                facilities=request.env["hrmis.facility.type"].sudo().search([]),
+                districts=request.env["hrmis.master.data"].get("districts"),
+                cadres=request.env["hrmis.master.data"].get("cadres"),
                 success="Profile update request submitted successfully.",
             ),
         )
@@ -1383,53 +1237,50 @@ class HrmisProfileUpdateRequests(http.Controller):
 
         ProfileRequest = request.env['hrmis.employee.profile.request'].sudo()
 
+        state = (kwargs.get('state') or '').strip()
+        if state not in dict(ProfileRequest._fields['state'].selection):
+            state = ''
+        before = (kwargs.get('before') or '').strip()
+
         # -------------------------------------------------
         # DATA VISIBILITY
         # -------------------------------------------------
         if is_admin or is_hr_manager:
             # HR / Admin → see all
-            requests = ProfileRequest.search([], order='create_date desc')
+            domain = []
         else:
             # Approver → only assigned requests
-            requests = ProfileRequest.search(
-                [('approver_id.user_id', '=', user.id)],
-                order='create_date desc'
-            )
+            domain = [('approver_id.user_id', '=', user.id)]
+        if state:
+            domain.append(('state', '=', state))
+        # Keyset page: newest first, `before` is the last id of the previous page
+        if before.isdigit():
+            domain.append(('id', '<', int(before)))
+
+        requests = ProfileRequest.search(domain, order='id desc', limit=PROFILE_REQUESTS_PAGE_SIZE + 1)
+        next_before = requests[PROFILE_REQUESTS_PAGE_SIZE - 1].id if len(requests) > PROFILE_REQUESTS_PAGE_SIZE else False
+        requests = requests[:PROFILE_REQUESTS_PAGE_SIZE]
 
         # -------------------------------------------------
         # PREPARE DISPLAY DATA
         # -------------------------------------------------
-        requests_for_display = []
-
-        for req in requests:
-            changes = []
-
-            emp = req.employee_id
+        # One query per table for the whole page
+        requests.fetch(['employee_id', 'approver_id', 'user_id', 'state', 'create_date', 'change_summary'])
+        requests.employee_id.fetch(['name'])
+        requests.approver_id.fetch(['user_id'])
 
-            if req.hrmis_employee_id != (emp.hrmis_employee_id or ''):
-                changes.append(f"Employee ID: {req.hrmis_employee_id}")
-
-            if req.hrmis_cnic != (emp.hrmis_cnic or ''):
-                changes.append(f"CNIC: {req.hrmis_cnic}")
-
-            if req.hrmis_father_name != (emp.hrmis_father_name or ''):
-                changes.append(f"Father Name: {req.hrmis_father_name}")
-
-            if req.hrmis_bps != (emp.hrmis_bps or 0):
-                changes.append(f"BPS: {req.hrmis_bps}")
-
-            #if req.hrmis_designation != (emp.hrmis_designation or ''):
-            #    changes.append(f"Designation: {req.hrmis_designation}")
-
-            requests_for_display.append({
+        requests_for_display = [
+            {
                 'id': req.id,
-                'employee_name': emp.name,
+                'employee_name': req.employee_id.name,
                 'state': req.state,
                 'create_date': req.create_date,
-                'changes': changes,
+                'changes': (req.change_summary or '').splitlines(),
                 'is_my_request': req.user_id.id == user.id,
                 'is_my_approval': req.approver_id.user_id.id == user.id if req.approver_id else False,
-            })
+            }
+            for req in requests
+        ]
 
         return request.render(
             'hr_holidays_updates.hrmis_profile_update_requests',
@@ -1439,6 +1290,10 @@ class HrmisProfileUpdateRequests(http.Controller):
                 profile_update_requests=requests_for_display,
                 is_admin=is_admin,
                 is_hr_manager=is_hr_manager,
+                state=state,
+                state_options=ProfileRequest._fields['state'].selection,
+                before=before,
+                next_before=next_before,
             ),
         )
 
@@ -1487,29 +1342,14 @@ class HrmisProfileUpdateRequests(http.Controller):
         success_msg = success and unquote(success)
         info_msg = info and unquote(info)
 
-        # ----------------------------
-        # Facility-wise remaining seats map
-        # key: (facility_id, designation_id) -> remaining_posts
-        # ----------------------------
-        allocs = request.env['hrmis.facility.designation'].sudo().search([])
-        remaining_map = {
-            (a.facility_id.id, a.designation_id.id): a.remaining_posts
-            for a in allocs
-        }
-
         return request.render(
             "hr_holidays_updates.hrmis_profile_update_request_view",
             {
                 "req": req,
-                "districts": request.env["hrmis.district.master"].sudo().search([]),
-                "facilities": request.env["hrmis.facility.type"].sudo().search([]),
-                "cadres": request.env["hrmis.cadre"].sudo().search([]),
-
-                # Only active designations (recommended)
-                "designations": request.env["hrmis.designation"].sudo().search([('active', '=', True)], order="name"),
-
-                # NEW: for (remaining/total) display facility-wise
-                "remaining_map": remaining_map,
+                "districts": request.env["hrmis.master.data"].get("districts"),
+                "cadres": request.env["hrmis.master.data"].get("cadres"),
+                # Facilities and designations (with remaining/total posts) are
+                # fetched by the page from /hrmis/api/master/*
 
                 # NEW: template alerts
                 "error_msg": error_msg,
@@ -1543,10 +1383,10 @@ class HrmisProfileUpdateRequests(http.Controller):
                 {
                     'req': req,
                     'back_url': '/hrmis/profile-update-requests',
-                    'districts': request.env['hrmis.district.master'].sudo().search([]),
-                    'facilities': request.env['hrmis.facility.type'].sudo().search([]),
-                    'cadres': request.env['hrmis.cadre'].sudo().search([]),
-                    'designations': request.env['hrmis.designation'].sudo().search([('active', '=', True)]),
+                    'districts': request.env['hrmis.master.data'].get('districts'),
+                    'facilities': request.env['hrmis.master.data'].get('facilities'),
+                    'cadres': request.env['hrmis.master.data'].get('cadres'),
+                    'designations': request.env['hrmis.master.data'].get('designations'),
                 }
             )
 
@@ -1589,48 +1429,22 @@ class HrmisProfileUpdateRequests(http.Controller):
             Allocation = request.env['hrmis.facility.designation'].sudo()
 
             # ----------------------------
-            # 2) Find / create allocation row
+            # 2) Reserve the seat FIRST: one guarded UPDATE (the allocation
+            #    row is created on first use), so concurrent approvals into
+            #    the same facility cannot overbook it
             # ----------------------------
-            allocation = Allocation.search([
-                ('facility_id', '=', req.facility_id.id),
-                ('designation_id', '=', req.hrmis_designation.id),
-            ], limit=1)
-
-            if not allocation:
-                allocation = Allocation.create({
-                    'facility_id': req.facility_id.id,
-                    'designation_id': req.hrmis_designation.id,
-                    'occupied_posts': 0,
-                })
-                request.env.flush_all()
-
-            # ----------------------------
-            # 3) Lock row + re-check seats BEFORE approving
-            #    (prevents race conditions)
-            # ----------------------------
-            request.env.cr.execute(
-                "SELECT id FROM hrmis_facility_designation WHERE id=%s FOR UPDATE",
-                (allocation.id,)
-            )
-            request.env.flush_all()
-            allocation = Allocation.browse(allocation.id)
-
-            if allocation.remaining_posts <= 0:
-                return request.redirect(
-                    f"/hrmis/profile/request/view/{req.id}?error=No remaining posts for this designation in this facility."
-                )
-
-            # ----------------------------
-            # 4) Reserve the seat (increment occupied) FIRST
-            # ----------------------------
-            allocation.write({'occupied_posts': allocation.occupied_posts + 1})
-            request.env.flush_all()
+            # (the savepoint gives the seat back if the approval fails)
+            with request.env.cr.savepoint():
+                allocation = Allocation._reserve_seat(req.facility_id.id, req.hrmis_designation.id)
+                if not allocation:
+                    return request.redirect(
+                        f"/hrmis/profile/request/view/{req.id}?error=No remaining posts for this designation in this facility."
+                    )
 
-            # ----------------------------
-            # 5) Now approve the request
-            # ----------------------------
-            req.action_approve()
-            request.env.flush_all()
+                # ----------------------------
+                # 3) Now approve the request
+                # ----------------------------
+                req.action_approve()
 
         except Exception as e:
             return request.redirect(f"/hrmis/profile/request/view/{req.id}?error={str(e)}")
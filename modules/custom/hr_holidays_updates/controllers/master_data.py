@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+
+from werkzeug.http import quote_etag
+
+from odoo import http
+from odoo.http import request
+from odoo.tools import SQL
+
+# Upper bound of the items returned by one typeahead call
+MAX_ITEMS = 1000
+
+
+def _to_int(value):
+    value = str(value or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+class HrmisMasterDataController(http.Controller):
+    """Typeahead JSON for the district / facility / designation dropdowns.
+
+    The pages only render the selected option; the other options are fetched
+    on demand (see static/src/js/hrmis_master_data.js). Responses carry an
+    ETag keyed on the max(write_date) and row count of the tables they read,
+    so the browser revalidates them with a bodiless 304.
+    """
+
+    def _etag(self, tables):
+        parts = [request.httprequest.path, request.httprequest.query_string.decode()]
+        cr = request.env.cr
+        for table in tables:
+            cr.execute(SQL("SELECT max(write_date), count(*) FROM %s", SQL.identifier(table)))
+            parts.append("%s:%s:%s" % (table, *cr.fetchone()))
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    def _cached_json(self, tables, build):
+        etag = self._etag(tables)
+        headers = [("ETag", quote_etag(etag, weak=True)), ("Cache-Control", "private, no-cache")]
+        if request.httprequest.if_none_match.contains_weak(etag):
+            return request.make_response("", headers=headers, status=304)
+        return request.make_json_response({"ok": True, "items": build()}, headers=headers)
+
+    @staticmethod
+    def _limit(kw):
+        return max(1, min(_to_int(kw.get("limit")) or MAX_ITEMS, MAX_ITEMS))
+
+    @http.route(["/hrmis/api/master/districts"], type="http", auth="user", methods=["GET"], csrf=False)
+    def hrmis_api_districts(self, q=None, **kw):
+        def build():
+            domain = [("name", "=ilike", f"{q.strip()}%")] if q and q.strip() else []
+            return request.env["hrmis.district.master"].sudo().search_read(
+                domain, ["name"], order="name", limit=self._limit(kw)
+            )
+
+        return self._cached_json(["hrmis_district_master"], build)
+
+    @http.route(["/hrmis/api/master/facilities"], type="http", auth="user", methods=["GET"], csrf=False)
+    def hrmis_api_facilities(self, district_id=None, q=None, **kw):
+        def build():
+            domain = []
+            if _to_int(district_id):
+                domain.append(("district_id", "=", _to_int(district_id)))
+            if q and q.strip():
+                domain.append(("name", "=ilike", f"{q.strip()}%"))
+            rows = request.env["hrmis.facility.type"].sudo().search_read(
+                domain, ["name", "district_id"], order="name", limit=self._limit(kw)
+            )
+            return [
+                {"id": r["id"], "name": r["name"], "district_id": r["district_id"][0] if r["district_id"] else False}
+                for r in rows
+            ]
+
+        return self._cached_json(["hrmis_facility_type"], build)
+
+    @http.route(["/hrmis/api/master/designations"], type="http", auth="user", methods=["GET"], csrf=False)
+    def hrmis_api_designations(self, facility_id=None, bps=None, q=None, seats=None, **kw):
+        """Active designations, unique by name (the lowest id is kept), of a
+        facility and/or post BPS, optionally with a name prefix. With `seats`,
+        each item also has the total and remaining posts of its facility.
+        """
+        with_seats = bool(seats)
+
+        def build():
+            conditions = [SQL("d.active")]
+            if _to_int(facility_id):
+                conditions.append(SQL("d.facility_id = %s", _to_int(facility_id)))
+            if _to_int(bps):
+                conditions.append(SQL('d."post_BPS" = %s', _to_int(bps)))
+            if q and q.strip():
+                conditions.append(SQL("d.name ILIKE %s", f"{q.strip()}%"))
+            seats_join = SQL()
+            remaining = SQL("NULL")
+            if with_seats:
+                seats_join = SQL(
+                    "LEFT JOIN hrmis_facility_designation fd"
+                    " ON fd.facility_id = d.facility_id AND fd.designation_id = d.id"
+                )
+                remaining = SQL("COALESCE(fd.remaining_posts, d.total_sanctioned_posts, 0)")
+            request.env["hrmis.designation"].flush_model()
+            request.env["hrmis.facility.designation"].flush_model()
+            request.env.cr.execute(
+                SQL(
+                    """
+                    SELECT * FROM (
+                        SELECT DISTINCT ON (lower(d.name))
+                               d.id, d.name, d.facility_id, d."post_BPS",
+                               d.total_sanctioned_posts, %(remaining)s
+                          FROM hrmis_designation d
+                          %(seats_join)s
+                         WHERE %(where)s
+                         ORDER BY lower(d.name), d.id
+                    ) AS unique_names
+                     ORDER BY name, id
+                     LIMIT %(limit)s
+                    """,
+                    remaining=remaining,
+                    seats_join=seats_join,
+                    where=SQL(" AND ").join(conditions),
+                    limit=self._limit(kw),
+                )
+            )
+            items = []
+            for des_id, name, fac_id, post_bps, total, rem in request.env.cr.fetchall():
+                item = {"id": des_id, "name": name, "facility_id": fac_id or False, "bps": post_bps}
+                if with_seats:
+                    item.update(total=total or 0, remaining=rem or 0)
+                items.append(item)
+            return items
+
+        tables = ["hrmis_designation"] + (["hrmis_facility_designation"] if with_seats else [])
+        return self._cached_json(tables, build)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from urllib.parse import urlencode
+
+from odoo import http
+from odoo.http import request
+
+from .utils import base_ctx
+
+VACANCY_PAGE_SIZE = 100
+# Upper bound of the rows returned by one API call
+VACANCY_API_MAX_ROWS = 5000
+
+VACANCY_GROUP_LABELS = [
+    ("designation", "Designation"),
+    ("facility", "Facility"),
+    ("district", "District"),
+    ("bps", "BPS"),
+]
+
+
+def _to_int(value):
+    value = str(value or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+class HrmisVacancyMatrixController(http.Controller):
+    """Vacancy matrix (see hrmis.vacancy.matrix) for HR and section officers,
+    as a filterable page and as JSON."""
+
+    def _can_view_vacancies(self):
+        user = request.env.user
+        return bool(
+            user.has_group("base.group_system")
+            or user.has_group("hr.group_hr_user")
+            or user.has_group("custom_login.group_section_officer")
+            or user.has_group("custom_login.group_ms_dho")
+        )
+
+    def _filters(self, kw):
+        return {
+            "district_id": _to_int(kw.get("district_id")),
+            "facility_id": _to_int(kw.get("facility_id")),
+            "bps": _to_int(kw.get("bps")),
+            "designation": (kw.get("designation") or "").strip(),
+            "vacant_only": kw.get("vacant_only") in ("1", "true", "on"),
+        }
+
+    def _group_by(self, kw):
+        group_by = (kw.get("group_by") or "designation").strip()
+        return group_by if group_by in dict(VACANCY_GROUP_LABELS) else "designation"
+
+    @http.route(["/hrmis/vacancies"], type="http", auth="user", website=True)
+    def hrmis_vacancies(self, **kw):
+        if not self._can_view_vacancies():
+            return request.redirect("/hrmis/services")
+
+        filters = self._filters(kw)
+        group_by = self._group_by(kw)
+        page = max(_to_int(kw.get("page")) or 1, 1)
+        report = request.env["hrmis.vacancy.matrix"].sudo()._vacancy_report(
+            group_by=group_by, limit=VACANCY_PAGE_SIZE, offset=(page - 1) * VACANCY_PAGE_SIZE, **filters
+        )
+
+        facility = request.env["hrmis.facility.type"].sudo().browse(filters["facility_id"] or []).exists()
+        query = {key: value for key, value in kw.items() if key != "page" and value not in (None, "")}
+        return request.render(
+            "hr_holidays_updates.hrmis_vacancy_matrix_page",
+            base_ctx(
+                "Vacancies",
+                "vacancies",
+                report=report,
+                filters=filters,
+                group_by=group_by,
+                group_labels=VACANCY_GROUP_LABELS,
+                districts=request.env["hrmis.master.data"].get("districts"),
+                facility=facility,
+                page=page,
+                prev_url=f"/hrmis/vacancies?{urlencode({**query, 'page': page - 1})}" if page > 1 else "",
+                next_url=(
+                    f"/hrmis/vacancies?{urlencode({**query, 'page': page + 1})}"
+                    if report["count"] > page * VACANCY_PAGE_SIZE
+                    else ""
+                ),
+            ),
+        )
+
+    @http.route(["/hrmis/api/vacancies"], type="http", auth="user", methods=["GET"], csrf=False)
+    def hrmis_api_vacancies(self, **kw):
+        if not self._can_view_vacancies():
+            return request.make_json_response({"ok": False, "error": "forbidden"}, status=403)
+
+        limit = max(1, min(_to_int(kw.get("limit")) or VACANCY_API_MAX_ROWS, VACANCY_API_MAX_ROWS))
+        report = request.env["hrmis.vacancy.matrix"].sudo()._vacancy_report(
+            group_by=self._group_by(kw), limit=limit, offset=_to_int(kw.get("offset")) or 0, **self._filters(kw)
+        )
+        return request.make_json_response({"ok": True, **report})
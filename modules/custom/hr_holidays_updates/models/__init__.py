@@ -2,6 +2,9 @@ from .leave_types_models import hr_leave_custom
 from .leave_types_models import hr_leave_onchange
 from .leave_types_models import hr_leave_validator
 from .leave_types_models import hr_employee
+from . import hr_employee_hierarchy
+from .leave_types_models import hr_leave_eligibility
+from .leave_types_models import hr_leave_type_approvers
 from .leave_types_models import hr_leave_allocation_custom
 
 from .supporting_docs_models import hr_leave_attachments
@@ -10,6 +13,8 @@ from .notifications_models import hr_leave_notifications
 from .notifications_models import hrmis_notification
 from .notifications_models import res_users_hrmis_notifications
 from .notifications_models import hr_profile_update_notifications
+
+from .export_models import hrmis_export_job
 from . import profile_complete
 
 
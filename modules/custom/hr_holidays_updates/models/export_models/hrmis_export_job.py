@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import traceback
+from datetime import timedelta
+
+import xlsxwriter
+from psycopg2 import IntegrityError
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# Class of the session-level advisory locks a worker holds on the job it runs
+# (the key is the job id): a "running" job nobody holds a lock on belongs to a
+# dead worker and is re-queued.
+EXPORT_JOB_LOCK_CLASS = 48_526_101
+# Bytes read at a time when copying an export file to the filestore
+FILE_COPY_CHUNK_SIZE = 1024 * 1024
+# Jobs (and their files) are removed after this many days.
+JOB_RETENTION_DAYS = 7
+
+
+class HrmisExportJob(models.Model):
+    """Report export produced by a cron worker instead of an HTTP worker.
+
+    Each export type provides `_export_<type>(filters)`, returning the column
+    headers, the expected row count and an iterable of rows (see the staff
+    export of custom_section_officers).
+    """
+
+    _name = "hrmis.export.job"
+    _description = "HRMIS Export Job"
+    _order = "id desc"
+
+    name = fields.Char(required=True)
+    user_id = fields.Many2one("res.users", required=True, index=True, ondelete="cascade")
+    export_type = fields.Selection([], required=True)
+    file_format = fields.Selection([("xlsx", "Excel"), ("csv", "CSV")], required=True, default="xlsx")
+    filters = fields.Text(default="{}", help="JSON object of the filters of the export.")
+    # Identical requests of one user share a key: only one of them is queued/running.
+    dedup_key = fields.Char(required=True, index=True)
+    state = fields.Selection(
+        [("queued", "Queued"), ("running", "Running"), ("done", "Done"), ("failed", "Failed")],
+        default="queued",
+        required=True,
+        index=True,
+    )
+    progress = fields.Integer(help="Percentage of the rows written.")
+    row_count = fields.Integer()
+    total_count = fields.Integer()
+    attachment_id = fields.Many2one("ir.attachment", ondelete="set null")
+    error = fields.Text()
+    date_started = fields.Datetime()
+    date_done = fields.Datetime()
+
+    def init(self):
+        self.env.cr.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS hrmis_export_job_active_dedup_uniq
+                ON hrmis_export_job (user_id, dedup_key)
+             WHERE state IN ('queued', 'running')
+            """
+        )
+
+    @api.model
+    def _dedup_key(self, export_type, file_format, filters):
+        payload = json.dumps([export_type, file_format, filters], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    @api.model
+    def enqueue(self, export_type, filters=None, file_format="xlsx", name=None):
+        """Queue an export for the current user, or return the identical one
+        already queued/running for them.
+        """
+        filters = {key: value for key, value in (filters or {}).items() if value not in (None, "")}
+        key = self._dedup_key(export_type, file_format, filters)
+        domain = [("user_id", "=", self.env.uid), ("dedup_key", "=", key), ("state", "in", ("queued", "running"))]
+        Job = self.sudo()
+        job = Job.search(domain, limit=1)
+        if job:
+            return job
+        try:
+            with self.env.cr.savepoint():
+                job = Job.create(
+                    {
+                        "name": name or dict(self._fields["export_type"]._description_selection(self.env)).get(export_type, export_type),
+                        "user_id": self.env.uid,
+                        "export_type": export_type,
+                        "file_format": file_format,
+                        "filters": json.dumps(filters, sort_keys=True, default=str),
+                        "dedup_key": key,
+                    }
+                )
+                job.flush_recordset()
+        except IntegrityError:
+            # A concurrent identical request won the unique index.
+            job = Job.search(domain, limit=1)
+            if not job:
+                raise
+        self.env.ref("hr_holidays_updates.ir_cron_hrmis_export_jobs").sudo()._trigger()
+        return job
+
+    def _download_url(self):
+        self.ensure_one()
+        return f"/hrmis/export/jobs/{self.id}/download"
+
+    def _status_url(self):
+        self.ensure_one()
+        return f"/hrmis/export/jobs/{self.id}"
+
+    @api.model
+    def _requeue_orphaned_jobs(self):
+        """Re-queue the "running" jobs whose worker is gone, i.e. that no
+        session holds the advisory lock of. Each job is checked on a fresh
+        transaction taken once its lock is held, so that it sees the final
+        state committed by a worker that just released it.
+        """
+        self.env.cr.execute("SELECT id FROM hrmis_export_job WHERE state = 'running'")
+        for (job_id,) in self.env.cr.fetchall():
+            with self.pool.cursor() as cr:
+                cr.execute("SELECT pg_try_advisory_lock(%s, %s)", [EXPORT_JOB_LOCK_CLASS, job_id])
+                if not cr.fetchone()[0]:
+                    continue
+                try:
+                    cr.execute(
+                        "UPDATE hrmis_export_job SET state = 'queued' WHERE id = %s AND state = 'running'",
+                        [job_id],
+                    )
+                    if cr.rowcount:
+                        _logger.warning("HRMIS export job %s lost its worker, re-queued", job_id)
+                finally:
+                    cr.execute("SELECT pg_advisory_unlock(%s, %s)", [EXPORT_JOB_LOCK_CLASS, job_id])
+
+    @api.model
+    def _cron_process_jobs(self, limit=5):
+        """Run the queued exports, one transaction each. Jobs are claimed with
+        SKIP LOCKED so that several cron workers can share the queue, and
+        advisory-locked while they run (see `_requeue_orphaned_jobs`).
+        """
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        cr = self.env.cr
+        self._requeue_orphaned_jobs()
+        for __ in range(limit):
+            cr.execute(
+                """
+                SELECT id FROM hrmis_export_job
+                 WHERE state = 'queued'
+                 ORDER BY id
+                 LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+                """
+            )
+            row = cr.fetchone()
+            if not row:
+                break
+            job = self.browse(row[0])
+            # Session-level: kept across the commits of the run, released by
+            # the unlock below or when the worker's connection is closed
+            cr.execute("SELECT pg_advisory_lock(%s, %s)", [EXPORT_JOB_LOCK_CLASS, job.id])
+            try:
+                job.write({"state": "running", "date_started": fields.Datetime.now(), "progress": 0})
+                if auto_commit:
+                    cr.commit()
+                job._run(auto_commit)
+                if auto_commit:
+                    cr.commit()
+            finally:
+                cr.execute("SELECT pg_advisory_unlock(%s, %s)", [EXPORT_JOB_LOCK_CLASS, job.id])
+        self._gc_jobs()
+
+    def _run(self, auto_commit=True):
+        self.ensure_one()
+        try:
+            self._generate(auto_commit)
+        except Exception:
+            _logger.exception("HRMIS export job %s failed", self.id)
+            if auto_commit:
+                self.env.cr.rollback()
+                self.env.invalidate_all()
+            self.write({"state": "failed", "error": traceback.format_exc(limit=5), "date_done": fields.Datetime.now()})
+            self._notify("Export failed", f"Your export \"{self.name}\" could not be generated.")
+
+    def _generate(self, auto_commit=True):
+        filters = json.loads(self.filters or "{}")
+        headers, total, rows = getattr(self, f"_export_{self.export_type}")(filters)
+        self.total_count = total
+        step = max(total // 20, 1000)
+
+        def report(count):
+            if count % step:
+                return
+            self.write({"row_count": count, "progress": min(99, count * 100 // total) if total else 0})
+            if auto_commit:
+                # Only job progress is pending here: the export itself reads.
+                self.env.cr.commit()
+
+        with tempfile.TemporaryFile() as output:
+            if self.file_format == "csv":
+                count = self._write_csv(output, headers, rows, report)
+                mimetype = "text/csv"
+            else:
+                count = self._write_xlsx(output, headers, rows, report)
+                mimetype = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            stamp = fields.Datetime.context_timestamp(self, fields.Datetime.now()).strftime("%Y%m%d_%H%M%S")
+            attachment = self._attachment_from_file(
+                output, f"{self.name.replace(' ', '_')}_{stamp}.{self.file_format}", mimetype
+            )
+        self.write(
+            {
+                "state": "done",
+                "attachment_id": attachment.id,
+                "row_count": count,
+                "progress": 100,
+                "date_done": fields.Datetime.now(),
+            }
+        )
+        self._notify("Export ready", f"Your export \"{self.name}\" ({count} rows) is ready to download.")
+
+    def _attachment_from_file(self, output, name, mimetype):
+        """Attach the file `output` to the job. With the filestore, the file is
+        copied there by chunks (as ir.attachment._file_write would store it)
+        instead of being read in memory; with database storage it has to be
+        read whole.
+        """
+        self.ensure_one()
+        Attachment = self.env["ir.attachment"].sudo()
+        values = {"name": name, "mimetype": mimetype, "res_model": self._name, "res_id": self.id}
+        output.seek(0)
+        if Attachment._storage() != "file":
+            return Attachment.create({**values, "raw": output.read()})
+
+        sha1 = hashlib.sha1()
+        for chunk in iter(lambda: output.read(FILE_COPY_CHUNK_SIZE), b""):
+            sha1.update(chunk)
+        size = output.tell()
+        checksum = sha1.hexdigest()
+        fname = f"{checksum[:2]}/{checksum}"
+        full_path = Attachment._full_path(fname)
+        if not os.path.exists(full_path):
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            output.seek(0)
+            with open(full_path, "wb") as target:
+                shutil.copyfileobj(output, target, FILE_COPY_CHUNK_SIZE)
+            # Removed by the filestore GC if this transaction is rolled back
+            Attachment._mark_for_gc(fname)
+        # create() and write() ignore these fields, set from the file content
+        attachment = Attachment.create(values)
+        self.env.cr.execute(
+            "UPDATE ir_attachment SET store_fname = %s, file_size = %s, checksum = %s WHERE id = %s",
+            [fname, size, checksum, attachment.id],
+        )
+        attachment.invalidate_recordset(["store_fname", "file_size", "checksum"])
+        return attachment
+
+    @api.model
+    def _write_xlsx(self, output, headers, rows, report):
+        workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+        sheet = workbook.add_worksheet("Export")
+        sheet.write_row(0, 0, headers)
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            sheet.write_row(count, 0, row)
+            report(count)
+        workbook.close()
+        return count
+
+    @api.model
+    def _write_csv(self, output, headers, rows, report):
+        text = io.TextIOWrapper(output, encoding="utf-8-sig", newline="")
+        writer = csv.writer(text)
+        writer.writerow(headers)
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            report(count)
+        text.flush()
+        text.detach()
+        return count
+
+    def _notify(self, title, body):
+        self.ensure_one()
+        self.env["hrmis.notification"].sudo().create(
+            {
+                "user_id": self.user_id.id,
+                "title": title,
+                "body": body,
+                "res_model": self._name,
+                "res_id": self.id,
+            }
+        )
+
+    @api.model
+    def _gc_jobs(self):
+        deadline = fields.Datetime.now() - timedelta(days=JOB_RETENTION_DAYS)
+        old = self.search([("state", "in", ("done", "failed")), ("date_done", "<", deadline)])
+        old.attachment_id.unlink()
+        old.unlink()
+
+    def status_payload(self):
+        self.ensure_one()
+        return {
+            "id": self.id,
+            "name": self.name,
+            "state": self.state,
+            "progress": self.progress,
+            "row_count": self.row_count,
+            "total_count": self.total_count,
+            "download_url": self._download_url() if self.state == "done" and self.attachment_id else "",
+        }
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# Closure of the manager hierarchy: one row per (manager, employee below it)
+# pair, at any depth. Maintained in SQL from hr.employee writes.
+HIERARCHY_TABLE = "hr_employee_hierarchy"
+# Manager fields walked upwards (`employee_parent_id` only exists on some databases).
+HIERARCHY_PARENT_FIELDS = ("parent_id", "employee_parent_id")
+# Guard against cycles through the two manager fields.
+MAX_HIERARCHY_DEPTH = 32
+
+
+class HrEmployee(models.Model):
+    _inherit = "hr.employee"
+
+    hrmis_manager_user_ids = fields.Many2many(
+        "res.users",
+        string="Managers (All Levels)",
+        compute="_compute_hrmis_manager_user_ids",
+        search="_search_hrmis_manager_user_ids",
+        help="Users of every employee above this one in the manager hierarchy.",
+    )
+
+    def init(self):
+        super().init()
+        cr = self.env.cr
+        cr.execute(
+            SQL(
+                """
+                CREATE TABLE IF NOT EXISTS %s (
+                    ancestor_id integer NOT NULL REFERENCES hr_employee(id) ON DELETE CASCADE,
+                    descendant_id integer NOT NULL REFERENCES hr_employee(id) ON DELETE CASCADE,
+                    depth integer NOT NULL,
+                    PRIMARY KEY (ancestor_id, descendant_id)
+                )
+                """,
+                SQL.identifier(HIERARCHY_TABLE),
+            )
+        )
+        create_index(
+            cr,
+            f"{HIERARCHY_TABLE}_descendant_id_index",
+            HIERARCHY_TABLE,
+            ["descendant_id", "ancestor_id"],
+        )
+        # Full rebuild on install/update: also picks up manager fields added since.
+        self._hrmis_rebuild_hierarchy()
+
+    @api.model
+    def _hrmis_hierarchy_parent_fields(self):
+        return [
+            name
+            for name in HIERARCHY_PARENT_FIELDS
+            if (field := self._fields.get(name))
+            and field.store
+            and field.type == "many2one"
+            and field.comodel_name == "hr.employee"
+        ]
+
+    @api.model
+    def _hrmis_rebuild_hierarchy(self, employee_ids=None):
+        """Recompute the closure rows of the employees `employee_ids` (all of
+        them when None) from the manager fields stored in the database.
+        """
+        cr = self.env.cr
+        parent_fields = self._hrmis_hierarchy_parent_fields()
+        if employee_ids is None:
+            cr.execute(SQL("DELETE FROM %s", SQL.identifier(HIERARCHY_TABLE)))
+            start = SQL("TRUE")
+        else:
+            employee_ids = list(employee_ids)
+            if not employee_ids:
+                return
+            cr.execute(
+                SQL(
+                    "DELETE FROM %s WHERE descendant_id = ANY(%s)",
+                    SQL.identifier(HIERARCHY_TABLE),
+                    employee_ids,
+                )
+            )
+            start = SQL("emp.id = ANY(%s)", employee_ids)
+        if not parent_fields:
+            return
+        parents = SQL(", ").join(
+            SQL("(%s)", SQL.identifier("emp", name)) for name in parent_fields
+        )
+        cr.execute(
+            SQL(
+                """
+                WITH RECURSIVE up(descendant_id, ancestor_id, depth) AS (
+                    SELECT emp.id, parent.id, 1
+                      FROM hr_employee emp
+                     CROSS JOIN LATERAL (VALUES %(parents)s) AS parent(id)
+                     WHERE %(start)s AND parent.id IS NOT NULL
+                    UNION
+                    SELECT up.descendant_id, parent.id, up.depth + 1
+                      FROM up
+                      JOIN hr_employee emp ON emp.id = up.ancestor_id
+                     CROSS JOIN LATERAL (VALUES %(parents)s) AS parent(id)
+                     WHERE parent.id IS NOT NULL AND up.depth < %(max_depth)s
+                )
+                INSERT INTO %(table)s (ancestor_id, descendant_id, depth)
+                SELECT ancestor_id, descendant_id, MIN(depth)
+                  FROM up
+                 WHERE ancestor_id <> descendant_id
+                 GROUP BY ancestor_id, descendant_id
+                """,
+                parents=parents,
+                start=start,
+                max_depth=MAX_HIERARCHY_DEPTH,
+                table=SQL.identifier(HIERARCHY_TABLE),
+            )
+        )
+
+    def _hrmis_descendant_ids(self):
+        """Ids of the employees below `self` in the hierarchy, at any depth."""
+        ids = [emp_id for emp_id in self._origin.ids if emp_id]
+        if not ids:
+            return []
+        self.env.cr.execute(
+            SQL(
+                "SELECT DISTINCT descendant_id FROM %s WHERE ancestor_id = ANY(%s)",
+                SQL.identifier(HIERARCHY_TABLE),
+                ids,
+            )
+        )
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    def _hrmis_update_hierarchy(self):
+        """Refresh the closure after the manager of `self` changed: the rows of
+        `self` and of everyone below it are recomputed.
+        """
+        ids = [emp_id for emp_id in self._origin.ids if emp_id]
+        if ids:
+            self._hrmis_rebuild_hierarchy(set(ids) | set(self._hrmis_descendant_ids()))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        employees = super().create(vals_list)
+        employees.flush_recordset(self._hrmis_hierarchy_parent_fields())
+        employees._hrmis_update_hierarchy()
+        return employees
+
+    def _write(self, vals):
+        # Also reached when the computed `parent_id` is flushed (e.g. after a
+        # department change), not only from write().
+        res = super()._write(vals)
+        if any(name in vals for name in self._hrmis_hierarchy_parent_fields()):
+            self._hrmis_update_hierarchy()
+        return res
+
+    def unlink(self):
+        # Their manager link is cleared by the database (ON DELETE SET NULL),
+        # without going through _write().
+        descendant_ids = set(self._hrmis_descendant_ids()) - set(self.ids)
+        res = super().unlink()
+        self._hrmis_rebuild_hierarchy(descendant_ids)
+        return res
+
+    def _compute_hrmis_manager_user_ids(self):
+        ids = [emp_id for emp_id in self._origin.ids if emp_id]
+        users_by_employee = {}
+        if ids:
+            self.flush_model(self._hrmis_hierarchy_parent_fields() + ["user_id"])
+            self.env.cr.execute(
+                SQL(
+                    """
+                    SELECT link.descendant_id, array_agg(DISTINCT manager.user_id)
+                      FROM %s link
+                      JOIN hr_employee manager ON manager.id = link.ancestor_id
+                     WHERE link.descendant_id = ANY(%s) AND manager.user_id IS NOT NULL
+                     GROUP BY link.descendant_id
+                    """,
+                    SQL.identifier(HIERARCHY_TABLE),
+                    ids,
+                )
+            )
+            users_by_employee = dict(self.env.cr.fetchall())
+        for emp in self:
+            emp.hrmis_manager_user_ids = [
+                fields.Command.set(users_by_employee.get(emp._origin.id) or [])
+            ]
+
+    def _search_hrmis_manager_user_ids(self, operator, value):
+        """Employees managed, at any depth, by the given users: one join of the
+        closure table, usable in domains and record rules, e.g.
+        ``[("employee_id.hrmis_manager_user_ids", "in", [user.id])]``.
+        """
+        if operator not in ("in", "="):
+            raise UserError(_("Unsupported operator %s for managers.", operator))
+        if isinstance(value, models.BaseModel):
+            value = value.ids
+        user_ids = [uid for uid in (value if isinstance(value, (list, tuple, set)) else [value]) if uid]
+        if not user_ids:
+            return [("id", "in", [])]
+        self.flush_model(self._hrmis_hierarchy_parent_fields() + ["user_id"])
+        return [
+            (
+                "id",
+                "in",
+                SQL(
+                    """
+                    SELECT link.descendant_id
+                      FROM %s link
+                      JOIN hr_employee manager ON manager.id = link.ancestor_id
+                     WHERE manager.user_id = ANY(%s)
+                    """,
+                    SQL.identifier(HIERARCHY_TABLE),
+                    user_ids,
+                ),
+            )
+        ]
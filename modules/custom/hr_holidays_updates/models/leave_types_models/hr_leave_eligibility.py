@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import re
+
+from odoo import api, models, tools
+
+
+# Leave types hidden from the HRMIS dropdown (business requirement), compared
+# on the normalized name produced by `_norm_leave_type_name`.
+UI_BLOCKED_LEAVE_TYPE_KEYS = frozenset(
+    {
+        "compensatorydays",
+        "paidtimeoff",
+        "sicktimeoff",
+        "unpaid",
+    }
+)
+
+# xmlid -> supporting document label required for that leave type.
+SUPPORT_DOC_RULES = {
+    "hr_holidays_updates.leave_type_maternity": "Medical certificate",
+    "hr_holidays_updates.leave_type_special_quarantine": "Quarantine order",
+    "hr_holidays_updates.leave_type_study_full_pay": "Admission letter / Course Details",
+    "hr_holidays_updates.leave_type_study_half_pay": "Admission letter / Course Details",
+    "hr_holidays_updates.leave_type_study_eol": "Admission letter / Course Details",
+    "hr_holidays_updates.leave_type_medical_long": "Medical Certificate",
+}
+
+_UNICODE_HYPHENS_RE = re.compile(r"[\u2010-\u2015]")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _norm_leave_type_name(name: str) -> str:
+    # Collapse to an ASCII-ish comparable key: lower, remove punctuation/spaces differences.
+    s = (name or "").strip().lower()
+    s = _UNICODE_HYPHENS_RE.sub("-", s)
+    s = _NON_ALNUM_RE.sub("", s)
+    return s
+
+
+class HrEmployeeLeaveEligibility(models.Model):
+    _inherit = "hr.employee"
+
+    def _hrmis_leave_state_stamp(self):
+        """
+        Cheap fingerprint of the employee's leave requests.
+
+        Any create/unlink/state change on one of the employee's `hr.leave`
+        records moves either the count or the latest `write_date`, so using it
+        in a cache key invalidates only that employee's snapshot, in every
+        worker, without clearing the registry caches.
+        """
+        self.ensure_one()
+        self.env["hr.leave"].flush_model()
+        self.env.cr.execute(
+            "SELECT COUNT(*), MAX(write_date) FROM hr_leave WHERE employee_id = %s",
+            [self.id],
+        )
+        count, last_write = self.env.cr.fetchone()
+        return count, str(last_write or "")
+
+    def hrmis_leave_eligibility_snapshot(self):
+        """
+        Eligibility snapshot used by the HRMIS leave-type dropdown.
+
+        Returns a dict with `gender`, `maternity_taken`, `lpr_taken` and
+        `leave_types`, a tuple of `(id, name, support_required, support_note)`
+        already filtered and deduplicated for the UI. The value is shared
+        through the ormcache: callers must not mutate it.
+        """
+        self.ensure_one()
+        # Some deployments use `gender`, others use `hrmis_gender`. Keep both.
+        gender = getattr(self, "gender", False) or getattr(self, "hrmis_gender", False) or False
+        return self._hrmis_leave_eligibility_snapshot(
+            self.id, gender, self._hrmis_leave_state_stamp(), self.env.lang or ""
+        )
+
+    @api.model
+    @tools.ormcache("employee_id", "gender", "stamp", "lang")
+    def _hrmis_leave_eligibility_snapshot(self, employee_id, gender, stamp, lang):
+        """
+        Eligibility rules:
+        - Maternity Leave is visible only for female employees.
+        - Maternity Leave is hidden after 3 approved maternity leaves.
+        - LPR Leave is hidden after 1 pending/approved LPR leave.
+        """
+        env = self.sudo().with_context(lang=lang or None).env
+        maternity = env.ref("hr_holidays_updates.leave_type_maternity", raise_if_not_found=False)
+        lpr = env.ref("hr_holidays_updates.leave_type_lpr", raise_if_not_found=False)
+
+        Leave = env["hr.leave"]
+        maternity_taken = 0
+        if maternity:
+            maternity_taken = Leave.search_count(
+                [
+                    ("employee_id", "=", employee_id),
+                    ("holiday_status_id", "=", maternity.id),
+                    ("state", "in", ("validate", "validate2")),
+                ]
+            )
+        lpr_taken = 0
+        if lpr:
+            lpr_taken = Leave.search_count(
+                [
+                    ("employee_id", "=", employee_id),
+                    ("holiday_status_id", "=", lpr.id),
+                    # Treat any non-cancelled/non-refused request as "taken" (pending or approved).
+                    ("state", "not in", ("cancel", "refuse")),
+                ]
+            )
+
+        excluded = set()
+        if maternity and (gender != "female" or maternity_taken >= 3):
+            excluded.add(maternity.id)
+        if lpr and lpr_taken >= 1:
+            excluded.add(lpr.id)
+
+        support_rules = self._hrmis_support_doc_rules()
+        leave_types = []
+        seen = set()
+        for lt in env["hr.leave.type"].search([("id", "not in", list(excluded))], order="name asc"):
+            # UI-only dedupe: keep first record per normalized name.
+            key = _norm_leave_type_name(lt.name)
+            if not key or key in UI_BLOCKED_LEAVE_TYPE_KEYS or key in seen:
+                continue
+            seen.add(key)
+            note = support_rules.get(lt.id, "")
+            leave_types.append((lt.id, lt.name, bool(note), note))
+
+        return {
+            "gender": gender,
+            "maternity_taken": maternity_taken,
+            "lpr_taken": lpr_taken,
+            "excluded_leave_type_ids": tuple(sorted(excluded)),
+            "leave_types": tuple(leave_types),
+        }
+
+    @api.model
+    def _hrmis_support_doc_rules(self):
+        """Map leave type id -> supporting document label (missing xmlids are ignored)."""
+        rules = {}
+        for xmlid, label in SUPPORT_DOC_RULES.items():
+            leave_type = self.env.ref(xmlid, raise_if_not_found=False)
+            if leave_type:
+                rules[leave_type.id] = label
+        return rules
+
+
+class HrLeaveTypeEligibility(models.Model):
+    _inherit = "hr.leave.type"
+
+    # Eligibility snapshots embed leave type names and ids; drop them when
+    # the leave type catalogue changes (rare, admin-only operations).
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"name", "active"} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from odoo import api, models, tools
+
+
+class HrLeaveTypeApprovers(models.Model):
+    _inherit = "hr.leave.type"
+
+    def _hrmis_approval_chain_stamp(self):
+        """
+        Version of the approval configuration of this leave type.
+
+        Latest `write_date` and row counts of the leave type, its approval
+        flows, flow lines and OpenHRMS validators. Counts catch deletions,
+        which do not move any `write_date`.
+        """
+        self.ensure_one()
+        for model in (
+            "hr.leave.type",
+            "hr.leave.approval.flow",
+            "hr.leave.approval.flow.line",
+            "hr.holidays.validators",
+        ):
+            self.env[model].flush_model()
+        validator_field = self._fields["validator_ids"]
+        self.env.cr.execute(
+            f"""
+            SELECT
+                (SELECT write_date FROM hr_leave_type WHERE id = %(lt)s),
+                (SELECT COUNT(*) || '/' || COALESCE(MAX(f.write_date)::text, '')
+                   FROM hr_leave_approval_flow f
+                  WHERE f.leave_type_id = %(lt)s),
+                (SELECT COUNT(*) || '/' || COALESCE(MAX(l.write_date)::text, '')
+                   FROM hr_leave_approval_flow_line l
+                   JOIN hr_leave_approval_flow f ON f.id = l.flow_id
+                  WHERE f.leave_type_id = %(lt)s),
+                (SELECT COUNT(*) || '/' || COALESCE(MAX(v.write_date)::text, '')
+                   FROM hr_holidays_validators v
+                   JOIN "{validator_field.relation}" r ON r."{validator_field.column2}" = v.id
+                  WHERE r."{validator_field.column1}" = %(lt)s)
+            """,
+            {"lt": self.id},
+        )
+        return tuple(str(v or "") for v in self.env.cr.fetchone())
+
+    def hrmis_approval_chain(self):
+        """
+        Approval chain of this leave type as shown by the HRMIS leave form:
+        `{"leave_type": {...}, "steps": [...]}`.
+
+        Cached per leave type until its flows, flow lines or validators are
+        edited. The value is shared through the ormcache: do not mutate it.
+        """
+        self.ensure_one()
+        return self._hrmis_approval_chain(
+            self.id, self._hrmis_approval_chain_stamp(), self.env.company.id, self.env.lang or ""
+        )
+
+    @api.model
+    @tools.ormcache("leave_type_id", "stamp", "company_id", "lang")
+    def _hrmis_approval_chain(self, leave_type_id, stamp, company_id, lang):
+        env = self.sudo().with_context(lang=lang or None).env
+        lt = env["hr.leave.type"].browse(leave_type_id)
+
+        # Prefer explicit custom flows when configured.
+        flows = env["hr.leave.approval.flow"].search([("leave_type_id", "=", lt.id)], order="sequence, id")
+        lines = env["hr.leave.approval.flow.line"].search_read(
+            [("flow_id", "in", flows.ids), ("user_id", "!=", False)],
+            ["flow_id", "sequence", "sequence_type", "bps_from", "bps_to", "user_id"],
+            order="sequence, id",
+        )
+        lines_by_flow = {}
+        for line in lines:
+            lines_by_flow.setdefault(line["flow_id"][0], []).append(line)
+        flow_rows = flows.read(["sequence", "mode", "approver_ids"])
+
+        validators = []
+        if getattr(lt, "leave_validation_type", False) == "multi" and lt.validator_ids:
+            validators = env["hr.holidays.validators"].search_read(
+                [("id", "in", lt.validator_ids.ids), ("user_id", "!=", False)],
+                ["sequence", "sequence_type", "bps_from", "bps_to", "user_id"],
+                order="sequence, id",
+            )
+
+        user_ids = {line["user_id"][0] for line in lines} | {v["user_id"][0] for v in validators}
+        for flow in flow_rows:
+            if not lines_by_flow.get(flow["id"]):
+                user_ids.update(flow["approver_ids"])
+        user_info = env["hr.leave.type"]._hrmis_approver_user_info(sorted(user_ids), company_id)
+
+        steps = []
+        for flow in flow_rows:
+            approvers = []
+            flow_mode = flow["mode"] or "sequential"
+            if lines_by_flow.get(flow["id"]):
+                for line in lines_by_flow[flow["id"]]:
+                    approvers.append(
+                        {
+                            "sequence": line["sequence"],
+                            "sequence_type": line["sequence_type"] or flow_mode,
+                            "bps_from": line["bps_from"],
+                            "bps_to": line["bps_to"],
+                            **user_info[line["user_id"][0]],
+                        }
+                    )
+            else:
+                # Legacy fallback on the flow itself
+                for idx, user_id in enumerate(sorted(flow["approver_ids"]), start=1):
+                    approvers.append(
+                        {
+                            "sequence": idx * 10,
+                            "sequence_type": flow_mode,
+                            **user_info[user_id],
+                        }
+                    )
+            if approvers:
+                steps.append({"step": flow["sequence"], "approvers": approvers})
+
+        # If no flows are configured, use the leave-type validators list (OpenHRMS).
+        if not steps and validators:
+            steps.append(
+                {
+                    "step": 1,
+                    "approvers": [
+                        {
+                            "sequence": v["sequence"],
+                            "sequence_type": v["sequence_type"] or "sequential",
+                            "bps_from": v["bps_from"],
+                            "bps_to": v["bps_to"],
+                            **user_info[v["user_id"][0]],
+                        }
+                        for v in validators
+                    ],
+                }
+            )
+
+        return {"leave_type": {"id": lt.id, "name": lt.name}, "steps": steps}
+
+    @api.model
+    def _hrmis_approver_user_info(self, user_ids, company_id):
+        """Batch-read approver names plus job title/department of their employee."""
+        env = self.env
+        info = {
+            user["id"]: {"user_id": user["id"], "name": user["name"], "job_title": "", "department": ""}
+            for user in env["res.users"].browse(user_ids).read(["name"])
+        }
+        employees = env["hr.employee"].search_read(
+            [("user_id", "in", list(user_ids))],
+            ["user_id", "company_id", "job_title", "job_id", "department_id"],
+            order="id",
+        )
+        # Mirror `res.users.employee_id`: prefer the employee of the current company.
+        employees.sort(key=lambda e: (e["company_id"] and e["company_id"][0]) != company_id)
+        enriched = set()
+        for emp in employees:
+            user_id = emp["user_id"][0]
+            if user_id in enriched or user_id not in info:
+                continue
+            enriched.add(user_id)
+            info[user_id]["job_title"] = emp["job_title"] or (emp["job_id"] and emp["job_id"][1]) or ""
+            info[user_id]["department"] = (emp["department_id"] and emp["department_id"][1]) or ""
+        return info
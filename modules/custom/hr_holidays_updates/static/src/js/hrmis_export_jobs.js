@@ -0,0 +1,46 @@
+/** @odoo-module **/
+
+// Poll the status of a background export until it is done, then reload the
+// page to show the download link.
+const POLL_INTERVAL_MS = 3000;
+
+async function _fetchJob(jobId) {
+  const resp = await fetch(`/hrmis/api/export/jobs/${encodeURIComponent(String(jobId))}`, {
+    method: "GET",
+    credentials: "same-origin",
+    headers: { Accept: "application/json" },
+  });
+  if (!resp.ok) throw new Error("fetch_failed");
+  return await resp.json();
+}
+
+function _wireExportJob(root = document) {
+  const panel = root.querySelector(".js-hrmis-export-job");
+  if (!panel) return;
+  const state = panel.dataset?.state || "";
+  if (state === "done" || state === "failed") return;
+  const jobId = Number(panel.dataset?.jobId || 0) || 0;
+  if (!jobId) return;
+  const progress = panel.querySelector(".js-hrmis-export-progress");
+
+  const timer = window.setInterval(async () => {
+    try {
+      const res = await _fetchJob(jobId);
+      const job = res?.job;
+      if (!job) return;
+      if (progress) progress.textContent = String(job.progress || 0);
+      if (job.state === "done" || job.state === "failed") {
+        window.clearInterval(timer);
+        window.location.reload();
+      }
+    } catch {
+      window.clearInterval(timer);
+    }
+  }, POLL_INTERVAL_MS);
+}
+
+if (document.readyState === "loading") {
+  document.addEventListener("DOMContentLoaded", () => _wireExportJob(document));
+} else {
+  _wireExportJob(document);
+}
@@ -0,0 +1,148 @@
+/** @odoo-module **/
+
+// Lazy-loaded master data dropdowns.
+//
+// A <select data-hrmis-lazy="facilities|designations|districts"> only ships its
+// placeholder and selected option; the rest is fetched from
+// /hrmis/api/master/<kind> when a field it depends on changes (or on first
+// focus when it has no value to depend on).
+//
+// data-hrmis-depends="param=field,param2=field2?" maps the API parameters to
+// the names of other fields of the same form. Without a value for a required
+// (no "?") dependency, only the placeholder is shown.
+// data-hrmis-seats="1" adds the "(remaining/total)" posts to designations.
+
+const _cache = new Map();
+
+function _parseDepends(select) {
+  return (select.dataset.hrmisDepends || "")
+    .split(",")
+    .map((s) => s.trim())
+    .filter(Boolean)
+    .map((spec) => {
+      const optional = spec.endsWith("?");
+      const [param, field] = spec.replace(/\?$/, "").split("=");
+      return { param, field: field || param, optional };
+    });
+}
+
+function _dependencyInput(select, field) {
+  const scope = select.form || document;
+  return scope.querySelector(`[name="${field}"]`);
+}
+
+async function _fetchItems(kind, params) {
+  const qs = new URLSearchParams(params).toString();
+  const url = `/hrmis/api/master/${kind}${qs ? `?${qs}` : ""}`;
+  if (!_cache.has(url)) {
+    // The browser revalidates with the ETag: unchanged lists cost a 304.
+    const promise = fetch(url, {
+      method: "GET",
+      credentials: "same-origin",
+      headers: { Accept: "application/json" },
+    })
+      .then((resp) => {
+        if (!resp.ok) throw new Error("fetch_failed");
+        return resp.json();
+      })
+      .then((data) => data?.items || [])
+      .catch((err) => {
+        _cache.delete(url);
+        throw err;
+      });
+    _cache.set(url, promise);
+  }
+  return _cache.get(url);
+}
+
+function _renderOptions(select, items, keepValue) {
+  const placeholder = select.options[0] && !select.options[0].value ? select.options[0] : null;
+  const withSeats = select.dataset.hrmisSeats === "1";
+  const frag = document.createDocumentFragment();
+  if (placeholder) frag.appendChild(placeholder);
+  let found = false;
+  for (const item of items) {
+    const opt = document.createElement("option");
+    opt.value = String(item.id);
+    opt.textContent = item.name || "";
+    if (withSeats) {
+      opt.textContent += `  (${item.remaining || 0}/${item.total || 0})`;
+      if (!item.remaining) opt.style.color = "#c62828";
+    }
+    if (String(item.id) === keepValue) {
+      opt.selected = true;
+      found = true;
+    }
+    frag.appendChild(opt);
+  }
+  select.replaceChildren(frag);
+  if (!found) select.value = "";
+}
+
+async function _load(select) {
+  const kind = select.dataset.hrmisLazy;
+  const params = {};
+  for (const dep of _parseDepends(select)) {
+    const input = _dependencyInput(select, dep.field);
+    const value = ((input && input.value) || "").trim();
+    if (value) {
+      params[dep.param] = value;
+    } else if (!dep.optional) {
+      _renderOptions(select, [], "");
+      return;
+    }
+  }
+  if (select.dataset.hrmisSeats === "1") params.seats = "1";
+  const keepValue = select.value || "";
+  try {
+    _renderOptions(select, await _fetchItems(kind, params), keepValue);
+    select.dataset.hrmisLoaded = "1";
+    select.dispatchEvent(new Event("hrmis:loaded"));
+  } catch {
+    // Keep the server-rendered selection if the API is unreachable.
+  }
+}
+
+function _wireLazySelect(select) {
+  if (select.dataset.hrmisLazyWired) return;
+  select.dataset.hrmisLazyWired = "1";
+
+  const deps = _parseDepends(select);
+  for (const dep of deps) {
+    const input = _dependencyInput(select, dep.field);
+    if (!input) continue;
+    // Clear the selection: it belonged to the previous district/facility.
+    const reload = () => {
+      select.value = "";
+      _load(select);
+    };
+    input.addEventListener("change", reload);
+    if (input.tagName === "INPUT") input.addEventListener("input", reload);
+  }
+
+  const hasDependencyValue = deps.some((dep) => {
+    const input = _dependencyInput(select, dep.field);
+    return input && input.value;
+  });
+  if (hasDependencyValue) {
+    _load(select);
+  } else {
+    const onFirstUse = () => {
+      if (!select.dataset.hrmisLoaded) _load(select);
+    };
+    select.addEventListener("focus", onFirstUse, { once: true });
+    select.addEventListener("mousedown", onFirstUse, { once: true });
+  }
+}
+
+function _init() {
+  for (const select of document.querySelectorAll("select[data-hrmis-lazy]")) {
+    _wireLazySelect(select);
+  }
+}
+
+if (document.readyState === "loading") {
+  document.addEventListener("DOMContentLoaded", _init);
+} else {
+  _init();
+}
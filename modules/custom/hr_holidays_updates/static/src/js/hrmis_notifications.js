@@ -49,7 +49,7 @@ function _renderNotificationItem(n) {
   return item;
 }
 
-function _redirectForNotification(resModel, ctx) {
+function _redirectForNotification(resModel, ctx, resId = 0) {
   const isSO = !!ctx?.is_section_officer;
   const empId = Number(ctx?.employee_id || 0) || 0;
 
@@ -65,6 +65,10 @@ function _redirectForNotification(resModel, ctx) {
     return "/hrmis/services";
   }
 
+  if (resModel === "hrmis.export.job" && resId) {
+    return `/hrmis/export/jobs/${resId}`;
+  }
+
   return "/hrmis/notifications";
 }
 
@@ -191,7 +195,8 @@ function _wireNotificationsDropdown(root = document) {
       const item = e.target.closest(".hrmis-notif-item");
       if (item) {
         const resModel = item.dataset?.resModel || "";
-        window.location.href = _redirectForNotification(resModel, lastCtx);
+        const resId = Number(item.dataset?.resId || 0) || 0;
+        window.location.href = _redirectForNotification(resModel, lastCtx, resId);
         return;
       }
     }
@@ -250,7 +255,8 @@ function _wireNotificationsPage(root = document) {
       const item = e.target.closest(".hrmis-notif-item");
       if (!item) return;
       const resModel = item.dataset?.resModel || "";
-      window.location.href = _redirectForNotification(resModel, ctx);
+      const resId = Number(item.dataset?.resId || 0) || 0;
+      window.location.href = _redirectForNotification(resModel, ctx, resId);
     });
   }
 
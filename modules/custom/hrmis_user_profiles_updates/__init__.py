@@ -1,2 +1,2 @@
 from . import models
-# from . import controllers
\ No newline at end of file
+from . import controllers
\ No newline at end of file
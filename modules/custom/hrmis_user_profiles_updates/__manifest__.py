@@ -5,6 +5,7 @@
     'category': 'Human Resources',
     'author': "Humza Aqeel Shaikh",
     'depends': ['hr'],
+    'external_dependencies': {'python': ['pandas', 'openpyxl', 'xlsxwriter']},
     'data': [
         # Security always first
         'security/ir.model.access.csv',
@@ -13,9 +14,8 @@
         # Core master data (DEPENDENCY FIRST)
         'data/hrmis_healthcare_unit_data.xml',
         'data/districts.xml',
-        'data/facilities.xml',
         'data/hrmis_cadre.xml',
-        'data/hrmis_designation.xml',
+        'data/hrmis_master_data_load.xml',
         'data/res_user_data.xml',
 
         # Views
@@ -25,6 +25,7 @@
         'views/hrmis_user_services_views.xml',
         'views/hrmis_training_views.xml',
         'views/hrmis_profile_request_views.xml',
+        'views/hrmis_employee_import_wizard_views.xml',
 
         # Menus last
         'views/hrmis_menu.xml',
@@ -32,7 +33,6 @@
 
     'assets': {
         'web.assets_frontend': [
-            'hrmis_user_profiles_updates/static/src/js/facility_filter.js',
             'hrmis_user_profiles_updates/static/src/js/hrmis_profile_validation.js',
         ],
     },
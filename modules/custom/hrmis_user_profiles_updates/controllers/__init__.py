@@ -0,0 +1 @@
+from . import employee_import
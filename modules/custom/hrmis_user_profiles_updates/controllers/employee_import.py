@@ -0,0 +1,20 @@
+from odoo import http
+from odoo.http import content_disposition, request
+
+
+class HrmisEmployeeImport(http.Controller):
+
+    @http.route('/hrmis/employee_import/<int:wizard_id>/report', type='http', auth='user', methods=['GET'])
+    def employee_import_report(self, wizard_id, **kwargs):
+        """Download the import report of a wizard, once."""
+        wizard = request.env['hrmis.employee.import.wizard'].browse(wizard_id).exists()
+        report, filename = wizard._pop_report() if wizard else (None, None)
+        if not report:
+            return request.not_found()
+        return request.make_response(
+            report,
+            headers=[
+                ('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+                ('Content-Disposition', content_disposition(filename)),
+            ]
+        )
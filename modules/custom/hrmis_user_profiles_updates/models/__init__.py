@@ -1,3 +1,4 @@
+from . import hrmis_master_data
 from . import hr_employee_inherit
 from . import hrmis_service_history
 from . import hrmis_training_record
@@ -8,4 +9,7 @@ from . import hrmis_final_profile_request
 from . import hrmis_cadre
 from . import hrmis_designations
 from . import hrmis_health_care_unit
-from . import hrmis_facility_designation
\ No newline at end of file
+from . import hrmis_facility_designation
+from . import hrmis_vacancy_matrix
+from . import hrmis_master_data_loader
+from . import hrmis_employee_import_wizard
@@ -1,7 +1,32 @@
+import logging
+import re
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
 from datetime import date
 
+_logger = logging.getLogger(__name__)
+
+# A complete CNIC has 13 digits (printed as 12345-1234567-1)
+CNIC_DIGITS = 13
+
+
+def ensure_pg_trgm(cr):
+    """Install the pg_trgm extension if possible and return whether it is
+    available (trigram GIN indexes are skipped otherwise)."""
+    cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    if cr.fetchone():
+        return True
+    try:
+        with cr.savepoint(flush=False):
+            cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except Exception:
+        _logger.warning("PostgreSQL extension pg_trgm is not available: staff search runs without trigram indexes")
+        return False
+    return True
+
+
 #This model will store the data for request approval temporarily
 class HREmployee(models.Model):
     _inherit = 'hr.employee'
@@ -19,9 +44,18 @@ class HREmployee(models.Model):
     hrmis_employee_id = fields.Char(
     string="Employee ID / Service Number",
     required=True,
+    index=True,
     copy=False
     )
     hrmis_cnic = fields.Char(string="CNIC")
+    # Searched with or without dashes through an exact/prefix index (see init)
+    hrmis_cnic_digits = fields.Char(
+        string="CNIC (digits)",
+        compute="_compute_hrmis_cnic_digits",
+        store=True,
+        readonly=True,
+        copy=False,
+    )
     birthday = fields.Date(
         string="Date of Birth",
         required=True
@@ -44,7 +78,8 @@ class HREmployee(models.Model):
     hrmis_designation = fields.Many2one(
     'hrmis.designation',
     string='Designation',
-    required=True 
+    required=True,
+    index=True,
     )
     
     hrmis_bps = fields.Integer(
@@ -53,13 +88,15 @@ class HREmployee(models.Model):
 
     district_id = fields.Many2one(
         'hrmis.district.master',
-        string="Current District"
+        string="Current District",
+        index=True,
     )
 
     facility_id = fields.Many2one(
         'hrmis.facility.type',
         string="Current Facility",
-        domain="[('district_id','=',district_id)]"
+        domain="[('district_id','=',district_id)]",
+        index=True,
     )
 
 
@@ -75,6 +112,82 @@ class HREmployee(models.Model):
     service_postings_end_date = fields.Date(related="hrmis_service_history_ids.end_date", readonly=True)
     service_postings_commission_date = fields.Date(related="hrmis_service_history_ids.commission_date", readonly=True)
 
+    def init(self):
+        super().init()
+        cr = self.env.cr
+        # text_pattern_ops: also serves `=like 'prefix%'` whatever the collation
+        create_index(cr, "hr_employee_hrmis_cnic_digits_index", self._table, ["hrmis_cnic_digits text_pattern_ops"])
+        # Keyset pagination of the staff search (ORDER BY name, id)
+        create_index(cr, "hr_employee_name_id_index", self._table, ["name", "id"])
+        if ensure_pg_trgm(cr):
+            for column in ("name", "hrmis_cnic"):
+                create_index(
+                    cr, f"hr_employee_{column}_trgm_index", self._table, [f"{column} gin_trgm_ops"], method="gin"
+                )
+
+    @api.depends("hrmis_cnic")
+    def _compute_hrmis_cnic_digits(self):
+        for emp in self:
+            emp.hrmis_cnic_digits = re.sub(r"\D", "", emp.hrmis_cnic or "") or False
+
+    @api.model
+    def _hrmis_cnic_domain(self, cnic):
+        """Domain matching a typed CNIC, with or without dashes: exact on a
+        complete CNIC, prefix otherwise, both on the indexed digits column."""
+        digits = re.sub(r"\D", "", cnic or "")
+        if not digits:
+            return [("hrmis_cnic", "ilike", cnic)]
+        if len(digits) == CNIC_DIGITS:
+            return [("hrmis_cnic_digits", "=", digits)]
+        return [("hrmis_cnic_digits", "=like", f"{digits}%")]
+
+    @api.model
+    def _hrmis_staff_search_domain(self, name=None, cnic=None, designation_id=None, district_id=None, facility_id=None):
+        """Domain of the staff search filters. District, facility and
+        designation are record ids: a designation also matches the designations
+        of other facilities with the same name. Non-numeric values (links
+        bookmarked before the ids) are matched by name rather than dropped."""
+        def is_id(value):
+            return str(value).isdigit()
+
+        domain = []
+        if name:
+            domain.append(("name", "ilike", name))
+        if cnic:
+            domain += self._hrmis_cnic_domain(cnic)
+        if designation_id and is_id(designation_id):
+            designation = self.env["hrmis.designation"].sudo().browse(int(designation_id)).exists()
+            same_name = self.env["hrmis.designation"].sudo().with_context(active_test=False).search(
+                [("name", "=", designation.name)]
+            ) if designation else designation
+            domain.append(("hrmis_designation", "in", same_name.ids))
+        elif designation_id:
+            domain.append(("hrmis_designation.name", "ilike", designation_id))
+        if district_id and is_id(district_id):
+            domain.append(("district_id", "=", int(district_id)))
+        elif district_id:
+            domain.append(("district_id.name", "ilike", district_id))
+        if facility_id and is_id(facility_id):
+            domain.append(("facility_id", "=", int(facility_id)))
+        elif facility_id:
+            domain.append(("facility_id.name", "ilike", facility_id))
+        return domain
+
+    @api.model
+    def _hrmis_keyset_page(self, domain, after_id=None, limit=50):
+        """Return the employees matching `domain` that come after the employee
+        `after_id` in (name, id) order, and the id to pass as `after_id` for
+        the next page (False on the last page)."""
+        after = self.browse(int(after_id)).exists() if after_id else self.browse()
+        if after:
+            domain = domain + [
+                "|", ("name", ">", after.name),
+                "&", ("name", "=", after.name), ("id", ">", after.id),
+            ]
+        employees = self.search(domain, order="name, id", limit=limit + 1)
+        if len(employees) > limit:
+            return employees[:limit], employees[limit - 1].id
+        return employees, False
 
     def action_request_profile_update(self):
         self.ensure_one()
@@ -2,6 +2,7 @@ from odoo import models, fields
 
 class HrmisCadre(models.Model):
     _name = 'hrmis.cadre'
+    _inherit = ['hrmis.master.data.mixin']
     _description = 'HRMIS Cadre'
     _order = "name ASC"
     
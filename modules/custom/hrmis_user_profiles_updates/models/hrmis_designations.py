@@ -1,11 +1,15 @@
 from odoo import models, fields, api
+from odoo.tools.sql import create_index
+
+from .hr_employee_inherit import ensure_pg_trgm
 
 class HrmisDesignation(models.Model):
     _name = 'hrmis.designation'
+    _inherit = ['hrmis.master.data.mixin']
     _description = 'HRMIS Designation'
     _order = "name ASC"
 
-    name = fields.Char(required=True)
+    name = fields.Char(required=True, index=True)
     code = fields.Char()
     total_sanctioned_posts = fields.Integer(
         string="Total Sanctioned Posts",
@@ -42,3 +46,10 @@ class HrmisDesignation(models.Model):
         "designation_id",
         string="Facility Allocations"
     )
+
+    def init(self):
+        # `hrmis_designation ilike ...` on hr.employee name-searches this table
+        if ensure_pg_trgm(self.env.cr):
+            create_index(
+                self.env.cr, "hrmis_designation_name_trgm_index", self._table, ["name gin_trgm_ops"], method="gin"
+            )
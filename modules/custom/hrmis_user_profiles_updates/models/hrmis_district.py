@@ -2,6 +2,7 @@ from odoo import models, fields
 
 class District(models.Model):
     _name = "hrmis.district.master"
+    _inherit = ["hrmis.master.data.mixin"]
     _description = "District"
     _sql_constraints = [
         ('name_unique', 'unique(name)', 'The district name must be unique!')
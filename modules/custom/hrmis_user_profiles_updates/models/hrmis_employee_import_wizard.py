@@ -0,0 +1,324 @@
+import base64
+import io
+import re
+import secrets
+
+import pandas as pd
+import xlsxwriter
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+
+from .hr_employee_inherit import CNIC_DIGITS
+
+# Employees (and users) created per create() call
+IMPORT_BATCH_SIZE = 500
+# BPS grades of the Sindh government pay scales
+MIN_BPS, MAX_BPS = 1, 22
+# Bytes of randomness of the temporary passwords of the created users
+TEMP_PASSWORD_BYTES = 6
+
+# Expected columns of the file (case and spaces ignored) -> required
+IMPORT_COLUMNS = {
+    "name": True,
+    "cnic": True,
+    "service_number": True,
+    "birthday": True,
+    "gender": False,
+    "father_name": False,
+    "bps": True,
+    "cadre": True,
+    "designation": True,
+    "facility": True,
+    "joining_date": False,
+    "contact": False,
+}
+GENDERS = {"male", "female", "other"}
+
+
+class HrmisEmployeeImportWizard(models.TransientModel):
+    """Onboards the staff of a district from one XLSX/CSV file.
+
+    The rows are validated column-wise (pandas): CNIC format and duplicates,
+    dates, BPS range, and cadre/facility/designation existence. The valid
+    rows are created in batches, the others are listed with their errors in
+    a report, along with the logins and temporary passwords of the created
+    users. The report can be downloaded once: it is not kept after that.
+    """
+
+    _name = "hrmis.employee.import.wizard"
+    _description = "HRMIS Employee Import"
+
+    file = fields.Binary(string="File (XLSX or CSV)", required=True, attachment=False)
+    filename = fields.Char()
+    create_users = fields.Boolean(
+        string="Create Users",
+        default=True,
+        help="Create an internal user for each imported employee, with the CNIC digits as "
+             "login and a temporary password (listed in the import report) to change at "
+             "first login.",
+    )
+    state = fields.Selection([('draft', 'Upload'), ('done', 'Done')], default='draft')
+    created_count = fields.Integer(string="Employees Created", readonly=True)
+    rejected_count = fields.Integer(string="Rows Rejected", readonly=True)
+    report_file = fields.Binary(string="Import Report", readonly=True, attachment=False)
+    report_filename = fields.Char(readonly=True)
+
+    def action_import(self):
+        self.ensure_one()
+        df = self._read_file()
+        errors = self._validate(df)
+        valid = df[errors == ""]
+        rejected = df[errors != ""].assign(errors=errors[errors != ""].str.rstrip("; "))
+
+        employees = self._create_employees(valid)
+        credentials = self._create_users(valid, employees) if self.create_users else []
+
+        values = {'state': 'done', 'created_count': len(employees), 'rejected_count': len(rejected)}
+        if len(rejected) or credentials:
+            values.update(
+                report_file=base64.b64encode(self._import_report(rejected, credentials)),
+                report_filename=f"{(self.filename or 'employees').rsplit('.', 1)[0]}_import.xlsx",
+            )
+        self.write(values)
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_download_report(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f"/hrmis/employee_import/{self.id}/report",
+            'target': 'new',
+        }
+
+    def _pop_report(self):
+        """Return the report (bytes, None once downloaded) and its filename,
+        and clear it: it holds the temporary passwords of the users."""
+        self.ensure_one()
+        report, filename = self.report_file, self.report_filename
+        self.write({'report_file': False})
+        return (base64.b64decode(report) if report else None), filename
+
+    # ------------------------------------------------------------------
+    # Reading and validation
+    # ------------------------------------------------------------------
+
+    def _read_file(self):
+        data = io.BytesIO(base64.b64decode(self.file))
+        try:
+            if (self.filename or "").lower().endswith(".csv"):
+                df = pd.read_csv(data, dtype=str, keep_default_na=False)
+            else:
+                df = pd.read_excel(data, dtype=str, keep_default_na=False, engine="openpyxl")
+        except Exception as e:
+            raise UserError(_("The file could not be read: %s", e))
+
+        df.columns = [re.sub(r"\W+", "_", str(column).strip().lower()).strip("_") for column in df.columns]
+        missing = [column for column, required in IMPORT_COLUMNS.items() if required and column not in df.columns]
+        if missing:
+            raise UserError(_("Missing columns: %s", ", ".join(missing)))
+        for column in IMPORT_COLUMNS:
+            df[column] = df[column].fillna("").astype(str).str.strip() if column in df.columns else ""
+        # Row numbers as the user sees them in the spreadsheet (header is row 1)
+        df.insert(0, "row", df.index + 2)
+        return df.reset_index(drop=True)
+
+    def _validate(self, df):
+        """Fill the resolved ids/values in `df` and return the error messages
+        of each row ("" for a valid row)."""
+        errors = pd.Series("", index=df.index)
+
+        def reject(mask, message):
+            errors[mask] += f"{message}; "
+
+        for column, required in IMPORT_COLUMNS.items():
+            if required:
+                reject(df[column] == "", f"{column} is required")
+
+        # CNIC: 13 digits, with or without the dashes; unique in the file and the database
+        df["cnic_digits"] = df["cnic"].str.replace(r"\D", "", regex=True)
+        valid_cnic = df["cnic"].str.fullmatch(r"\d{5}-?\d{7}-?\d") & (df["cnic_digits"].str.len() == CNIC_DIGITS)
+        reject((df["cnic"] != "") & ~valid_cnic, "CNIC must be 13 digits (12345-1234567-1)")
+        df["cnic_formatted"] = df["cnic_digits"].str.replace(r"^(\d{5})(\d{7})(\d)$", r"\1-\2-\3", regex=True)
+        reject(valid_cnic & df["cnic_digits"].duplicated(keep=False), "CNIC appears more than once in the file")
+        existing = self._existing_cnics(df.loc[valid_cnic, "cnic_digits"].unique().tolist())
+        reject(df["cnic_digits"].isin(existing), "an employee with this CNIC already exists")
+        if self.create_users:
+            logins = self._existing_logins(df.loc[valid_cnic, "cnic_digits"].unique().tolist())
+            reject(df["cnic_digits"].isin(logins), "a user with this CNIC as login already exists")
+
+        reject((df["service_number"] != "") & df["service_number"].duplicated(keep=False),
+               "service number appears more than once in the file")
+
+        today = pd.Timestamp(fields.Date.context_today(self))
+        for column in ("birthday", "joining_date"):
+            parsed = self._parse_dates(df[column])
+            reject((df[column] != "") & parsed.isna(), f"{column} is not a valid date")
+            reject(parsed > today, f"{column} is in the future")
+            df[f"{column}_value"] = parsed
+        reject(df["joining_date_value"] < df["birthday_value"], "joining_date is before birthday")
+
+        gender = df["gender"].str.lower()
+        reject((gender != "") & ~gender.isin(GENDERS), "gender must be male, female or other")
+        df["gender_value"] = gender.where(gender.isin(GENDERS), None)
+
+        bps = pd.to_numeric(df["bps"], errors="coerce")
+        valid_bps = bps.between(MIN_BPS, MAX_BPS) & (bps == bps.round())
+        reject((df["bps"] != "") & ~valid_bps, f"bps must be a whole number from {MIN_BPS} to {MAX_BPS}")
+        df["bps_value"] = bps.where(valid_bps).astype("Int64")
+
+        # Master data, resolved with merges instead of one search per row
+        cadres = self._lookup_frame("hrmis.cadre", ["name"])
+        df["cadre_id"] = df["cadre"].str.lower().map(cadres.drop_duplicates("key").set_index("key")["id"])
+        reject((df["cadre"] != "") & df["cadre_id"].isna(), "unknown cadre")
+
+        facilities = self._lookup_frame("hrmis.facility.type", ["facility_code", "name"], ["district_id"])
+        by_key = facilities.drop_duplicates("key").set_index("key")
+        df["facility_id"] = df["facility"].str.lower().map(by_key["id"])
+        df["district_id"] = df["facility"].str.lower().map(by_key["district_id"])
+        reject((df["facility"] != "") & df["facility_id"].isna(), "unknown facility (code or name)")
+
+        df["designation_id"] = self._match_designations(df)
+        reject((df["designation"] != "") & df["facility_id"].notna() & df["designation_id"].isna(),
+               "designation does not exist at this facility")
+        return errors
+
+    @api.model
+    def _parse_dates(self, values):
+        # XLSX date cells are read as ISO text (1990-02-01 00:00:00); typed
+        # dates are day first, as written in Pakistan (01/02/1990)
+        iso = values.str.match(r"\d{4}-\d{2}-\d{2}")
+        typed = pd.to_datetime(values.where(~iso), errors="coerce", dayfirst=True, format="mixed")
+        return typed.fillna(pd.to_datetime(values.where(iso).str[:10], errors="coerce", format="%Y-%m-%d"))
+
+    def _existing_cnics(self, digits):
+        if not digits:
+            return set()
+        rows = self.env["hr.employee"].sudo().with_context(active_test=False).search_read(
+            [("hrmis_cnic_digits", "in", digits)], ["hrmis_cnic_digits"]
+        )
+        return {row["hrmis_cnic_digits"] for row in rows}
+
+    def _existing_logins(self, logins):
+        if not logins:
+            return set()
+        rows = self.env["res.users"].sudo().with_context(active_test=False).search_read(
+            [("login", "in", logins)], ["login"]
+        )
+        return {row["login"] for row in rows}
+
+    def _lookup_frame(self, model, key_fields, extra_fields=()):
+        """(key, id, extra...) frame of all records of `model`, with one row
+        per lowercased value of each of `key_fields`."""
+        records = self.env[model].sudo().search_read([], key_fields + list(extra_fields))
+        frame = pd.DataFrame(records, columns=["id"] + key_fields + list(extra_fields))
+        for field in extra_fields:
+            frame[field] = frame[field].map(lambda value: value[0] if value else None)
+        keys = [
+            frame[["id", *extra_fields]].assign(key=frame[field].fillna("").astype(str).str.strip().str.lower())
+            for field in key_fields
+        ]
+        return pd.concat(keys, ignore_index=True).query("key != ''")
+
+    def _match_designations(self, df):
+        """Designation id of each row: the designation of that name at the
+        row's facility, preferring the one of the row's BPS."""
+        facility_ids = [int(fid) for fid in df["facility_id"].dropna().unique()]
+        rows = self.env["hrmis.designation"].sudo().search_read(
+            [("facility_id", "in", facility_ids)], ["name", "facility_id", "post_BPS"], order="id"
+        ) if facility_ids else []
+        designations = pd.DataFrame(
+            [(row["id"], row["facility_id"][0], (row["name"] or "").strip().lower(), row["post_BPS"]) for row in rows],
+            columns=["designation_id", "facility_id", "key", "post_BPS"],
+        )
+        wanted = df[["facility_id", "bps_value"]].assign(key=df["designation"].str.lower(), position=df.index)
+        wanted = wanted.dropna(subset=["facility_id"]).astype({"facility_id": "int64"})
+        candidates = wanted.merge(designations, on=["facility_id", "key"], how="inner")
+        candidates["other_bps"] = (candidates["post_BPS"] != candidates["bps_value"]).fillna(True).astype(bool)
+        best = candidates.sort_values(["position", "other_bps", "designation_id"]).drop_duplicates("position")
+        return best.set_index("position")["designation_id"].reindex(df.index)
+
+    # ------------------------------------------------------------------
+    # Creation
+    # ------------------------------------------------------------------
+
+    def _employee_values(self, row):
+        def date_or_false(value):
+            return value.date() if not pd.isna(value) else False
+
+        return {
+            'name': row.name,
+            'hrmis_cnic': row.cnic_formatted,
+            'hrmis_employee_id': row.service_number,
+            'birthday': date_or_false(row.birthday_value),
+            'hrmis_joining_date': date_or_false(row.joining_date_value),
+            'gender': row.gender_value or False,
+            'hrmis_father_name': row.father_name or False,
+            'hrmis_bps': int(row.bps_value),
+            'hrmis_cadre': int(row.cadre_id),
+            'hrmis_designation': int(row.designation_id),
+            'facility_id': int(row.facility_id),
+            'district_id': int(row.district_id) if not pd.isna(row.district_id) else False,
+            'hrmis_contact_info': row.contact or False,
+        }
+
+    def _create_employees(self, valid):
+        Employee = self.env["hr.employee"].sudo().with_context(
+            tracking_disable=True, mail_create_nolog=True, mail_create_nosubscribe=True
+        )
+        employees = Employee.browse()
+        for start in range(0, len(valid), IMPORT_BATCH_SIZE):
+            batch = valid.iloc[start:start + IMPORT_BATCH_SIZE]
+            employees |= Employee.create([self._employee_values(row) for row in batch.itertuples(index=False)])
+        return employees
+
+    def _create_users(self, valid, employees):
+        """Create the users of `employees` the way HRMIS onboards them
+        (custom_login): a temporary password, changed at first login, and the
+        employee role. Return the (row, name, login, temporary password) of
+        each user, for the import report."""
+        Users = self.env["res.users"].sudo().with_context(no_reset_password=True, tracking_disable=True)
+        onboarding = "temp_password" in Users._fields
+        values, credentials = [], []
+        for employee, row, digits in zip(employees, valid["row"], valid["cnic_digits"]):
+            password = secrets.token_urlsafe(TEMP_PASSWORD_BYTES)
+            user_values = {
+                'name': employee.name,
+                'login': digits,
+                'employee_ids': [fields.Command.link(employee.id)],
+            }
+            if onboarding:
+                user_values.update(temp_password=password, hrmis_role='employee')
+            else:
+                user_values.update(
+                    password=password, groups_id=[fields.Command.set([self.env.ref("base.group_user").id])]
+                )
+            values.append(user_values)
+            credentials.append((int(row), employee.name, digits, password))
+        for start in range(0, len(values), IMPORT_BATCH_SIZE):
+            Users.create(values[start:start + IMPORT_BATCH_SIZE])
+        return credentials
+
+    @api.model
+    def _import_report(self, rejected, credentials):
+        output = io.BytesIO()
+        workbook = xlsxwriter.Workbook(output, {"in_memory": True})
+        if len(rejected):
+            sheet = workbook.add_worksheet("Rejected rows")
+            headers = ["row"] + list(IMPORT_COLUMNS) + ["errors"]
+            sheet.write_row(0, 0, headers)
+            for index, row in enumerate(rejected[headers].itertuples(index=False), start=1):
+                sheet.write_row(index, 0, list(row))
+        if credentials:
+            sheet = workbook.add_worksheet("Users")
+            sheet.write_row(0, 0, ["row", "name", "login", "temporary password"])
+            for index, values in enumerate(credentials, start=1):
+                sheet.write_row(index, 0, values)
+        workbook.close()
+        return output.getvalue()
@@ -1,4 +1,5 @@
 from odoo import models, fields, api
+from odoo.tools import SQL
 
 class FacilityDesignation(models.Model):
     _name = "hrmis.facility.designation"
@@ -23,3 +24,66 @@ class FacilityDesignation(models.Model):
         compute="_compute_remaining_posts",
         store=True
     )
+
+    @api.model
+    def _reserve_seat(self, facility_id, designation_id):
+        """Occupy one post of the designation in the facility, creating the
+        allocation row on first use. Returns the allocation, or an empty
+        recordset when all the sanctioned posts are already occupied.
+        """
+        self.flush_model(["occupied_posts"])
+        self.env["hrmis.designation"].flush_model(["total_sanctioned_posts"])
+        # Waits for a concurrent insert of the same pair instead of failing on it
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO hrmis_facility_designation
+                   (facility_id, designation_id, occupied_posts, remaining_posts,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT %(facility_id)s, d.id, 0, d.total_sanctioned_posts,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM hrmis_designation d
+             WHERE d.id = %(designation_id)s
+            ON CONFLICT ON CONSTRAINT hrmis_facility_designation_uniq_facility_designation DO NOTHING
+            """,
+            facility_id=facility_id, designation_id=designation_id, uid=self.env.uid,
+        ))
+        return self._change_occupied_posts(facility_id, designation_id, 1)
+
+    @api.model
+    def _release_seat(self, facility_id, designation_id):
+        """Free one occupied post of the designation in the facility. Returns
+        the allocation, or an empty recordset when no post was occupied.
+        """
+        self.flush_model(["occupied_posts"])
+        self.env["hrmis.designation"].flush_model(["total_sanctioned_posts"])
+        return self._change_occupied_posts(facility_id, designation_id, -1)
+
+    @api.model
+    def _change_occupied_posts(self, facility_id, designation_id, delta):
+        # The guard is re-checked on the latest row version after waiting for
+        # its lock, so concurrent approvals cannot overbook the facility.
+        guard = (
+            SQL("fd.occupied_posts + %s <= d.total_sanctioned_posts", delta)
+            if delta > 0 else
+            SQL("fd.occupied_posts + %s >= 0", delta)
+        )
+        self.env.cr.execute(SQL(
+            """
+            UPDATE hrmis_facility_designation fd
+               SET occupied_posts = fd.occupied_posts + %(delta)s,
+                   remaining_posts = d.total_sanctioned_posts - (fd.occupied_posts + %(delta)s),
+                   write_uid = %(uid)s,
+                   write_date = now() at time zone 'UTC'
+              FROM hrmis_designation d
+             WHERE d.id = fd.designation_id
+               AND fd.facility_id = %(facility_id)s
+               AND fd.designation_id = %(designation_id)s
+               AND %(guard)s
+         RETURNING fd.id
+            """,
+            delta=delta, uid=self.env.uid, facility_id=facility_id,
+            designation_id=designation_id, guard=guard,
+        ))
+        allocation = self.browse([row[0] for row in self.env.cr.fetchall()])
+        allocation.invalidate_recordset(["occupied_posts", "remaining_posts", "write_uid", "write_date"])
+        return allocation
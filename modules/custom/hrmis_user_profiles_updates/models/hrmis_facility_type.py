@@ -2,6 +2,7 @@ from odoo import models, fields
 
 class FacilityType(models.Model):
     _name = "hrmis.facility.type"
+    _inherit = ["hrmis.master.data.mixin"]
     _description = "Facility Type"
 
     name = fields.Char(string="Facility Type Name", required=True)
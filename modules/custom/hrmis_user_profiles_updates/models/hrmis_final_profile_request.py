@@ -19,6 +19,7 @@ class EmployeeProfileRequest(models.Model):
         "hr.employee",
         string="Approver",
         readonly=True,
+        index=True,
     )
 
     user_id = fields.Many2one(
@@ -32,7 +33,7 @@ class EmployeeProfileRequest(models.Model):
         ('submitted', 'Submitted'),
         ('approved', 'Approved'),
         ('rejected', 'Rejected')
-    ], default='draft', tracking=True)
+    ], default='draft', tracking=True, index=True)
 
 
     hrmis_employee_id = fields.Char(
@@ -99,6 +100,31 @@ class EmployeeProfileRequest(models.Model):
     
     hrmis_contact_info = fields.Char(string="Contact Info")
 
+    # What the request changes on the employee, one "Label: value" per line.
+    # Only recomputed when the request is edited, so it still lists the
+    # changes after the approval copied them to the employee.
+    change_summary = fields.Text(
+        string="Changes",
+        compute="_compute_change_summary",
+        store=True,
+        readonly=True,
+    )
+
+    @api.depends('employee_id', 'hrmis_employee_id', 'hrmis_cnic', 'hrmis_father_name', 'hrmis_bps')
+    def _compute_change_summary(self):
+        for rec in self:
+            emp = rec.employee_id
+            changes = []
+            if (rec.hrmis_employee_id or '') != (emp.hrmis_employee_id or ''):
+                changes.append(f"Employee ID: {rec.hrmis_employee_id or ''}")
+            if (rec.hrmis_cnic or '') != (emp.hrmis_cnic or ''):
+                changes.append(f"CNIC: {rec.hrmis_cnic or ''}")
+            if (rec.hrmis_father_name or '') != (emp.hrmis_father_name or ''):
+                changes.append(f"Father Name: {rec.hrmis_father_name or ''}")
+            if (rec.hrmis_bps or 0) != (emp.hrmis_bps or 0):
+                changes.append(f"BPS: {rec.hrmis_bps}")
+            rec.change_summary = "\n".join(changes)
+
 
     @api.model
     def default_get(self, fields_list):
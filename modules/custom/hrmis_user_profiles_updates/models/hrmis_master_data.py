@@ -0,0 +1,62 @@
+from collections import namedtuple
+
+from odoo import api, models, tools
+
+# What the pages read of a master data record (`d.id`, `d.name` in QWeb)
+MasterRecord = namedtuple("MasterRecord", ["id", "name"])
+
+# kind -> (model, domain, order)
+MASTER_DATA = {
+    "districts": ("hrmis.district.master", [], "name"),
+    "facilities": ("hrmis.facility.type", [], "name"),
+    "cadres": ("hrmis.cadre", [], "name"),
+    "designations": ("hrmis.designation", [("active", "=", True)], "name"),
+}
+# Fields whose change alters the cached lists
+MASTER_DATA_FIELDS = {"name", "active"}
+
+
+class HrmisMasterData(models.AbstractModel):
+    """Process-wide cache of the master data lists rendered by the portal
+    pages (dropdowns of districts, facilities, cadres and designations)."""
+
+    _name = "hrmis.master.data"
+    _description = "HRMIS Master Data Cache"
+
+    @api.model
+    def get(self, kind):
+        """Return the active records of `kind` (a key of MASTER_DATA) as a
+        tuple of (id, name) named tuples, ordered by name."""
+        return self._get_cached(kind)
+
+    @api.model
+    @tools.ormcache("kind")
+    def _get_cached(self, kind):
+        model, domain, order = MASTER_DATA[kind]
+        rows = self.env[model].sudo().with_context(active_test=True).search_read(domain, ["name"], order=order)
+        return tuple(MasterRecord(row["id"], row["name"]) for row in rows)
+
+
+class HrmisMasterDataMixin(models.AbstractModel):
+    """Clears the master data cache (in every worker) when a record of the
+    inheriting model is created, renamed, (un)archived or deleted."""
+
+    _name = "hrmis.master.data.mixin"
+    _description = "HRMIS Master Data Cache Invalidation"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if MASTER_DATA_FIELDS.intersection(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
@@ -0,0 +1,167 @@
+import csv
+import logging
+import time
+
+from odoo import api, models
+from odoo.tools import SQL, file_open
+
+_logger = logging.getLogger(__name__)
+
+MODULE = "hrmis_user_profiles_updates"
+STAGING_TABLE = "hrmis_master_data_staging"
+
+
+class HrmisMasterDataLoader(models.AbstractModel):
+    """Loads the large master data files (facilities, designations) with
+    COPY instead of the XML loader, which creates them and their xmlids one
+    record at a time.
+
+    The CSV files use the import header conventions: `id` is the xmlid of the
+    record, `<field>/id` the xmlid of a many2one value, other columns are
+    stored fields. Like a `noupdate` XML file, existing records are left
+    untouched unless their xmlid is marked as updatable.
+    """
+
+    _name = "hrmis.master.data.loader"
+    _description = "HRMIS Master Data Bulk Loader"
+
+    @api.model
+    def _load_csv(self, model_name, filename, noupdate=True):
+        started = time.monotonic()
+        Model = self.env[model_name].sudo()
+        cr = self.env.cr
+        with file_open(f"{MODULE}/data/{filename}", "rb") as data:
+            header = next(csv.reader([data.readline().decode("utf-8-sig")]))
+            data.seek(0)
+            if header[0] != "id":
+                raise ValueError(f"{filename}: the first column must be 'id'")
+            columns = [self._field_of(Model, column, filename) for column in header[1:]]
+
+            # 1) Stage the file as text, as-is
+            cr.execute(SQL("DROP TABLE IF EXISTS %s", SQL.identifier(STAGING_TABLE)))
+            cr.execute(SQL(
+                "CREATE TEMP TABLE %s (%s, res_id integer, is_new boolean, updatable boolean) ON COMMIT DROP",
+                SQL.identifier(STAGING_TABLE),
+                SQL(", ").join(SQL("%s text", SQL.identifier(column)) for column in header),
+            ))
+            copy = SQL(
+                "COPY %s (%s) FROM STDIN WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')",
+                SQL.identifier(STAGING_TABLE),
+                SQL(", ").join(SQL.identifier(column) for column in header),
+            )
+            cr.copy_expert(copy.code, data)
+
+        staging = SQL.identifier(STAGING_TABLE)
+        # Unqualified xmlids belong to this module
+        for column in ["id"] + [column for column in header[1:] if column.endswith("/id")]:
+            cr.execute(SQL(
+                "UPDATE %s SET %s = %s || '.' || %s WHERE position('.' in %s) = 0",
+                staging, SQL.identifier(column), MODULE, SQL.identifier(column), SQL.identifier(column),
+            ))
+
+        # 2) Records that already exist, and whether they may be updated
+        cr.execute(SQL(
+            """
+            UPDATE %(staging)s s
+               SET res_id = imd.res_id, updatable = NOT COALESCE(imd.noupdate, false)
+              FROM ir_model_data imd
+              JOIN %(table)s rec ON rec.id = imd.res_id
+             WHERE imd.module = split_part(s.id, '.', 1)
+               AND imd.name = split_part(s.id, '.', 2)
+               AND imd.model = %(model)s
+            """,
+            staging=staging, table=SQL.identifier(Model._table), model=model_name,
+        ))
+        cr.execute(SQL(
+            "UPDATE %s SET is_new = res_id IS NULL, res_id = COALESCE(res_id, nextval(%s))",
+            staging, f"{Model._table}_id_seq",
+        ))
+
+        # 3) Resolve the many2one xmlids with one join each
+        joins, values = [], []
+        for index, (column, field) in enumerate(zip(header[1:], columns)):
+            if column.endswith("/id"):
+                alias = f"ref{index}"
+                joins.append(SQL(
+                    """
+                    LEFT JOIN ir_model_data %(alias)s
+                           ON %(alias)s.module = split_part(s.%(column)s, '.', 1)
+                          AND %(alias)s.name = split_part(s.%(column)s, '.', 2)
+                          AND %(alias)s.model = %(comodel)s
+                    """,
+                    alias=SQL.identifier(alias), column=SQL.identifier(column), comodel=field.comodel_name,
+                ))
+                values.append(SQL("%s.res_id", SQL.identifier(alias)))
+            else:
+                values.append(SQL("s.%s::%s", SQL.identifier(column), SQL(field.column_type[1])))
+        missing = [
+            SQL("(s.%s IS NOT NULL AND %s IS NULL)", SQL.identifier(column), value)
+            for column, value in zip(header[1:], values)
+            if column.endswith("/id")
+        ]
+        if missing:
+            cr.execute(SQL(
+                "SELECT s.id FROM %s s %s WHERE %s LIMIT 5",
+                staging, SQL(" ").join(joins), SQL(" OR ").join(missing),
+            ))
+            if unresolved := [row[0] for row in cr.fetchall()]:
+                raise ValueError(f"{filename}: unknown references in {', '.join(unresolved)}")
+
+        # 4) Upsert the records in one statement
+        names = [SQL.identifier(field.name) for field in columns]
+        Model.flush_model()
+        cr.execute(SQL(
+            """
+            INSERT INTO %(table)s (id, %(names)s, create_uid, create_date, write_uid, write_date)
+            SELECT s.res_id, %(values)s, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM %(staging)s s
+              %(joins)s
+             WHERE s.is_new OR s.updatable
+            ON CONFLICT (id) DO UPDATE
+               SET %(updates)s, write_uid = EXCLUDED.write_uid, write_date = EXCLUDED.write_date
+            """,
+            table=SQL.identifier(Model._table),
+            names=SQL(", ").join(names),
+            values=SQL(", ").join(values),
+            uid=self.env.uid,
+            staging=staging,
+            joins=SQL(" ").join(joins),
+            updates=SQL(", ").join(SQL("%s = EXCLUDED.%s", name, name) for name in names),
+        ))
+        loaded = cr.rowcount
+
+        # 5) Register the xmlids of the new records
+        cr.execute(SQL(
+            """
+            INSERT INTO ir_model_data (module, name, model, res_id, noupdate,
+                                       create_uid, create_date, write_uid, write_date)
+            SELECT split_part(s.id, '.', 1), split_part(s.id, '.', 2), %(model)s, s.res_id, %(noupdate)s,
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM %(staging)s s
+             WHERE s.is_new
+            ON CONFLICT (module, name) DO UPDATE SET res_id = EXCLUDED.res_id, model = EXCLUDED.model
+            """,
+            model=model_name, noupdate=noupdate, uid=self.env.uid, staging=staging,
+        ))
+        created = cr.rowcount
+        # Like the XML loader: xmlids not seen during an update are deleted
+        cr.execute(SQL("SELECT id FROM %s", staging))
+        self.env.registry.loaded_xmlids.update(row[0] for row in cr.fetchall())
+        cr.execute(SQL("DROP TABLE %s", staging))
+
+        Model.invalidate_model()
+        self.env["ir.model.data"].invalidate_model()
+        self.env.registry.clear_cache()
+        _logger.info(
+            "%s: loaded %s %s records (%s new) in %.2fs",
+            filename, loaded, model_name, created, time.monotonic() - started,
+        )
+
+    @api.model
+    def _field_of(self, Model, column, filename):
+        field = Model._fields.get(column.removesuffix("/id"))
+        if not field or not field.store or field.compute:
+            raise ValueError(f"{filename}: {column} is not a stored field of {Model._name}")
+        if column.endswith("/id") != (field.type == "many2one"):
+            raise ValueError(f"{filename}: use '{field.name}/id' for many2one columns only")
+        return field
@@ -0,0 +1,235 @@
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+# Levels the matrix can be rolled up to (group_by -> columns kept)
+VACANCY_GROUPINGS = {
+    "district": ("district",),
+    "facility": ("district", "facility"),
+    "bps": ("bps",),
+    "designation": ("district", "facility", "designation", "bps"),
+}
+# column -> (selected (alias, expression) pairs, sort expressions)
+VACANCY_COLUMNS = {
+    "district": ((("district_id", SQL("m.district_id")), ("district_name", SQL("dist.name"))), (SQL("dist.name"), SQL("m.district_id"))),
+    "facility": ((("facility_id", SQL("m.facility_id")), ("facility_name", SQL("fac.name"))), (SQL("fac.name"), SQL("m.facility_id"))),
+    "designation": ((("designation_id", SQL("m.designation_id")), ("designation_name", SQL("des.name"))), (SQL("des.name"), SQL("m.designation_id"))),
+    "bps": ((("bps", SQL("m.bps")),), (SQL("m.bps"),)),
+}
+# Designation fields the matrix is computed from
+VACANCY_DESIGNATION_FIELDS = {"facility_id", "total_sanctioned_posts", "post_BPS", "active"}
+
+
+class HrmisVacancyMatrix(models.Model):
+    """Sanctioned, occupied and vacant posts per district x facility x
+    designation x BPS.
+
+    One row per (facility, designation) pair: every active designation at its
+    facility, plus the seat allocations made elsewhere. Rows are recomputed
+    in SQL for the designations/facilities whose seats or posts change, so
+    reading the matrix never aggregates the source tables.
+    """
+
+    _name = "hrmis.vacancy.matrix"
+    _description = "HRMIS Vacancy Matrix"
+    _log_access = False
+    _order = "district_id, facility_id, designation_id"
+
+    district_id = fields.Many2one("hrmis.district.master", string="District", index=True, ondelete="cascade", readonly=True)
+    facility_id = fields.Many2one("hrmis.facility.type", string="Facility", required=True, index=True, ondelete="cascade", readonly=True)
+    designation_id = fields.Many2one("hrmis.designation", string="Designation", required=True, ondelete="cascade", readonly=True)
+    bps = fields.Integer(string="BPS", index=True, readonly=True)
+    sanctioned_posts = fields.Integer(string="Sanctioned Posts", readonly=True)
+    occupied_posts = fields.Integer(string="Occupied Posts", readonly=True)
+    vacant_posts = fields.Integer(string="Vacant Posts", readonly=True)
+
+    _sql_constraints = [
+        ('facility_designation_uniq', 'unique(facility_id, designation_id)',
+         'The vacancy matrix has one row per facility and designation.')
+    ]
+
+    def init(self):
+        # Install/upgrade: rebuild from whatever the source tables hold now
+        self._refresh()
+
+    @api.model
+    def _refresh(self, designation_ids=None, facility_ids=None):
+        """Recompute the rows of the given designations and facilities (all
+        rows when neither is given)."""
+        cr = self.env.cr
+        for model in ("hrmis.designation", "hrmis.facility.designation", "hrmis.facility.type"):
+            self.env[model].flush_model()
+        if designation_ids is None and facility_ids is None:
+            cr.execute("DELETE FROM hrmis_vacancy_matrix")
+            scope = SQL("TRUE")
+        else:
+            designation_ids = list(designation_ids or [])
+            facility_ids = list(facility_ids or [])
+            if not designation_ids and not facility_ids:
+                return
+            cr.execute(SQL(
+                "DELETE FROM hrmis_vacancy_matrix WHERE designation_id = ANY(%s) OR facility_id = ANY(%s)",
+                designation_ids, facility_ids,
+            ))
+            scope = SQL("(k.designation_id = ANY(%s) OR k.facility_id = ANY(%s))", designation_ids, facility_ids)
+        cr.execute(SQL(
+            """
+            INSERT INTO hrmis_vacancy_matrix
+                   (district_id, facility_id, designation_id, bps,
+                    sanctioned_posts, occupied_posts, vacant_posts)
+            SELECT fac.district_id, k.facility_id, k.designation_id, des."post_BPS",
+                   COALESCE(des.total_sanctioned_posts, 0),
+                   COALESCE(fd.occupied_posts, 0),
+                   GREATEST(COALESCE(des.total_sanctioned_posts, 0) - COALESCE(fd.occupied_posts, 0), 0)
+              FROM (
+                    SELECT d.facility_id, d.id AS designation_id
+                      FROM hrmis_designation d
+                     WHERE d.active AND d.facility_id IS NOT NULL
+                    UNION
+                    SELECT fd.facility_id, fd.designation_id
+                      FROM hrmis_facility_designation fd
+                   ) k
+              JOIN hrmis_designation des ON des.id = k.designation_id AND des.active
+              JOIN hrmis_facility_type fac ON fac.id = k.facility_id
+              LEFT JOIN hrmis_facility_designation fd
+                     ON fd.facility_id = k.facility_id AND fd.designation_id = k.designation_id
+             WHERE %s
+            ON CONFLICT (facility_id, designation_id) DO UPDATE
+               SET district_id = EXCLUDED.district_id,
+                   bps = EXCLUDED.bps,
+                   sanctioned_posts = EXCLUDED.sanctioned_posts,
+                   occupied_posts = EXCLUDED.occupied_posts,
+                   vacant_posts = EXCLUDED.vacant_posts
+            """,
+            scope,
+        ))
+        self.invalidate_model()
+
+    @api.model
+    def _vacancy_where(self, district_id=None, facility_id=None, bps=None, designation=None, vacant_only=False):
+        conditions = [SQL("TRUE")]
+        if district_id:
+            conditions.append(SQL("m.district_id = %s", district_id))
+        if facility_id:
+            conditions.append(SQL("m.facility_id = %s", facility_id))
+        if bps:
+            conditions.append(SQL("m.bps = %s", bps))
+        if designation:
+            conditions.append(SQL("des.name ILIKE %s", f"{designation}%"))
+        if vacant_only:
+            conditions.append(SQL("m.vacant_posts > 0"))
+        return SQL(" AND ").join(conditions)
+
+    @api.model
+    def _vacancy_report(self, group_by="designation", limit=100, offset=0, **filters):
+        """Rows of the matrix rolled up to `group_by` (a key of
+        VACANCY_GROUPINGS), with the grand totals of the filtered matrix.
+
+        Returns ``{"rows": [...], "count": <rows before paging>, "totals": {...}}``
+        (`count` is 0 past the last page).
+        """
+        columns = VACANCY_GROUPINGS.get(group_by) or VACANCY_GROUPINGS["designation"]
+        selected = [pair for column in columns for pair in VACANCY_COLUMNS[column][0]]
+        from_clause = SQL(
+            """
+              FROM hrmis_vacancy_matrix m
+              JOIN hrmis_designation des ON des.id = m.designation_id
+              JOIN hrmis_facility_type fac ON fac.id = m.facility_id
+              LEFT JOIN hrmis_district_master dist ON dist.id = m.district_id
+            """
+        )
+        where = self._vacancy_where(**filters)
+        cr = self.env.cr
+        cr.execute(SQL(
+            """
+            SELECT %(select)s,
+                   SUM(m.sanctioned_posts), SUM(m.occupied_posts), SUM(m.vacant_posts),
+                   COUNT(*) OVER ()
+              %(from_clause)s
+             WHERE %(where)s
+             GROUP BY %(group)s
+             ORDER BY %(order)s
+             LIMIT %(limit)s OFFSET %(offset)s
+            """,
+            select=SQL(", ").join(SQL("%s AS %s", expr, SQL.identifier(alias)) for alias, expr in selected),
+            from_clause=from_clause,
+            where=where,
+            group=SQL(", ").join(expr for __, expr in selected),
+            order=SQL(", ").join(expr for column in columns for expr in VACANCY_COLUMNS[column][1]),
+            limit=limit,
+            offset=offset,
+        ))
+        rows, count = [], 0
+        for record in cr.fetchall():
+            row = dict(zip([alias for alias, __ in selected], record))
+            row.update(sanctioned=record[-4] or 0, occupied=record[-3] or 0, vacant=record[-2] or 0)
+            count = record[-1]
+            rows.append(row)
+
+        cr.execute(SQL(
+            "SELECT COALESCE(SUM(m.sanctioned_posts), 0), COALESCE(SUM(m.occupied_posts), 0),"
+            " COALESCE(SUM(m.vacant_posts), 0) %s WHERE %s",
+            from_clause, where,
+        ))
+        sanctioned, occupied, vacant = cr.fetchone()
+        return {
+            "rows": rows,
+            "count": count,
+            "totals": {"sanctioned": sanctioned, "occupied": occupied, "vacant": vacant},
+        }
+
+
+class HrmisDesignation(models.Model):
+    _inherit = "hrmis.designation"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env["hrmis.vacancy.matrix"]._refresh(designation_ids=records.ids)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if VACANCY_DESIGNATION_FIELDS.intersection(vals):
+            self.env["hrmis.vacancy.matrix"]._refresh(designation_ids=self.ids)
+        return res
+
+
+class HrmisFacilityType(models.Model):
+    _inherit = "hrmis.facility.type"
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "district_id" in vals:
+            self.env["hrmis.vacancy.matrix"]._refresh(facility_ids=self.ids)
+        return res
+
+
+class FacilityDesignation(models.Model):
+    _inherit = "hrmis.facility.designation"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env["hrmis.vacancy.matrix"]._refresh(designation_ids=records.designation_id.ids)
+        return records
+
+    def write(self, vals):
+        designations = self.designation_id
+        res = super().write(vals)
+        if {"facility_id", "designation_id", "occupied_posts"}.intersection(vals):
+            self.env["hrmis.vacancy.matrix"]._refresh(designation_ids=(designations | self.designation_id).ids)
+        return res
+
+    def unlink(self):
+        designation_ids = self.designation_id.ids
+        res = super().unlink()
+        self.env["hrmis.vacancy.matrix"]._refresh(designation_ids=designation_ids)
+        return res
+
+    @api.model
+    def _change_occupied_posts(self, facility_id, designation_id, delta):
+        # Seat reservations/releases (profile approvals) bypass write()
+        allocation = super()._change_occupied_posts(facility_id, designation_id, delta)
+        if allocation:
+            self.env["hrmis.vacancy.matrix"]._refresh(designation_ids=[designation_id])
+        return allocation